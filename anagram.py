@@ -0,0 +1,102 @@
+"""Anagram index: the dictionary words a rack can spell.
+
+Words are grouped by their signature, their letters in sorted order, so the
+words spelled by exactly a given multiset of tiles are one dict lookup.
+words() looks up every sub-multiset of the rack's letters, with each ``?``
+filled by every letter in turn, instead of scanning the word list; a full
+rack is 127 lookups, or a few thousand with blanks.
+
+Usage: python anagram.py RACK [source.txt]  (? for a blank)
+"""
+import argparse
+import itertools
+import os
+import time
+from collections import defaultdict
+
+from dictionary_index import load_index
+from lexicon import playable_words
+
+MAX_BLANKS = 2
+_ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+class AnagramIndex:
+    """Read-only {signature: words} index over the playable dictionary words."""
+
+    def __init__(self, signatures):
+        self.signatures = signatures
+        self.max_length = max((len(signature) for signature in signatures), default=0)
+
+    @classmethod
+    def from_words(cls, words):
+        signatures = defaultdict(list)
+        for word in playable_words(words):
+            signatures[''.join(sorted(word))].append(word)
+        return cls({signature: tuple(group) for signature, group in signatures.items()})
+
+    def __len__(self):
+        return sum(len(group) for group in self.signatures.values())
+
+    def anagrams(self, tiles):
+        """Words spelled with exactly tiles, blanks excluded."""
+        return self.signatures.get(''.join(sorted(tiles)), ())
+
+    def words(self, rack, min_length=2):
+        """Every word rack can spell, longest first.
+
+        rack is a string or list of tiles as kept in player_racks, with ``?``
+        for a blank; at most MAX_BLANKS blanks are allowed.
+        """
+        tiles = [tile.upper() for tile in rack]
+        blanks = tiles.count('?')
+        if blanks > MAX_BLANKS:
+            raise ValueError(f"At most {MAX_BLANKS} blanks are supported")
+        counts = sorted((letter, tiles.count(letter)) for letter in set(tiles) if letter != '?')
+        signatures = self.signatures
+        looked_up = set()
+        found = set()
+        for taken in itertools.product(*(range(count + 1) for _, count in counts)):
+            kept = ''.join(letter * n for (letter, _), n in zip(counts, taken))
+            for fill in range(blanks + 1):
+                if not min_length <= len(kept) + fill <= self.max_length:
+                    continue
+                for extra in itertools.combinations_with_replacement(_ALPHABET, fill):
+                    signature = ''.join(sorted(kept + ''.join(extra))) if fill else kept
+                    if signature not in looked_up:
+                        looked_up.add(signature)
+                        found.update(signatures.get(signature, ()))
+        return sorted(found, key=lambda word: (-len(word), word))
+
+    def bingos(self, rack):
+        """Words that use every tile of rack."""
+        return [word for word in self.words(rack, len(rack)) if len(word) == len(rack)]
+
+
+def load_anagrams(source_path, index=None):
+    """Build the anagram index for source_path.
+
+    index is the already loaded DictionaryIndex for source_path, if any.
+    """
+    return AnagramIndex.from_words(index or load_index(source_path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List the words a rack can spell")
+    parser.add_argument("rack", help="rack letters, ? for a blank")
+    parser.add_argument("source", nargs="?", default=os.path.join('assets', 'dictionary', 'words_with_definitions.txt'))
+    parser.add_argument("--top", type=int, default=20, help="words to show")
+    args = parser.parse_args()
+    start = time.perf_counter()
+    anagrams = load_anagrams(args.source)
+    print(f"[ANAGRAM] Indexed {len(anagrams)} words in {len(anagrams.signatures)} signatures "
+          f"in {time.perf_counter() - start:.2f} s")
+    start = time.perf_counter()
+    words = anagrams.words(args.rack)
+    print(f"[ANAGRAM] {len(words)} words in {(time.perf_counter() - start) * 1000:.2f} ms")
+    for word in words[:args.top]:
+        print(f"[ANAGRAM] {word}")
+
+
+if __name__ == "__main__":
+    main()
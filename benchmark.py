@@ -0,0 +1,249 @@
+"""Microbenchmarks for server hot paths.
+
+Usage: python benchmark.py [scoring|dictionary|movegen|all] [--cases N]
+                           [--repeat N] [--games N] [--dictionary PATH]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+import dictionary_index
+import lexicon
+import logs
+import movegen
+import rules
+from server import GameRoom, ScrabbleServer
+
+
+def _scan_square_type(row, col):
+    """Premium square lookup as scoring did it before the rules tables."""
+    for square_type, positions in rules.SPECIAL_SQUARES.items():
+        if (row, col) in positions:
+            return square_type
+    return None
+
+
+class ScanScoringRoom(GameRoom):
+    """GameRoom with the list-scanning word scorer, used as the baseline."""
+
+    def _calculate_word_score(self, word_positions, new_positions, temp_board=None, temp_blanks=None):
+        word_score = 0
+        word_mult = 1
+        is_primary_word = all(pos in word_positions for pos in new_positions)
+        for row, col in word_positions:
+            letter = temp_board[row][col]
+            is_blank = (row, col) in temp_blanks
+            letter_score = self._get_letter_value('?') if is_blank else self._get_letter_value(letter)
+            square_type = _scan_square_type(row, col)
+            if (row, col) in new_positions:
+                if square_type == 'DL':
+                    letter_score *= 2
+                elif square_type == 'TL':
+                    letter_score *= 3
+                if square_type == 'DW':
+                    word_mult *= 2
+                elif square_type == 'TW':
+                    word_mult *= 3
+            word_score += letter_score
+        word_score *= word_mult
+        if is_primary_word and len(new_positions) == 7:
+            word_score += 50
+        return word_score
+
+
+def _random_cases(count, seed=1):
+    """Random words on a board: (word_positions, new_positions, board, blanks)."""
+    rng = random.Random(seed)
+    letters = [letter for letter in rules.LETTER_VALUES if letter != '?']
+    cases = []
+    for _ in range(count):
+        length = rng.randint(2, 8)
+        fixed = rng.randrange(rules.BOARD_SIZE)
+        start = rng.randint(0, rules.BOARD_SIZE - length)
+        if rng.random() < 0.5:
+            positions = [(fixed, start + i) for i in range(length)]
+        else:
+            positions = [(start + i, fixed) for i in range(length)]
+        board = [['' for _ in range(rules.BOARD_SIZE)] for _ in range(rules.BOARD_SIZE)]
+        for row, col in positions:
+            board[row][col] = rng.choice(letters)
+        new_positions = rng.sample(positions, rng.randint(1, min(7, length)))
+        blanks = {pos for pos in new_positions if rng.random() < 0.05}
+        cases.append((positions, new_positions, board, blanks))
+    return cases
+
+
+def bench_scoring(cases=2000, repeat=5):
+    """Time per-word scoring with the lookup tables against list scanning."""
+    rooms = {
+        'scan': ScanScoringRoom('bench-scan', {}),
+        'table': GameRoom('bench-table', {}),
+    }
+    workload = _random_cases(cases)
+    for case in workload:
+        scores = {rooms[name]._calculate_word_score(*case) for name in rooms}
+        assert len(scores) == 1, f"Scorers disagree on {case[0]}: {scores}"
+
+    squares = [(row, col) for row in range(rules.BOARD_SIZE) for col in range(rules.BOARD_SIZE)]
+    lookups = {
+        'scan': lambda: [_scan_square_type(row, col) for row, col in squares],
+        'table': lambda: [rules.SQUARE_TYPES[row][col] for row, col in squares],
+    }
+    results = {}
+    for name, lookup in lookups.items():
+        best = min(timeit.repeat(lookup, number=20, repeat=repeat))
+        results[f"square lookup/{name}"] = best / (20 * len(squares))
+    for name, room in rooms.items():
+        score = room._calculate_word_score
+        best = min(timeit.repeat(lambda: [score(*case) for case in workload], number=1, repeat=repeat))
+        results[f"word score/{name}"] = best / len(workload)
+    return results
+
+
+def _load_tsv(source_path):
+    """The line-by-line TSV loader the server used before the binary index."""
+    words = {}
+    with open(source_path, 'r', encoding='utf-8') as f:
+        next(f)
+        for line in f:
+            parts = line.strip().split('\t')
+            if len(parts) >= 2:
+                words[parts[0].strip().upper()] = parts[1].strip()
+    return words
+
+
+def _measure(load):
+    """Run load() once; returns (seconds, bytes still allocated, result)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = load()
+    seconds = time.perf_counter() - start
+    resident = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return seconds, resident, result
+
+
+def bench_dictionary(source_path):
+    """Startup time and resident Python heap of each dictionary loader.
+
+    The mapped index lives in the shared page cache, not the Python heap.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = os.path.join(tmp, 'words.idx')
+        results = {
+            'tsv dict': _measure(lambda: _load_tsv(source_path)),
+            'index build': _measure(lambda: dictionary_index.build_index(source_path, index_path)),
+            'index load': _measure(lambda: dictionary_index.load_index(source_path, index_path)),
+        }
+        expected = results['tsv dict'][2]
+        index = results['index load'][2]
+        sample = random.Random(1).sample(sorted(expected), min(1000, len(expected)))
+        # Timed without tracemalloc, on as many words as the LRU holds
+        hot = sample[:index.DEFINITION_CACHE_SIZE]
+        for name, lookup in (('contains', index.__contains__), ('definition cold', index.get),
+                             ('definition lru', index.get)):
+            start = time.perf_counter()
+            for word in hot:
+                lookup(word)
+            results[f"{name} x{len(hot)}"] = (time.perf_counter() - start, 0, None)
+        assert all(index.get(word) == expected[word] for word in sample), "Index disagrees with the TSV"
+        print(f"[BENCH] dictionary mapped {index.membership_size / 2**20:.1f} MiB "
+              f"of {os.path.getsize(index_path) / 2**20:.1f} MiB index")
+        index.close()  # Windows cannot delete a mapped file
+    return {name: (seconds, resident) for name, (seconds, resident, _) in results.items()}
+
+
+def _check_play(room, play):
+    """Assert that the room accepts play and scores it as the generator did."""
+    moves = [(row, col, letter) for row, col, letter, _ in play.tiles]
+    blanks = room.board_blanks | {(row, col) for row, col, _, is_blank in play.tiles if is_blank}
+    is_valid, message = room._validate_play(moves)
+    assert is_valid, f"Room rejects {play}: {message}"
+    score = room._calculate_words_score(moves, blanks)
+    assert score == play.score, f"Room scores {play} as {score}"
+
+
+def bench_movegen(source_path, games=2, seed=1):
+    """Time move generation over greedy self-play positions.
+
+    Every generated play is checked against the room's own validation and
+    scoring, and the room's cross-check cache against a full recompute after
+    every move. Returns {name: [seconds per position]} and the play counts.
+    """
+    index = dictionary_index.load_index(source_path)
+    generator = movegen.MoveGenerator(lexicon.load_gaddag(source_path, index))
+    rng = random.Random(seed)
+    seconds = {'generate': [], 'cross-check update': [], 'cross-check recompute': []}
+    counts = []
+    for _ in range(games):
+        room = GameRoom('bench-movegen', index, move_generator=generator)
+        bag = [tile for tile, count in GameRoom.TILE_DISTRIBUTION.items() for _ in range(count)]
+        rng.shuffle(bag)
+        racks = [[bag.pop() for _ in range(rules.RACK_SIZE)] for _ in range(2)]
+        turn = passes = 0
+        while passes < 2 and all(racks):
+            rack = racks[turn]
+            start = time.perf_counter()
+            plays = room.legal_plays(rack)
+            seconds['generate'].append(time.perf_counter() - start)
+            counts.append(len(plays))
+            # The room logs every word it looks at
+            with logs.quiet('server'):
+                for play in plays:
+                    _check_play(room, play)
+            if plays:
+                passes = 0
+                for row, col, letter, is_blank in plays[0].tiles:
+                    room._place_tile(row, col, letter)
+                    if is_blank:
+                        room.board_blanks.add((row, col))
+                    rack.remove('?' if is_blank else letter)
+                start = time.perf_counter()
+                room.cross_checks.update([(row, col) for row, col, _, _ in plays[0].tiles])
+                seconds['cross-check update'].append(time.perf_counter() - start)
+                start = time.perf_counter()
+                assert room.cross_checks.verify(), f"Cross-check cache is stale after {plays[0]}"
+                seconds['cross-check recompute'].append(time.perf_counter() - start)
+                while bag and len(rack) < rules.RACK_SIZE:
+                    rack.append(bag.pop())
+            else:
+                passes += 1
+            turn = 1 - turn
+    return seconds, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrabble server microbenchmarks")
+    parser.add_argument("suite", nargs="?", choices=("scoring", "dictionary", "movegen", "all"), default="all")
+    parser.add_argument("--cases", type=int, default=2000, help="random words to score")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats, best is kept")
+    parser.add_argument("--games", type=int, default=2, help="self-play games for movegen")
+    parser.add_argument("--dictionary", default=ScrabbleServer.DICTIONARY_PATH, help="word/definition TSV")
+    args = parser.parse_args()
+
+    if args.suite in ("scoring", "all"):
+        results = bench_scoring(args.cases, args.repeat)
+        for name, seconds in results.items():
+            print(f"[BENCH] {name:20} {seconds * 1e6:8.3f} us")
+        for metric in ("square lookup", "word score"):
+            speedup = results[f"{metric}/scan"] / results[f"{metric}/table"]
+            print(f"[BENCH] {metric} speedup: {speedup:.1f}x")
+    if args.suite in ("dictionary", "all"):
+        for name, (seconds, resident) in bench_dictionary(args.dictionary).items():
+            print(f"[BENCH] dictionary {name:20} {seconds * 1000:8.1f} ms, {resident / 2**20:7.1f} MiB resident")
+    if args.suite in ("movegen", "all"):
+        results, counts = bench_movegen(args.dictionary, args.games)
+        print(f"[BENCH] movegen {len(counts)} positions, {sum(counts) / len(counts):.0f} plays each, "
+              f"{sum(counts) / sum(results['generate']):.0f} plays/s")
+        for name, seconds in results.items():
+            seconds.sort()
+            print(f"[BENCH] movegen {name:22} p50 {seconds[len(seconds) // 2] * 1000:7.2f} ms, "
+                  f"p99 {seconds[int(len(seconds) * 0.99)] * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
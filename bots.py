@@ -0,0 +1,169 @@
+"""Computer opponents for bot seats on the server.
+
+Bot.choose() picks the command a bot sends on its turn, in the same form a
+client sends it: a move string, ``EXCHANGE:<tiles>`` or ``PASS``. Plays come
+from movegen, so a bot only ever tries moves the room will accept.
+
+Strengths:
+
+    greedy  the highest scoring play
+    equity  score plus the worth of the tiles kept (the rack leave); exchanges
+            when keeping the best subset of the rack beats every play
+    timed   the best equity plays, re-ranked by the opponent's best reply on
+            the resulting board to racks sampled from the unseen tiles,
+            until think_time runs out
+"""
+import functools
+import random
+import time
+from collections import Counter
+from itertools import combinations
+
+import rules
+from movegen import play_command
+
+GREEDY = 'greedy'
+EQUITY = 'equity'
+TIMED = 'timed'
+STRENGTHS = (GREEDY, EQUITY, TIMED)
+
+# Rough worth in points of keeping a single tile for the next turn
+LEAVE_VALUES = {
+    '?': 25.0, 'S': 8.0, 'Z': 3.0, 'X': 3.0, 'E': 3.5, 'R': 1.5, 'H': 1.0, 'A': 1.0,
+    'N': 0.5, 'T': 0.5, 'L': 0.5, 'D': 0.5, 'C': 0.5, 'M': 0.5, 'P': 0.0, 'I': -0.5,
+    'K': -0.5, 'Y': -0.5, 'O': -1.0, 'B': -2.0, 'G': -2.0, 'F': -2.0, 'J': -2.5,
+    'W': -3.0, 'U': -3.0, 'V': -5.0, 'Q': -7.0,
+}
+DUPLICATE_PENALTY = 3.0  # per extra copy of a letter kept
+BALANCE_PENALTY = 2.0  # per vowel or consonant beyond a difference of one
+VOWELS = frozenset('AEIOU')
+
+
+def leave_value(tiles):
+    """Heuristic worth of keeping tiles on the rack."""
+    return _leave_value(''.join(sorted(tiles)))
+
+
+@functools.lru_cache(maxsize=4096)
+def _leave_value(tiles):
+    """leave_value() of tiles in sorted order; a position's plays share few leaves."""
+    counts = Counter(tiles)
+    value = sum(LEAVE_VALUES[tile] for tile in tiles)
+    value -= DUPLICATE_PENALTY * sum(count - 1 for tile, count in counts.items() if tile != '?')
+    vowels = sum(counts[vowel] for vowel in VOWELS)
+    consonants = len(tiles) - vowels - counts['?']
+    value -= BALANCE_PENALTY * max(0, abs(vowels - consonants) - 1)
+    return value
+
+
+def unseen_tiles(distribution, board, blanks, rack):
+    """Tiles a player cannot see: the bag and the other racks together."""
+    unseen = Counter(distribution)
+    for row, line in enumerate(board):
+        for col, letter in enumerate(line):
+            if letter:
+                unseen['?' if (row, col) in blanks else letter] -= 1
+    unseen.subtract(rack)
+    return list(unseen.elements())
+
+
+def _leave(rack, play):
+    """The tiles left on rack after play."""
+    leave = list(rack)
+    for _, _, letter, is_blank in play.tiles:
+        leave.remove('?' if is_blank else letter)
+    return leave
+
+
+class Bot:
+    """Move choice for one bot seat.
+
+    generator is the server's MoveGenerator, shared by every bot. think_time
+    bounds the timed search in seconds; it always finishes one round.
+    """
+    CANDIDATES = 8  # Plays the timed search re-ranks
+
+    def __init__(self, generator, strength=GREEDY, think_time=2.0, rng=None):
+        if strength not in STRENGTHS:
+            raise ValueError(f"Unknown bot strength {strength}")
+        self.generator = generator
+        self.strength = strength
+        self.think_time = think_time
+        self.rng = rng or random.Random()
+
+    def choose(self, board, blanks, rack, bag_size, unseen=(), cross_checks=None):
+        """The command to send for rack on board with bag_size tiles left in the bag.
+
+        unseen is what unseen_tiles() returns, needed by the timed search.
+        cross_checks is the room's CrossCheckCache for board, if it keeps one.
+        """
+        deadline = time.perf_counter() + self.think_time
+        if cross_checks is not None:
+            plays = self.generator.generate(board, blanks, rack, cross_checks.tables, cross_checks.anchors)
+        else:
+            plays = self.generator.generate(board, blanks, rack)
+
+        if self.strength == GREEDY:
+            if plays:
+                return play_command(plays[0], blanks)
+            if rack and len(rack) <= bag_size:
+                return "EXCHANGE:" + ",".join(rack)
+            return "PASS"
+
+        ranked = sorted(((self._equity(play, rack, bag_size), play) for play in plays),
+                        key=lambda candidate: -candidate[0])
+        exchange = self._best_exchange(rack, bag_size)
+        if exchange is not None and (not ranked or exchange[0] > ranked[0][0]):
+            return "EXCHANGE:" + ",".join(exchange[1])
+        if not ranked:
+            return "PASS"
+        if self.strength == TIMED and len(ranked) > 1 and unseen:
+            ranked = self._simulate(ranked[:self.CANDIDATES], board, blanks, unseen, deadline)
+        return play_command(ranked[0][1], blanks)
+
+    def _equity(self, play, rack, bag_size):
+        leave = _leave(rack, play)
+        if bag_size:
+            return play.score + leave_value(leave)
+        # Nothing left to draw: tiles still held count against the player
+        return play.score - sum(rules.LETTER_VALUES[tile] for tile in leave)
+
+    def _best_exchange(self, rack, bag_size):
+        """(leave value, tiles to exchange) for the best tiles to keep, or None."""
+        best = None
+        for keep_count in range(max(0, len(rack) - bag_size), len(rack)):
+            # Sorted so that ties go the same way in every process
+            for keep in sorted(set(combinations(sorted(rack), keep_count))):
+                value = leave_value(keep)
+                if best is None or value > best[0]:
+                    best = (value, keep)
+        if best is None:
+            return None
+        tiles = list(rack)
+        for tile in best[1]:
+            tiles.remove(tile)
+        return best[0], tiles
+
+    def _simulate(self, candidates, board, blanks, unseen, deadline):
+        """Re-rank (equity, play) candidates by equity less the opponent's mean best reply.
+
+        Every round draws one opponent rack and scores it against every
+        candidate, so the candidates are compared on the same racks.
+        """
+        replies = [0] * len(candidates)
+        rounds = 0
+        while rounds == 0 or time.perf_counter() < deadline:
+            opponent = self.rng.sample(unseen, min(rules.RACK_SIZE, len(unseen)))
+            for i, (_, play) in enumerate(candidates):
+                after = [line[:] for line in board]
+                after_blanks = set(blanks)
+                for row, col, letter, is_blank in play.tiles:
+                    after[row][col] = letter
+                    if is_blank:
+                        after_blanks.add((row, col))
+                reply = self.generator.generate(after, after_blanks, opponent)
+                replies[i] += reply[0].score if reply else 0
+            rounds += 1
+        ranked = [(equity - replies[i] / rounds, play) for i, (equity, play) in enumerate(candidates)]
+        ranked.sort(key=lambda candidate: -candidate[0])
+        return ranked
@@ -1,20 +1,28 @@
 import pygame
 import pygame.gfxdraw
+import argparse
 import socket
 import threading
 import json
 import sys
 import os
 import random
-import traceback
 import time
 import math
+import logs
+import protocol
+import rules
+from anagram import AnagramIndex
+from dictionary_index import load_index
+from protocol import LineReader
+
+log = logs.get_logger('client')
 
 
 class ScrabbleClient:
     # Class constants
     TILE_SIZE = 40
-    BOARD_SIZE = 15
+    BOARD_SIZE = rules.BOARD_SIZE
     MARGIN = TILE_SIZE
     RACK_HEIGHT = TILE_SIZE + MARGIN * 0.5
     BUTTON_MARGIN = TILE_SIZE * 0.25
@@ -25,6 +33,11 @@ class ScrabbleClient:
     
     HOST = 'localhost'  # Default to localhost, will be overridden by user input
     PORT = 12345
+    MAX_MESSAGE_LENGTH = 4 * 1024 * 1024  # Full move logs can get long
+    WIRE_PROTOCOL = protocol.BINARY  # Requested at login; the server may answer with JSON
+    RESUME_ATTEMPTS = 5  # Reconnects tried after losing the connection mid-game
+    RESUME_DELAY = 2.0  # Seconds between reconnect attempts
+    HINT_WORDS = 5  # Words shown by the hint key
     
     # Timer settings
     TIMER_WARNING_THRESHOLD = 60  # seconds
@@ -55,25 +68,8 @@ class ScrabbleClient:
         'blank': (128, 0, 128),         # Dark purple for blank letters
     }
     
-    # Special tile positions
-    TRIPLE_WORD = [(0,0), (0,7), (0,14), (7,0), (7,14), (14,0), (14,7), (14,14)]
-    DOUBLE_WORD = [(1,1), (2,2), (3,3), (4,4), (13,13), (12,12), (11,11), (10,10),
-                   (1,13), (2,12), (3,11), (4,10), (13,1), (12,2), (11,3), (10,4),
-                   (7,7)]
-    TRIPLE_LETTER = [(1,5), (1,9), (5,1), (5,5), (5,9), (5,13),
-                     (9,1), (9,5), (9,9), (9,13), (13,5), (13,9)]
-    DOUBLE_LETTER = [(0,3), (0,11), (2,6), (2,8), (3,0), (3,7), (3,14),
-                     (6,2), (6,6), (6,8), (6,12), (7,3), (7,11),
-                     (8,2), (8,6), (8,8), (8,12), (11,0), (11,7), (11,14),
-                     (12,6), (12,8), (14,3), (14,11)]
-    
     # Standard Scrabble letter values
-    LETTER_VALUES = {
-        'A': 1, 'B': 3, 'C': 3, 'D': 2, 'E': 1, 'F': 4, 'G': 2, 'H': 4,
-        'I': 1, 'J': 8, 'K': 5, 'L': 1, 'M': 3, 'N': 1, 'O': 1, 'P': 3,
-        'Q': 10, 'R': 1, 'S': 1, 'T': 1, 'U': 1, 'V': 4, 'W': 4, 'X': 8,
-        'Y': 4, 'Z': 10, '?': 0
-    }
+    LETTER_VALUES = rules.LETTER_VALUES
     
     # Input field colors
     INPUT_COLORS = {
@@ -104,6 +100,7 @@ class ScrabbleClient:
         
         # Game state
         self.board = [['' for _ in range(self.BOARD_SIZE)] for _ in range(self.BOARD_SIZE)]
+        self.board_version = 0  # Version of the last board update applied
         self.tile_rack = []  # Will be populated from server
         self.selected_rack_index = None
         self.selected_board_cell = None
@@ -143,8 +140,10 @@ class ScrabbleClient:
         self.DOUBLE_CLICK_TIME = 300  # milliseconds
         
         # Dictionary for word validation
-        self.dictionary = set()
+        self.dictionary = None  # DictionaryIndex; only membership is used
         self._load_dictionary()
+        self.anagrams = None  # AnagramIndex for hints, built on the first hint request
+        self.anagrams_building = False
         
         # Move log
         self.move_log = []  # List of moves
@@ -170,6 +169,8 @@ class ScrabbleClient:
         
         # Network connection
         self.sock = None
+        self.reader = None  # LineReader over self.sock, shared by handshake and network thread
+        self.codec = protocol.JSON  # Wire protocol granted by the server
         self.running = True  # Add running flag for shutdown
         self.network_thread = None
         self.ready = False  # Track if this client is ready
@@ -215,17 +216,8 @@ class ScrabbleClient:
         self._clear_text_cache()  # Clear cache when fonts change
 
     def _initialize_special_tiles(self):
-        """Initialize the special tiles grid."""
-        special_tiles = [['' for _ in range(self.BOARD_SIZE)] for _ in range(self.BOARD_SIZE)]
-        
-        for r, c in self.TRIPLE_WORD:
-            special_tiles[r][c] = 'TW'
-        for r, c in self.DOUBLE_WORD:
-            special_tiles[r][c] = 'DW'
-        for r, c in self.TRIPLE_LETTER:
-            special_tiles[r][c] = 'TL'
-        for r, c in self.DOUBLE_LETTER:
-            special_tiles[r][c] = 'DL'
+        """Initialize the special tiles grid from the shared square table."""
+        special_tiles = [[square_type or '' for square_type in row] for row in rules.SQUARE_TYPES]
         
         # Center tile is double word (no need for special '*' handling)
         special_tiles[7][7] = '*'
@@ -402,36 +394,45 @@ class ScrabbleClient:
             server_ip = self.ip_input if self.ip_input else 'localhost'
             self.HOST = server_ip
             
-            print(f"[DEBUG] Attempting to connect to {self.HOST}:{self.PORT}")
+            log.debug("connecting", host=self.HOST, port=self.PORT)
             try:
                 # Set a short timeout for the initial connection
                 self.sock.settimeout(10.0)
                 self.sock.connect((self.HOST, self.PORT))
-                print("[DEBUG] Socket connection successful")
+                log.debug("socket connected")
                 # After connection, set a longer timeout for user input
                 self.sock.settimeout(None)  # No timeout for user input
                 
                 # Only proceed with username if connection is successful
                 username = self.username_input
-                print(f"[DEBUG] Sending username: {username}")
+                log.debug("sending username", user=username)
                 # Set a timeout for the username response
                 self.sock.settimeout(10.0)
-                self.sock.sendall(f"USERNAME:{username}\n".encode())
+                if self.WIRE_PROTOCOL == protocol.JSON:
+                    self.sock.sendall(f"USERNAME:{username}\n".encode())
+                else:
+                    self.sock.sendall(f"USERNAME:{username};PROTO={self.WIRE_PROTOCOL}\n".encode())
+                # One reader per connection; the network thread keeps using it
+                self.reader = LineReader(self.sock, self.MAX_MESSAGE_LENGTH)
                 response = self._receive_line()
-                print(f"[DEBUG] Server response: {response}")
+                log.debug("handshake response", response=response)
                 if response.startswith("ERROR"):
                     self.error_message = f"Server rejected connection: {response[6:]}"
                     self.error_time = pygame.time.get_ticks()  # Set error time when setting error
                     self.connecting = False
                     self._reset_game_state()
                     return
-                elif response != "OK:Username accepted":
+                elif response == f"OK:Username accepted;PROTO={self.WIRE_PROTOCOL}":
+                    self.codec = self.WIRE_PROTOCOL
+                elif response == "OK:Username accepted":
+                    self.codec = protocol.JSON  # Server kept the JSON fallback
+                else:
                     self.error_message = "Unexpected server response"
                     self.error_time = pygame.time.get_ticks()  # Set error time when setting error
                     self.connecting = False
                     self._reset_game_state()
                     return
-                print("[DEBUG] Connected successfully! Waiting for game data...")
+                log.info("connected, waiting for game data", user=username)
                 # Store the username after successful connection
                 self.username = username
                 
@@ -476,99 +477,174 @@ class ScrabbleClient:
 
     def _receive_line(self):
         """Helper to read a complete line from socket."""
-        buffer = []
-        while True:
-            try:
-                chunk = self.sock.recv(1).decode()
-                if not chunk:
-                    break
-                if chunk == '\n':
-                    break
-                buffer.append(chunk)
-            except socket.timeout:
-                print("Timeout while receiving data")
-                break
-            except Exception as e:
-                print(f"Error receiving data: {e}")
-                break
-        return ''.join(buffer)
+        try:
+            return self.reader.read_line() or ''
+        except socket.timeout:
+            log.warning("timeout while receiving")
+        except Exception as e:
+            log.error("receive failed", error=str(e))
+        return ''
 
     def _receive_messages(self):
         """Network thread function to receive messages from server."""
-        buffer = ""
-        print("Network thread started - waiting for messages...")
+        log.debug("network thread started")
         while self.running:
             if self.sock:
                 try:
                     # Check if socket is actually connected before trying to receive
                     if not self.sock.getpeername():
-                        print("Socket not connected, waiting...")
+                        log.debug("socket not connected, waiting")
                         time.sleep(0.1)
                         continue
                         
-                    data = self.sock.recv(4096).decode()
-                    if not data:
-                        print("Connection closed by server")
-                        self._handle_server_disconnect("Server closed the connection")
+                    if self.codec == protocol.BINARY:
+                        # Decoded dict, or str for text replies
+                        line = self.reader.read_frame()
+                    else:
+                        line = self.reader.read_line()
+                    if line is None:
+                        log.info("connection closed by server")
+                        if self._handle_server_disconnect("Server closed the connection"):
+                            continue
                         break
-                    buffer += data
-                    while '\n' in buffer:
-                        line, buffer = buffer.split('\n', 1)
+                    if isinstance(line, str):
                         line = line.strip()
-                        print(f"[DEBUG] Received line: {repr(line)}")  # Debug print
-                        if line:
-                            try:
-                                self._process_server_message(line)
-                            except json.JSONDecodeError as e:
-                                print(f"JSON decode error: {e}")
-                                print(f"Raw message was: {repr(line)}")
-                                if line.startswith("ERROR:"):
-                                    print(f"Server error: {line[6:]}")
-                                    if "shutting down" in line.lower():
-                                        print("Server is shutting down, returning to connection screen...")
-                                        self._handle_server_disconnect("Server is shutting down")
-                                        return
-                                elif line.startswith("OK:"):
-                                    print(f"Server confirmation: {line[3:]}")
-                            except Exception as e:
-                                print(f"Error processing message: {e}")
-                                print(f"Raw message was: {repr(line)}")
+                    if line:
+                        try:
+                            self._process_server_message(line)
+                        except json.JSONDecodeError as e:
+                            log.error("undecodable message", error=str(e), message=line)
+                            if line.startswith("ERROR:"):
+                                log.error("server error", error=line[6:])
+                                if "shutting down" in line.lower():
+                                    log.info("server is shutting down")
+                                    self._handle_server_disconnect("Server is shutting down", resume=False)
+                                    return
+                            elif line.startswith("OK:"):
+                                log.debug("server confirmation", message=line[3:])
+                        except Exception as e:
+                            log.error("message processing failed", error=str(e), message=line)
                 except socket.timeout:
                     continue
                 except ConnectionResetError:
-                    print("Connection reset by server")
-                    self._handle_server_disconnect("Connection reset by server")
+                    log.info("connection reset by server")
+                    if self._handle_server_disconnect("Connection reset by server"):
+                        continue
                     break
                 except Exception as e:
                     if self.running:
-                        print(f"Network error: {e}")
-                        self._handle_server_disconnect(f"Network error: {str(e)}")
+                        log.error("network error", error=str(e))
+                        if self._handle_server_disconnect(f"Network error: {str(e)}"):
+                            continue
                     break
             else:
                 # If no socket, wait a bit before checking again
                 time.sleep(0.1)
 
-    def _handle_server_disconnect(self, error_message):
-        """Handle server disconnection by returning to connection screen with error message."""
-        print(f"Handling server disconnect: {error_message}")
+    def _handle_server_disconnect(self, error_message, resume=True):
+        """Handle server disconnection by returning to connection screen with error message.
+
+        A game in progress is first resumed on a new connection if possible;
+        returns True when it was.
+        """
+        log.info("server disconnected", reason=error_message)
+        if resume and self.running and self.game_started and not self.game_ended and self._resume_session():
+            return True
         with self.state_lock:
             self._reset_game_state()
             self.error_message = error_message
             self.error_time = pygame.time.get_ticks()
             self.connection_screen = True
+        return False
+
+    def _resume_session(self):
+        """Reconnect and ask the server for our seat back.
+
+        The RESUME option tells the server the board version and move log
+        length we have, so it only sends what changed while we were away.
+        Returns False if no connection could be made.
+        """
+        options = "" if self.WIRE_PROTOCOL == protocol.JSON else f";PROTO={self.WIRE_PROTOCOL}"
+        for attempt in range(1, self.RESUME_ATTEMPTS + 1):
+            time.sleep(self.RESUME_DELAY)
+            if not self.running:
+                return False
+            log.info("reconnecting to resume the game", attempt=attempt)
+            try:
+                sock = socket.create_connection((self.HOST, self.PORT), timeout=10.0)
+            except OSError as e:
+                log.warning("reconnect failed", attempt=attempt, error=str(e))
+                continue
+            try:
+                sock.sendall(f"USERNAME:{self.username}{options};RESUME={self.board_version},{len(self.move_log)}\n".encode())
+                reader = LineReader(sock, self.MAX_MESSAGE_LENGTH)
+                response = reader.read_line() or ''
+            except OSError as e:
+                log.warning("reconnect failed", attempt=attempt, error=str(e))
+                sock.close()
+                continue
+            if not response.startswith("OK:"):
+                log.warning("server refused to resume", response=response)
+                sock.close()
+                return False
+            flags = response.split(';')[1:]
+            with self.state_lock:
+                if "RESUMED" not in flags:
+                    # The seat is gone; start over with whatever the server sends
+                    self._reset_game_state()
+                    self.connection_screen = False
+                elif self.sock:
+                    try:
+                        self.sock.close()
+                    except:
+                        pass
+                self.sock = sock
+                self.reader = reader
+                self.codec = self.WIRE_PROTOCOL if f"PROTO={self.WIRE_PROTOCOL}" in flags else protocol.JSON
+            log.info("reconnected", resumed='RESUMED' in flags)
+            return True
+        return False
+
+    def _apply_board_update(self, version, board=None, blanks=None, tiles=None):
+        """Apply a full board snapshot or a delta of placed tiles."""
+        # Return any buffered tiles to the rack before updating board
+        if self.letter_buffer:
+            log.debug("returning buffered tiles to rack for board update")
+            self._return_all_letters()
+
+        self.dragging_tile = False
+        self.dragging_from_board = False
+
+        # Update the board and blank tiles before any buffer operations
+        if board is not None:
+            self.board = board
+            self.blank_tiles = set(tuple(pos) for pos in blanks)
+        for row, col, letter, is_blank in tiles or []:
+            self.board[row][col] = letter
+            if is_blank:
+                self.blank_tiles.add((row, col))
+        self.board_version = version
+        # Only clear confirmed positions from buffer
+        self._clear_confirmed_buffer_positions()
+        # Clear buffer after successful move
+        self.letter_buffer.clear()
+        if hasattr(self, '_pending_buffer'):
+            del self._pending_buffer
+        if hasattr(self, '_pending_rack'):
+            del self._pending_rack
 
     def _process_server_message(self, message):
         """Process a message received from the server."""
-        print(f"Processing message: {repr(message)}")
+        log.debug("message received", message=message)
         try:
-            message = message.strip()
+            if isinstance(message, str):
+                message = message.strip()
             try:
-                data = json.loads(message)
-                print(f"Parsed JSON data: {data}")
+                # Binary protocol messages arrive already decoded
+                data = message if isinstance(message, dict) else json.loads(message)
                 if isinstance(data, dict):
                     message_type = data.get("type")
                     if message_type == "timer_update":
-                        print("Received timer update")
                         # Update timers
                         self.player_timers = {
                             username: data["timers"][username]["time_remaining"]
@@ -579,25 +655,22 @@ class ScrabbleClient:
                             for username in data["timers"]
                         }
                     elif message_type == "game_end":
-                        print("[DEBUG] Game end message received")
+                        log.debug("game end received")
                         with self.state_lock:  # Acquire lock for state changes
-                            print("[DEBUG] Acquired state lock for game end")
                             self.game_ended = True
-                            print("[DEBUG] Set game_ended flag")
                             self.final_scores = data.get("scores", {})
-                            print(f"[DEBUG] Final scores: {self.final_scores}")
                             # Safe winner calculation
                             if self.final_scores:
                                 try:
                                     max_score = max(self.final_scores.values())
                                     winners = [k for k, v in self.final_scores.items() if v == max_score]
                                     self.winner = winners[0] if winners else None
-                                    print(f"[DEBUG] Winner determined: {self.winner}")
+                                    log.debug("game ended", scores=self.final_scores, winner=self.winner)
                                 except ValueError as e:
-                                    print(f"[ERROR] Error calculating winner: {e}")
+                                    log.error("winner calculation failed", error=str(e))
                                     self.winner = None
                             else:
-                                print("[DEBUG] No final scores available")
+                                log.debug("game ended without final scores")
                                 self.winner = None
                             if self.sock:
                                 try:
@@ -611,7 +684,6 @@ class ScrabbleClient:
                                     pass
                                 self.sock = None
                     elif message_type == "players":
-                        print("Received players update")
                         self.players = data["players"]
                         # Update game_started from server
                         if "game_started" in data:
@@ -623,17 +695,31 @@ class ScrabbleClient:
                                 break
                         self.draw_player_list()
                     elif message_type == "move_log":
-                        print("Received move log update")
                         self.move_log = data["moves"]
                         self._calculate_move_log_content_height()  # Calculate height after updating moves
                         # Scroll to bottom when new moves are added
                         max_scroll = max(0, self.move_log_content_height - (self.move_log_height - 40 * self.scale_factor))
                         self.move_log_scroll = max_scroll
+                    elif message_type == "move_log_append":
+                        seq = data.get("seq", 0)
+                        if seq > len(self.move_log):
+                            # We missed entries; ask the server for the whole log
+                            log.debug("move log gap, requesting resync", have=len(self.move_log), seq=seq)
+                            try:
+                                self.sock.sendall(b"GET_MOVE_LOG\n")
+                            except Exception as e:
+                                log.error("move log request failed", error=str(e))
+                        else:
+                            # Skip any entries we already have
+                            self.move_log.extend(data["moves"][len(self.move_log) - seq:])
+                            self._calculate_move_log_content_height()  # Calculate height after updating moves
+                            # Scroll to bottom when new moves are added
+                            max_scroll = max(0, self.move_log_content_height - (self.move_log_height - 40 * self.scale_factor))
+                            self.move_log_scroll = max_scroll
                     elif message_type == "rack_update":
-                        print("Received rack update")
                         self.tile_rack = data.get('rack', [])
                         self.tiles_remaining = data.get('tiles_remaining', 0)
-                        print(f"Rack updated: {self.tile_rack} (Tiles remaining: {self.tiles_remaining})")
+                        log.debug("rack updated", rack=list(self.tile_rack), tiles_remaining=self.tiles_remaining)
                         # Clear buffer after successful move
                         self.letter_buffer.clear()
                         if hasattr(self, '_pending_buffer'):
@@ -641,49 +727,41 @@ class ScrabbleClient:
                         if hasattr(self, '_pending_rack'):
                             del self._pending_rack
                     elif message_type == "tiles_remaining":
-                        print("Received tiles remaining update")
                         self.tiles_remaining = data.get('tiles_remaining', 0)
                         self.tile_distribution = data.get('distribution', {})
-                        print(f"Tiles remaining updated: {self.tiles_remaining}")
-                        print(f"Tile distribution: {self.tile_distribution}")
+                        log.debug("tiles remaining updated", tiles_remaining=self.tiles_remaining, distribution=self.tile_distribution)
                     elif message_type == "game_start":
-                        print("Game started!")
+                        log.info("game started")
                         self.game_started = True
                         self.ready = True
                         # Request rack update when game starts
                         try:
                             self.sock.sendall(b"GET_RACK\n")
                         except Exception as e:
-                            print(f"Failed to request rack update: {e}")
+                            log.error("rack request failed", error=str(e))
                     elif message_type == "board_update":
-                        print("Received board update with blanks")
-                        # Return any buffered tiles to the rack before updating board
-                        if self.letter_buffer:
-                            print("[DEBUG] Returning buffered tiles to rack due to board update")
-                            self._return_all_letters()
-                        
-                        self.dragging_tile = False
-                        self.dragging_from_board = False
-
-                        # Store the blank positions before any operations
-                        blank_positions = set(tuple(pos) for pos in data['blanks'])
-                        # Update the board and blank tiles before any buffer operations
-                        self.board = data['board']
-                        self.blank_tiles = blank_positions
-                        # Only clear confirmed positions from buffer
-                        self._clear_confirmed_buffer_positions()
-                        # Clear buffer after successful move
-                        self.letter_buffer.clear()
-                        if hasattr(self, '_pending_buffer'):
-                            del self._pending_buffer
-                        if hasattr(self, '_pending_rack'):
-                            del self._pending_rack
+                        self._apply_board_update(data.get('version', 0), board=data['board'], blanks=data['blanks'])
+                    elif message_type == "board_delta":
+                        version = data.get('version', 0)
+                        # Deltas sent on resume span several versions
+                        since = data.get('since', version - 1)
+                        if version <= self.board_version:
+                            log.debug("ignoring stale board delta", version=version)
+                        elif since != self.board_version:
+                            # Missed an update, fall back to a full snapshot
+                            log.debug("board delta gap, requesting full board", have=self.board_version, version=version)
+                            try:
+                                self.sock.sendall(b"GET_BOARD\n")
+                            except Exception as e:
+                                log.error("board request failed", error=str(e))
+                        else:
+                            self._apply_board_update(version, tiles=data['tiles'])
                     else:
-                        print(f"Unknown message type: {data}")
+                        log.warning("unknown message type", message=data)
             except json.JSONDecodeError:
                 if message.startswith("ERROR:") or message.startswith("Error:") or message.startswith("Exchange Error:"):
                     err_msg = message.split(":", 1)[1].strip() if ":" in message else message
-                    print(f"Server error: {err_msg}")
+                    log.info("server error", error=err_msg)
                     self._set_error(err_msg)
                     # Restore buffer and rack if a move was pending
                     if hasattr(self, '_pending_buffer') and hasattr(self, '_pending_rack'):
@@ -692,16 +770,15 @@ class ScrabbleClient:
                         del self._pending_buffer
                         del self._pending_rack
                     if "shutting down" in message.lower():
-                        print("Server is shutting down, returning to connection screen...")
+                        log.info("server is shutting down")
                         self._handle_server_disconnect("Server is shutting down")
                         return
                 elif message.startswith("OK:"):
-                    print(f"Server confirmation: {message[3:]}")
+                    log.debug("server confirmation", message=message[3:])
                 else:
-                    print(f"Unknown message format: {message}")
-        except Exception as e:
-            print(f"Error processing server message: {e}")
-            print(f"Raw message was: {repr(message)}")
+                    log.warning("unknown message format", message=message)
+        except Exception:
+            log.exception("server message processing failed", message=message)
 
     def _clear_confirmed_buffer_positions(self):
         """Remove buffer entries that are now confirmed on the server."""
@@ -1507,6 +1584,8 @@ class ScrabbleClient:
                 username = f"{player['username']}"
                 if player['username'] == self.username:
                     username += " (you)"
+                elif player.get('away'):
+                    username += " (away)"
                 text = f"{username}: {player['points']} pts"
                 
                 # Wrap text if it's too long
@@ -1705,7 +1784,7 @@ class ScrabbleClient:
         
         # Check if position is already occupied (server or buffer)
         if self.board[row][col] != '' or (row, col) in self.letter_buffer:
-            print(f"Position ({row}, {col}) is already occupied")
+            log.debug("position already occupied", row=row, col=col)
             return
             
         letter = self.tile_rack[self.selected_rack_index]
@@ -1743,7 +1822,7 @@ class ScrabbleClient:
         self.dragging_from_board = False
         self.dragging_tile = False
 
-        print("All letters returned to rack")
+        log.debug("all letters returned to rack")
 
     def _send_word(self):
         """Send all buffered letters to the server as a batch."""
@@ -1764,12 +1843,12 @@ class ScrabbleClient:
                 for r, c in sorted(self.blank_tiles):
                     blank_positions.extend([str(r), str(c)])
                 batch_move = f"{batch_move}|{','.join(blank_positions)}"
-                print(f"[DEBUG] Sending blank positions: {blank_positions}")  # Debug log
-            self.sock.sendall(batch_move.encode())
-            print(f"Sent word batch with {len(self.letter_buffer)} letters: {batch_move}")
+                log.debug("sending blank positions", positions=blank_positions)
+            self.sock.sendall(f"{batch_move}\n".encode())
+            log.debug("word batch sent", letters=len(self.letter_buffer), batch=batch_move)
             # Do NOT clear the buffer yet; wait for server confirmation
         except Exception as e:
-            print(f"Failed to send word: {e}")
+            log.error("word send failed", error=str(e))
             self._return_all_letters()
 
     def _draw_tiles(self):
@@ -1791,8 +1870,8 @@ class ScrabbleClient:
             tiles_needed = 7 - len(self.tile_rack)
             # Request to draw tiles (server will give us what's available)
             draw_request = f"DRAW:{tiles_needed}"
-            self.sock.sendall(draw_request.encode())
-            print(f"Requested to draw {tiles_needed} tiles")
+            self.sock.sendall(f"{draw_request}\n".encode())
+            log.debug("draw requested", count=tiles_needed)
             
         except Exception as e:
             self._set_error(f"Failed to request tiles: {e}")
@@ -1807,15 +1886,15 @@ class ScrabbleClient:
             # Get the letters to exchange
             tiles = [self.tile_rack[i] for i in sorted(self.tiles_to_exchange)]
             exchange_request = f"EXCHANGE:{','.join(tiles)}"
-            self.sock.sendall(exchange_request.encode())
-            print(f"Requesting to exchange tiles: {tiles}")
+            self.sock.sendall(f"{exchange_request}\n".encode())
+            log.debug("exchange requested", tiles=tiles)
             
             # Reset exchange mode
             self.exchange_mode = False
             self.tiles_to_exchange.clear()
             
         except Exception as e:
-            print(f"Failed to send exchange request: {e}")
+            log.error("exchange request failed", error=str(e))
             self._set_error(f"Failed to exchange tiles: {e}")
             # Reset exchange mode on error
             self.exchange_mode = False
@@ -1832,7 +1911,7 @@ class ScrabbleClient:
             self.sock.sendall(f"{message}\n".encode())
             # Don't set local ready state - wait for server confirmation
         except Exception as e:
-            print(f"Failed to send {message}: {e}")
+            log.error("command send failed", command=message, error=str(e))
             self._set_error(f"Failed to send {message}: {e}")
 
     def _handle_mouse_click(self, pos):
@@ -1881,7 +1960,7 @@ class ScrabbleClient:
                 try:
                     self._reset_game_state()
                 except Exception as e:
-                    print(f"Error during disconnect: {e}")
+                    log.error("disconnect failed", error=str(e))
                     # Even if there's an error, try to clean up
                     self._reset_game_state()
                 return
@@ -2095,7 +2174,7 @@ class ScrabbleClient:
         # Always allow quitting with Q, unless we're in the blank letter dialog
         if key == pygame.K_q and not self.showing_blank_dialog:
             # Quit with Q
-            print("\nShutting down client...")
+            log.info("shutting down")
             self.running = False
             return
             
@@ -2170,6 +2249,9 @@ class ScrabbleClient:
             elif key == pygame.K_u:  # Unseen Tiles
                 if self.game_started and self.ready and not self.game_ended:
                     self.showing_unseen_tiles = not self.showing_unseen_tiles
+            elif key == pygame.K_h:  # Hint
+                if self.game_started and self.ready and not self.game_ended:
+                    self._show_hint()
 
         if key == pygame.K_ESCAPE:
             # Cancel selection with ESC
@@ -2258,7 +2340,7 @@ class ScrabbleClient:
 
     def run(self):
         """Main game loop."""
-        print("[DEBUG] Starting main game loop")
+        log.debug("main loop started")
         # Draw initial connection screen
         self._draw_connection_screen()
         pygame.display.flip()
@@ -2267,7 +2349,7 @@ class ScrabbleClient:
             while self.running:
                 for event in pygame.event.get():
                     if event.type == pygame.QUIT:
-                        print("[DEBUG] Received pygame.QUIT event")
+                        log.debug("quit event received")
                         self.running = False
                     elif event.type == pygame.MOUSEBUTTONDOWN:
                         if self.connection_screen:
@@ -2304,54 +2386,45 @@ class ScrabbleClient:
                 pygame.display.flip()
                 self.clock.tick(self.fps)
         except KeyboardInterrupt:
-            print("\nKeyboard interrupt received, shutting down client...")
+            log.info("keyboard interrupt, shutting down")
             self.running = False
-        except Exception as e:
-            print(f"[ERROR] Unexpected error in main game loop: {e}")
-            traceback.print_exc()
+        except Exception:
+            log.exception("main loop failed")
         finally:
-            print("[DEBUG] Entering cleanup in main game loop")
             self._cleanup()
 
     def _cleanup(self):
         """Clean up resources before exiting."""
         if hasattr(self, '_cleaned') and self._cleaned:
-            print("[DEBUG] Cleanup already performed, skipping")
+            log.debug("cleanup already performed")
             return
-        print("[DEBUG] Starting cleanup procedure")
         self._cleaned = True
-        print("Cleaning up resources...")
+        log.info("cleaning up")
         
         # First stop the network thread
         self.running = False
         if self.network_thread and self.network_thread.is_alive():
-            print("[DEBUG] Waiting for network thread to finish")
+            log.debug("waiting for network thread")
             self.network_thread.join(timeout=2.0)
-            print("[DEBUG] Network thread finished")
         
         # Then handle socket cleanup
         if self.sock:
             try:
-                print("[DEBUG] Attempting to send disconnect message")
                 try:
                     self.sock.sendall("DISCONNECT\n".encode())
-                    print("[DEBUG] Disconnect message sent successfully")
                 except Exception as e:
-                    print(f"[ERROR] Failed to send disconnect message: {e}")
-                print("[DEBUG] Closing socket")
+                    log.error("disconnect message failed", error=str(e))
                 self.sock.close()
-                print("[DEBUG] Socket closed successfully")
             except Exception as e:
-                print(f"[ERROR] Error during socket cleanup: {e}")
+                log.error("socket cleanup failed", error=str(e))
             finally:
                 self.sock = None
         
-        print("[DEBUG] Quitting pygame")
         pygame.quit()
 
         input("PRESS ANY KEY TO CONTINUE")
         
-        print("Client shutdown complete")
+        log.info("client shutdown complete")
         sys.exit(0)
 
     def _send_initial_data(self, conn):
@@ -2364,7 +2437,7 @@ class ScrabbleClient:
             # Send rack update
             self._send_rack_update(conn)
         except Exception as e:
-            print(f"[ERROR] Failed to send initial data: {e}")
+            log.error("initial data send failed", error=str(e))
 
     def _send_rack_update(self, conn):
         """Send a player their current rack."""
@@ -2377,7 +2450,7 @@ class ScrabbleClient:
             message = json.dumps(rack_data).encode() + b'\n'
             conn.sendall(message)
         except Exception as e:
-            print(f"[ERROR] Failed to send rack update: {e}")
+            log.error("rack update send failed", error=str(e))
 
     def _set_error(self, msg):
         """Set an error message and schedule it to clear after 3 seconds."""
@@ -2766,19 +2839,49 @@ class ScrabbleClient:
                 base_path = os.path.dirname(os.path.abspath(__file__))
                 
             dict_path = os.path.join(base_path, 'assets', 'dictionary', 'words_with_definitions.txt')
-            
-            with open(dict_path, 'r', encoding='utf-8') as f:
-                # Skip the header line
-                next(f)
-                for line in f:
-                    # Split on tab and take just the word
-                    word = line.strip().split('\t')[0].strip().upper()
-                    self.dictionary.add(word)
-            print(f"[DICTIONARY] Loaded {len(self.dictionary)} words")
+            self.dictionary = load_index(dict_path)
+            log.info("dictionary loaded", words=len(self.dictionary))
         except Exception as e:
-            print(f"[ERROR] Failed to load dictionary: {e}")
+            log.error("dictionary load failed", error=str(e))
             sys.exit(1)
 
+    def _build_anagrams(self):
+        """Build the hint index off the UI thread, then show the hint that asked for it.
+
+        It holds every dictionary word on the heap, so it is only built once
+        the player asks for a hint.
+        """
+        start = time.perf_counter()
+        try:
+            self.anagrams = AnagramIndex.from_words(self.dictionary)
+        except Exception:
+            log.exception("hint index build failed")
+            self._set_error("Hints are unavailable")
+            return
+        finally:
+            self.anagrams_building = False
+        log.debug("hint index built", words=len(self.anagrams), ms=round((time.perf_counter() - start) * 1000, 1))
+        self._show_hint()
+
+    def _show_hint(self):
+        """Show the longest words the rack can spell, flagging bingos."""
+        if self.anagrams is None:
+            if not self.anagrams_building:
+                self.anagrams_building = True
+                threading.Thread(target=self._build_anagrams, daemon=True).start()
+            self._set_error("Hints loading...")
+            return
+        # Tiles placed on the board but not yet sent still belong to the rack
+        rack = self.tile_rack + ['?' if pos in self.blank_tiles else letter
+                                 for pos, letter in self.letter_buffer.items()]
+        words = self.anagrams.words(rack)
+        if not words:
+            self._set_error("Hint: no words in this rack")
+        elif len(words[0]) == rules.RACK_SIZE:
+            self._set_error(f"Bingo: {', '.join(word for word in words if len(word) == rules.RACK_SIZE)}")
+        else:
+            self._set_error(f"Hint: {', '.join(words[:self.HINT_WORDS])}")
+
     def _is_valid_word(self, word):
         """Check if a word is in the dictionary."""
         return word.upper() in self.dictionary
@@ -2964,6 +3067,7 @@ class ScrabbleClient:
         self.tile_rack = []
         self.move_log = []
         self.board = [['' for _ in range(self.BOARD_SIZE)] for _ in range(self.BOARD_SIZE)]
+        self.board_version = 0
         self.dragging_tile = False
         self.dragging_from_board = False
         self.letter_buffer.clear()
@@ -3045,6 +3149,10 @@ class ScrabbleClient:
 
 def main():
     """Entry point for the application."""
+    parser = argparse.ArgumentParser(description="Scrabble game client")
+    logs.add_arguments(parser)
+    args = parser.parse_args()
+    logs.setup(args.log_level, args.log_format)
     client = ScrabbleClient()
     client.run()
 
@@ -0,0 +1,300 @@
+"""Precompiled binary index of the word/definition TSV.
+
+Parsing ``words_with_definitions.txt`` line by line and keeping a
+``{word: definition}`` dict is slow to start and holds one str per word and
+per definition. build_index() compiles the TSV once into a compact file::
+
+    header | word offsets | words || definition offsets | definitions
+
+Words are upper-cased, de-duplicated and sorted, so lookups binary search
+the offset table. load_index() rebuilds the file automatically when the
+source's size, mtime or SHA-256 no longer match the header.
+
+Only the membership part before ``||`` is memory-mapped (read-only), so
+every process using the same index shares one page-cache copy and ``in``
+allocates no heap beyond the key being searched. Definitions, most of the
+file, are read by offset only when the move log asks for one and kept in a
+small LRU cache. A mapped index pickles as its path, so worker processes
+re-map the file rather than receive a copy.
+
+Usage: python dictionary_index.py [source.txt] [--output index.bin]
+"""
+import argparse
+import functools
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+
+import logs
+
+log = logs.get_logger('dictionary')
+
+MAGIC = b'SCRBLIDX'
+FORMAT_VERSION = 2
+# magic, version, word count, membership size, source size, source mtime_ns,
+# source sha256
+_HEADER = struct.Struct('<8sIIIQQ32s')
+_HEADER_SIZE = 128  # header padded so the offset tables are 4-byte aligned
+_MTIME_OFFSET = _HEADER.size - 32 - 8
+_OFFSET_PAIR = struct.Struct('<II')
+INDEX_SUFFIX = '.idx'
+
+
+class DictionaryIndex:
+    """Read-only word -> definition mapping backed by an index image.
+
+    Supports ``in``, ``[]``, ``get``, ``len`` and iteration like the dict it
+    replaces, so rooms and the client can use it unchanged. data holds at
+    least the membership part: an mmap of it when the index is the file at
+    path (definitions are then read from file), or the whole image as bytes
+    when path is None.
+    """
+    DEFINITION_CACHE_SIZE = 256
+
+    def __init__(self, data, path=None, file=None):
+        self.data = data
+        self.path = path
+        magic, version, count, membership_size, _, _, source_hash = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Not a dictionary index or unsupported version")
+        self.count = count
+        self.source_hash = source_hash  # SHA-256 of the TSV this was built from
+        self.membership_size = membership_size
+        table_size = 4 * (count + 1)
+        self.word_offsets = memoryview(data)[_HEADER_SIZE:_HEADER_SIZE + table_size].cast('I')
+        if sys.byteorder != 'little':
+            # Offsets are stored little-endian; big-endian hosts take a copy
+            self.word_offsets = array('I', self.word_offsets.tobytes())
+            self.word_offsets.byteswap()
+        self.words_start = _HEADER_SIZE + table_size
+        self.definitions_start = membership_size + table_size
+        self._file = file  # The mapped file, kept open so a rebuild can't swap it
+        self._file_lock = threading.Lock()
+        self._definition_at = functools.lru_cache(maxsize=self.DEFINITION_CACHE_SIZE)(self._read_definition)
+
+    def _word_at(self, index):
+        start = self.words_start
+        return self.data[start + self.word_offsets[index]:start + self.word_offsets[index + 1]]
+
+    def find(self, word):
+        """Index of word in the sorted word list, or -1."""
+        key = word.encode()
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            if self._word_at(mid) < key:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self.count and self._word_at(low) == key:
+            return low
+        return -1
+
+    def _read(self, offset, size):
+        """Read from the definitions part of the image."""
+        if self._file is None:
+            return self.data[offset:offset + size]
+        with self._file_lock:
+            self._file.seek(offset)
+            return self._file.read(size)
+
+    def _read_definition(self, index):
+        start, end = _OFFSET_PAIR.unpack(self._read(self.membership_size + 4 * index, 8))
+        return self._read(self.definitions_start + start, end - start).decode()
+
+    def definition_at(self, index):
+        """Definition of the word at index, through the LRU cache."""
+        return self._definition_at(index)
+
+    def __contains__(self, word):
+        return isinstance(word, str) and self.find(word) >= 0
+
+    def __getitem__(self, word):
+        index = self.find(word)
+        if index < 0:
+            raise KeyError(word)
+        return self.definition_at(index)
+
+    def get(self, word, default=None):
+        index = self.find(word) if isinstance(word, str) else -1
+        return default if index < 0 else self.definition_at(index)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self._word_at(index).decode()
+
+    def __reduce__(self):
+        if self.path is not None:
+            return open_index, (self.path,)
+        return DictionaryIndex, (bytes(self.data),)
+
+    def close(self):
+        """Unmap the index; the object must not be used afterwards."""
+        self.word_offsets = None
+        self._definition_at.cache_clear()
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        if self._file is not None:
+            self._file.close()
+
+
+def open_index(index_path):
+    """Map an existing index file read-only, without checking its source.
+
+    Only the membership part is mapped; definitions are read from the file.
+    """
+    f = open(index_path, 'rb')
+    try:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError("Truncated dictionary index")
+        membership_size = _HEADER.unpack(header)[3]
+        data = mmap.mmap(f.fileno(), membership_size, access=mmap.ACCESS_READ)
+        try:
+            return DictionaryIndex(data, index_path, f)
+        except Exception:
+            data.close()
+            raise
+    except Exception:
+        f.close()
+        raise
+
+
+def _source_fingerprint(source_path):
+    """Return (size, mtime_ns) of the source file."""
+    stat = os.stat(source_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _source_hash(source_path):
+    digest = hashlib.sha256()
+    with open(source_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.digest()
+
+
+def compile_source(source_path):
+    """Parse the TSV and return the index image as bytes."""
+    entries = {}
+    with open(source_path, 'r', encoding='utf-8') as f:
+        # Skip the header line
+        next(f, None)
+        for line in f:
+            parts = line.strip().split('\t')
+            if len(parts) < 2:
+                continue  # No definition column; the server never accepted these as words
+            word = parts[0].strip().upper()
+            if word:
+                entries[word] = parts[1].strip()
+    words = sorted(entries)
+
+    word_offsets = array('I', [0])
+    definition_offsets = array('I', [0])
+    word_blob = bytearray()
+    definition_blob = bytearray()
+    for word in words:
+        word_blob += word.encode()
+        definition_blob += entries[word].encode()
+        word_offsets.append(len(word_blob))
+        definition_offsets.append(len(definition_blob))
+    if sys.byteorder != 'little':
+        word_offsets.byteswap()
+        definition_offsets.byteswap()
+
+    # Pad the words so the definition offsets stay 4-byte aligned
+    word_blob += b'\0' * (-len(word_blob) % 4)
+    membership_size = _HEADER_SIZE + len(word_offsets) * 4 + len(word_blob)
+    size, mtime_ns = _source_fingerprint(source_path)
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, len(words), membership_size,
+                          size, mtime_ns, _source_hash(source_path))
+    return b''.join([
+        header.ljust(_HEADER_SIZE, b'\0'),
+        word_offsets.tobytes(),
+        bytes(word_blob),
+        definition_offsets.tobytes(),
+        bytes(definition_blob),
+    ])
+
+
+def build_index(source_path, index_path=None):
+    """Compile source_path and write the index atomically; returns the image."""
+    index_path = index_path or source_path + INDEX_SUFFIX
+    image = compile_source(source_path)
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(image)
+    os.replace(tmp_path, index_path)
+    return image
+
+
+def _index_is_current(header, source_path, index_path):
+    """Whether an index header still describes source_path."""
+    magic, version, _, _, size, mtime_ns, sha256 = header
+    if magic != MAGIC or version != FORMAT_VERSION:
+        return False
+    try:
+        current_size, current_mtime_ns = _source_fingerprint(source_path)
+    except OSError:
+        return True  # Only the index was shipped; use it as is
+    if current_size != size:
+        return False
+    if current_mtime_ns == mtime_ns:
+        return True
+    # A copied or re-extracted file gets a new mtime with the same content
+    if _source_hash(source_path) != sha256:
+        return False
+    try:
+        # Record the new mtime so the next start skips the hash
+        with open(index_path, 'r+b') as f:
+            f.seek(_MTIME_OFFSET)
+            f.write(struct.pack('<Q', current_mtime_ns))
+    except OSError:
+        pass
+    return True
+
+
+def load_index(source_path, index_path=None):
+    """Load the index for source_path, rebuilding it if it is stale or missing.
+
+    If the index cannot be written (e.g. a read-only install, or a mapped
+    index on Windows), it is compiled in memory for this run instead.
+    """
+    index_path = index_path or source_path + INDEX_SUFFIX
+    try:
+        with open(index_path, 'rb') as f:
+            header = f.read(_HEADER.size)
+        if len(header) == _HEADER.size and _index_is_current(_HEADER.unpack(header), source_path, index_path):
+            return open_index(index_path)
+    except (OSError, ValueError):
+        pass
+    log.info("building index", path=index_path)
+    try:
+        build_index(source_path, index_path)
+        return open_index(index_path)
+    except OSError as e:
+        log.warning("index not written, compiling in memory", path=index_path, error=str(e))
+        return DictionaryIndex(compile_source(source_path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the word/definition TSV into a binary index")
+    parser.add_argument("source", nargs="?", default=os.path.join('assets', 'dictionary', 'words_with_definitions.txt'))
+    parser.add_argument("--output", help=f"index file (default: source + '{INDEX_SUFFIX}')")
+    logs.add_arguments(parser)
+    args = parser.parse_args()
+    logs.setup(args.log_level, args.log_format)
+    image = build_index(args.source, args.output)
+    index = DictionaryIndex(image)
+    log.info("index built", words=len(index), bytes=len(image))
+
+
+if __name__ == "__main__":
+    main()
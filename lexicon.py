@@ -0,0 +1,309 @@
+"""Minimized DAWG (directed acyclic word graph) over the dictionary words.
+
+A flat word set can only answer "is this a word". The DAWG also answers "is
+this a prefix of a word" and lists the letters that may follow a prefix,
+which is what move generation and hinting need.
+
+The graph is built with Daciuk's incremental algorithm over the sorted
+words of the dictionary index, so equal suffixes are shared, and stored as
+one ``array('I')`` of 32-bit cells. A node is the index of its letter
+mask cell (bit i set when it has an edge for ``chr(65 + i)``), followed by
+one cell per edge in letter order::
+
+    bit  0    the path ending with this edge spells a word
+    bits 1-31 index of the child node, 0 if it has none
+
+The edge for letter code c is at ``node + 1 + popcount(mask & ((1 << c) - 1))``,
+so following an edge is a lookup rather than a scan, and a caller can AND
+the mask with the letters it holds to skip nodes with nothing to offer.
+Index 0 is a placeholder so that 0 can mean "no children"; the root is
+the node written last. Words with characters outside A-Z cannot be played
+and are left out.
+
+The same layout stores the GADDAG used by move generation: every word is
+added once per split point as the reversed prefix, SEPARATOR, then the rest
+(``CARE`` gives ``C[ARE``, ``AC[RE``, ``RAC[E`` and ``ERAC``), so a walk
+can start at any letter of a word and grow in both directions.
+
+load_lexicon() and load_gaddag() cache the frozen graph next to the
+dictionary index and rebuild it when the index was built from a different
+source file. A loaded graph is a read-only memory map of the cache file, so
+processes using the same file share one page-cache copy, and it pickles as
+its path, so worker processes map the file rather than receive a copy.
+
+Usage: python lexicon.py [source.txt]
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+import logs
+from dictionary_index import load_index
+
+log = logs.get_logger('lexicon')
+
+MAGIC = b'SCRBDAWG'
+FORMAT_VERSION = 2
+# magic, version, word count, cell count, root node, source sha256
+_HEADER = struct.Struct('<8sIIII32s')
+LEXICON_SUFFIX = '.dawg'
+GADDAG_SUFFIX = '.gaddag'
+SEPARATOR = '['  # Sorts right after 'Z', so it gets letter code 26
+
+_WORD_BIT = 1
+_CHILD_SHIFT = 1
+
+
+class Lexicon:
+    """Read-only DAWG. ``root`` is the node to start prefix walks from, 0 if empty.
+
+    graph is an ``array('I')``, or a view of the file at path when loaded.
+    """
+
+    def __init__(self, graph, word_count, root, path=None):
+        self.graph = graph
+        self.word_count = word_count
+        self.root = root
+        self.path = path
+
+    @classmethod
+    def from_words(cls, words):
+        """Build from words in sorted order, spelled with A-Z and SEPARATOR.
+
+        Nodes are minimized bottom-up as soon as no later word can reach
+        them and written to the cell array straight away, keyed by their
+        cells, so only the last word's path is ever held as Python objects.
+        """
+        graph = array('I', [0])
+        register = {}  # {cells of a node as bytes: its index in graph}
+        # The last word's path from the root: [final, {letter: edge cell}] per node
+        path = [[False, {}]]
+        previous = ''
+        count = 0
+
+        def minimize(down_to):
+            """Write out the path nodes deeper than down_to and link them to their parents."""
+            while len(path) > down_to + 1:
+                final, edges = path.pop()
+                node = 0
+                if edges:
+                    cells = array('I', [0])
+                    for letter, edge in edges.items():  # Inserted in letter order
+                        cells[0] |= 1 << (ord(letter) - 65)
+                        cells.append(edge)
+                    key = cells.tobytes()
+                    node = register.get(key)
+                    if node is None:
+                        node = register[key] = len(graph)
+                        graph.extend(cells)
+                path[-1][1][previous[len(path) - 1]] = node << _CHILD_SHIFT | (_WORD_BIT if final else 0)
+
+        for word in words:
+            if word <= previous:
+                raise ValueError(f"Words must be sorted and unique: {previous!r} then {word!r}")
+            common = 0
+            for a, b in zip(word, previous):
+                if a != b:
+                    break
+                common += 1
+            minimize(common)
+            path.extend([False, {}] for _ in word[common:])
+            path[-1][0] = True
+            previous = word
+            count += 1
+        minimize(0)
+
+        # The root is written like any other node
+        _, edges = path[0]
+        root = 0
+        if edges:
+            root = len(graph)
+            graph.append(sum(1 << (ord(letter) - 65) for letter in edges))
+            graph.extend(edges.values())
+        return cls(graph, count, root)
+
+    def children(self, node):
+        """Yield (letter, child node, is_word) for each edge out of node."""
+        if not node:
+            return
+        graph = self.graph
+        mask = graph[node]
+        for code in range(27):
+            if mask >> code & 1:
+                node += 1
+                value = graph[node]
+                yield chr(65 + code), value >> _CHILD_SHIFT, bool(value & _WORD_BIT)
+
+    def child(self, node, letter):
+        """Return (child node, is_word) for letter out of node, or None."""
+        if not node:
+            return None
+        bit = 1 << (ord(letter) - 65)
+        mask = self.graph[node]
+        if not mask & bit:
+            return None
+        value = self.graph[node + 1 + (mask & (bit - 1)).bit_count()]
+        return value >> _CHILD_SHIFT, bool(value & _WORD_BIT)
+
+    def walk(self, text, node=None):
+        """Follow text from node (the root by default); returns (node, is_word) or None."""
+        node, is_word = self.root if node is None else node, False
+        for letter in text:
+            step = self.child(node, letter)
+            if step is None:
+                return None
+            node, is_word = step
+        return node, is_word
+
+    def contains(self, word):
+        end = self.walk(word) if word else None
+        return end is not None and end[1]
+
+    __contains__ = contains
+
+    def is_prefix(self, prefix):
+        """Whether some word starts with prefix (a whole word counts)."""
+        end = self.walk(prefix)
+        return end is not None and (end[1] or end[0] != 0)
+
+    def next_letters(self, prefix=''):
+        """Letters that can follow prefix, as (letter, completes_word) pairs."""
+        end = self.walk(prefix)
+        if end is None:
+            return []
+        return [(letter, is_word) for letter, _, is_word in self.children(end[0])]
+
+    def __len__(self):
+        return self.word_count
+
+    def __iter__(self):
+        """Yield every word in sorted order."""
+        yield from self._iter_from(self.root, '')
+
+    def _iter_from(self, node, prefix):
+        for letter, child, is_word in self.children(node):
+            if is_word:
+                yield prefix + letter
+            yield from self._iter_from(child, prefix + letter)
+
+    def save(self, path, source_hash=b''):
+        """Write the cell array to path atomically."""
+        graph = self.graph
+        if sys.byteorder != 'little':
+            graph = array('I', graph)
+            graph.byteswap()
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, self.word_count, len(graph), self.root,
+                                 source_hash.ljust(32, b'\0')))
+            f.write(graph)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, source_hash=None):
+        """Map a saved lexicon read-only; None if missing, corrupt or for another source."""
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    return None
+                magic, version, word_count, cell_count, root, saved_hash = _HEADER.unpack(header)
+                if magic != MAGIC or version != FORMAT_VERSION:
+                    return None
+                if source_hash is not None and saved_hash != source_hash:
+                    return None
+                size = _HEADER.size + 4 * cell_count
+                if os.fstat(f.fileno()).st_size < size:
+                    return None
+                data = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        # The view keeps the map open for as long as the lexicon lives
+        graph = memoryview(data)[_HEADER.size:].cast('I')
+        if sys.byteorder != 'little':
+            # Cells are stored little-endian; big-endian hosts take a copy
+            graph = array('I', graph.tobytes())
+            graph.byteswap()
+        return cls(graph, word_count, root, path)
+
+    def __reduce__(self):
+        if self.path is not None:
+            return Lexicon.load, (self.path,)
+        return Lexicon, (self.graph, self.word_count, self.root)
+
+
+def playable_words(words):
+    """The words spelled only with A-Z; others can never be played."""
+    return (word for word in words if word.isascii() and word.isalpha() and word.isupper())
+
+
+def gaddag_strings(words):
+    """Yield the GADDAG strings of words in sorted order.
+
+    Strings are grouped by their first letter, the last letter of the
+    reversed prefix, so only one group is held and sorted at a time.
+    """
+    words = list(playable_words(words))
+    for first in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ':
+        group = set()
+        for word in words:
+            start = word.find(first)
+            while start >= 0:
+                split = start + 1
+                group.add(word[split - 1::-1] + SEPARATOR + word[split:] if split < len(word) else word[::-1])
+                start = word.find(first, split)
+        yield from sorted(group)
+
+
+def _load_cached(path, source_hash, build):
+    lexicon = Lexicon.load(path, source_hash)
+    if lexicon is not None:
+        return lexicon
+    log.info("building lexicon", path=path)
+    lexicon = build()
+    try:
+        lexicon.save(path, source_hash)
+    except OSError as e:
+        log.warning("lexicon not saved, keeping it in memory", path=path, error=str(e))
+        return lexicon
+    return Lexicon.load(path, source_hash) or lexicon
+
+
+def load_lexicon(source_path, index=None):
+    """Load the cached DAWG for source_path, rebuilding it when stale.
+
+    index is the already loaded DictionaryIndex for source_path, if any.
+    """
+    index = index or load_index(source_path)
+    return _load_cached(source_path + LEXICON_SUFFIX, index.source_hash,
+                        lambda: Lexicon.from_words(playable_words(index)))
+
+
+def load_gaddag(source_path, index=None):
+    """Load the cached GADDAG for source_path, rebuilding it when stale.
+
+    Its length counts GADDAG strings, not words.
+    """
+    index = index or load_index(source_path)
+    return _load_cached(source_path + GADDAG_SUFFIX, index.source_hash,
+                        lambda: Lexicon.from_words(gaddag_strings(index)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the DAWG and GADDAG for the word/definition TSV")
+    parser.add_argument("source", nargs="?", default=os.path.join('assets', 'dictionary', 'words_with_definitions.txt'))
+    logs.add_arguments(parser)
+    args = parser.parse_args()
+    logs.setup(args.log_level, args.log_format)
+    index = load_index(args.source)
+    for name, load in (('DAWG', load_lexicon), ('GADDAG', load_gaddag)):
+        lexicon = load(args.source, index)
+        log.info("lexicon loaded", kind=name, strings=len(lexicon), cells=len(lexicon.graph),
+                 bytes=lexicon.graph.itemsize * len(lexicon.graph))
+
+
+if __name__ == "__main__":
+    main()
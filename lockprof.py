@@ -0,0 +1,261 @@
+"""Lock profiler for the server's client_lock, bag_lock and turn_lock.
+
+The server creates those locks with lock(name). With profiling off that is a
+metrics.TimedLock, which only feeds the lock wait histogram. configure() must
+run before the locks are created; it switches lock() to ProfiledLock, which
+records for every call site that takes the lock:
+
+- acquisitions, how many had to wait, and the total and longest wait
+- how long the lock was held, total and longest
+- which locks the thread already held, i.e. the acquisition order
+
+report() formats those tables; the server prints it on shutdown and with
+its status. Mode 'deadlock' adds checks on top of the report:
+
+- taking a lock the thread already holds raises DeadlockError instead of
+  hanging, since these locks are not reentrant
+- a wait that would close a cycle of threads waiting for each other's locks
+  raises DeadlockError in the thread that closes it
+- a wait longer than STALL_WARNING seconds is logged with the holder's site
+- taking two locks in the opposite order to an earlier acquisition is
+  logged once per pair of locks, with both sites, as a potential deadlock
+
+Locks are grouped by name, so the room.client_lock of every room shares
+one set of rows.
+"""
+import os
+import sys
+import threading
+import time
+
+import logs
+import metrics
+
+OFF = 'off'
+REPORT = 'report'
+DEADLOCK = 'deadlock'
+MODES = (OFF, REPORT, DEADLOCK)
+
+STALL_WARNING = 1.0  # seconds a wait may last before deadlock mode logs it
+
+log = logs.get_logger('lockprof')
+
+_mode = OFF
+_state_lock = threading.Lock()  # Guards everything below; plain, so never profiled
+_sites = {}       # {(lock name, site): SiteStats}
+_orders = {}      # {(held name, held site, name, site): count}
+_order_pairs = {}  # {(first name, second name): (first site, second site)}, deadlock mode
+_reported_inversions = set()
+_held = {}        # {thread ident: [(ProfiledLock, site, acquired at)]}
+_waiting = {}     # {thread ident: ProfiledLock}, deadlock mode
+
+
+class DeadlockError(RuntimeError):
+    """Raised instead of blocking when an acquisition can never succeed."""
+
+
+class SiteStats:
+    __slots__ = ('acquisitions', 'contended', 'wait_total', 'wait_max', 'hold_total', 'hold_max')
+
+    def __init__(self):
+        self.acquisitions = 0
+        self.contended = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.hold_total = 0.0
+        self.hold_max = 0.0
+
+
+def configure(mode):
+    """Choose the profiling mode for locks created from now on."""
+    global _mode
+    if mode not in MODES:
+        raise ValueError(f"Unknown lock profiling mode {mode}, use one of {', '.join(MODES)}")
+    _mode = mode
+
+
+def enabled():
+    return _mode != OFF
+
+
+def lock(name):
+    """A lock for the server to use under name, profiled if configure() enabled it."""
+    if _mode == OFF:
+        return metrics.TimedLock(name)
+    return ProfiledLock(name, deadlock_checks=_mode == DEADLOCK)
+
+
+def _call_site():
+    """file:line function of the code taking the lock, outside this module."""
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_code.co_filename == __file__:
+        frame = frame.f_back
+    if frame is None:
+        return '?'
+    return f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno} {frame.f_code.co_name}"
+
+
+def _stats(name, site):
+    stats = _sites.get((name, site))
+    if stats is None:
+        stats = _sites[(name, site)] = SiteStats()
+    return stats
+
+
+class ProfiledLock:
+    """Non-reentrant lock that records wait, hold and order per call site."""
+
+    def __init__(self, name, deadlock_checks=False):
+        self._lock = threading.Lock()
+        self.name = name
+        self.deadlock_checks = deadlock_checks
+        self.owner = None  # Thread ident of the holder
+        self.owner_site = None
+
+    def acquire(self, blocking=True, timeout=-1):
+        site = _call_site()
+        me = threading.get_ident()
+        start = time.perf_counter()
+        acquired = self._lock.acquire(False)
+        contended = not acquired
+        if contended and blocking:
+            if self.deadlock_checks:
+                acquired = self._acquire_checked(me, site, timeout)
+            else:
+                acquired = self._lock.acquire(True, timeout)
+        now = time.perf_counter()
+        if contended and blocking:
+            metrics.LOCK_WAIT_SECONDS.observe(now - start, self.name)
+        if acquired:
+            self._acquired(me, site, now, now - start if contended else 0.0)
+        return acquired
+
+    def _acquire_checked(self, me, site, timeout):
+        """Blocking acquire with the deadlock mode checks."""
+        with _state_lock:
+            if self.owner == me:
+                raise DeadlockError(f"{self.name} taken again at {site} by the thread holding it "
+                                    f"since {self.owner_site}")
+            _waiting[me] = self
+            cycle = self._wait_cycle(me)
+            if cycle:
+                del _waiting[me]
+                raise DeadlockError(f"{self.name} at {site} would deadlock: {cycle}")
+        try:
+            deadline = None if timeout < 0 else time.monotonic() + timeout
+            while True:
+                wait = STALL_WARNING if deadline is None else min(STALL_WARNING, max(0.0, deadline - time.monotonic()))
+                if self._lock.acquire(True, wait):
+                    return True
+                if deadline is not None and time.monotonic() >= deadline:
+                    return False
+                log.warning("lock wait stalled", lock=self.name, site=site,
+                            holder=self.owner_site, holder_thread=self.owner)
+        finally:
+            with _state_lock:
+                _waiting.pop(me, None)
+
+    def _wait_cycle(self, me):
+        """Description of the waits-for cycle closed by me waiting for self, or None (holds _state_lock)."""
+        chain = []
+        lock_ = self
+        seen = set()
+        while lock_ is not None:
+            owner = lock_.owner
+            if owner is None or owner in seen:
+                return None
+            chain.append(f"{lock_.name} held at {lock_.owner_site}")
+            if owner == me:
+                return ' -> '.join(chain)
+            seen.add(owner)
+            lock_ = _waiting.get(owner)
+        return None
+
+    def _acquired(self, me, site, now, waited):
+        with _state_lock:
+            self.owner = me
+            self.owner_site = site
+            stats = _stats(self.name, site)
+            stats.acquisitions += 1
+            if waited:
+                stats.contended += 1
+                stats.wait_total += waited
+                stats.wait_max = max(stats.wait_max, waited)
+            held = _held.setdefault(me, [])
+            for other, other_site, _ in held:
+                key = (other.name, other_site, self.name, site)
+                _orders[key] = _orders.get(key, 0) + 1
+                if self.deadlock_checks and other.name != self.name:
+                    self._check_order(other.name, other_site, site)
+            held.append((self, site, now))
+
+    def _check_order(self, first, first_site, site):
+        """Log the first acquisition of this pair of locks in the opposite order (holds _state_lock)."""
+        _order_pairs.setdefault((first, self.name), (first_site, site))
+        reverse = _order_pairs.get((self.name, first))
+        pair = frozenset((first, self.name))
+        if reverse is not None and pair not in _reported_inversions:
+            _reported_inversions.add(pair)
+            log.error("lock order inversion, potential deadlock",
+                      order=f"{first} -> {self.name}", at=f"{first_site} -> {site}",
+                      earlier=f"{self.name} -> {first}", earlier_at=f"{reverse[0]} -> {reverse[1]}")
+
+    def release(self):
+        now = time.perf_counter()
+        with _state_lock:
+            owner = self.owner
+            self.owner = None
+            self.owner_site = None
+            held = _held.get(owner, [])
+            for index in range(len(held) - 1, -1, -1):
+                if held[index][0] is self:
+                    _, site, since = held.pop(index)
+                    stats = _stats(self.name, site)
+                    stats.hold_total += now - since
+                    stats.hold_max = max(stats.hold_max, now - since)
+                    break
+            if not held:
+                _held.pop(owner, None)
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+def report():
+    """Per call site lock statistics and acquisition orders, as text."""
+    with _state_lock:
+        sites = [(name, site, stats.acquisitions, stats.contended, stats.wait_total, stats.wait_max,
+                  stats.hold_total, stats.hold_max)
+                 for (name, site), stats in _sites.items()]
+        orders = sorted(_orders.items(), key=lambda item: -item[1])
+    if not sites:
+        return "[LOCKS] No profiled lock acquisitions"
+    lines = [f"[LOCKS] Lock profile ({_mode} mode), by total wait then hold time",
+             f"{'lock':<20} {'site':<48} {'acq':>8} {'waited':>7} {'wait ms':>9} {'max':>8} "
+             f"{'hold ms':>9} {'max':>8}"]
+    sites.sort(key=lambda row: (-row[4], -row[6]))
+    for name, site, acquisitions, contended, wait_total, wait_max, hold_total, hold_max in sites:
+        lines.append(f"{name:<20} {site:<48} {acquisitions:>8} {contended:>7} {wait_total * 1000:>9.2f} "
+                     f"{wait_max * 1000:>8.2f} {hold_total * 1000:>9.2f} {hold_max * 1000:>8.2f}")
+    if orders:
+        lines.append("[LOCKS] Acquired while holding another lock")
+        for (held_name, held_site, name, site), count in orders:
+            lines.append(f"  {held_name} ({held_site}) -> {name} ({site}): {count}")
+    return '\n'.join(lines)
+
+
+def reset():
+    """Forget the statistics gathered so far."""
+    with _state_lock:
+        _sites.clear()
+        _orders.clear()
+        _order_pairs.clear()
+        _reported_inversions.clear()
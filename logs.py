@@ -0,0 +1,163 @@
+"""Leveled, structured logging for the server and the client.
+
+Modules log through get_logger(name) and pass the facts of an event as
+keyword fields instead of formatting them into the message:
+
+    log.debug("word scored", word=word, score=score)
+
+A call below the configured level returns before anything is formatted, so
+debug output on the move and broadcast paths costs one method call when it
+is off. setup() hands every record to a queue drained by a listener thread
+that formats and writes it; logging under client_lock or turn_lock never
+waits on the terminal. Fields are formatted on that thread, so pass values,
+not containers the caller goes on to change.
+
+Records are written as text (``time LEVEL name: message key=value ...``) or
+as one JSON object per line with --log-format json.
+"""
+import atexit
+import contextlib
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+
+ROOT = 'scrabble'
+LEVELS = ('debug', 'info', 'warning', 'error')
+FORMATS = ('text', 'json')
+DEFAULT_LEVEL = 'info'
+DEFAULT_FORMAT = 'text'
+
+_listener = None
+
+
+class Logger:
+    """A logging.Logger that takes structured fields as keyword arguments."""
+
+    __slots__ = ('logger',)
+
+    def __init__(self, logger):
+        self.logger = logger
+
+    def enabled(self, level=logging.DEBUG):
+        """Whether records at level are written; guards costly field values."""
+        return self.logger.isEnabledFor(level)
+
+    def _log(self, level, msg, fields, exc_info=False):
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, msg, exc_info=exc_info, extra={'fields': fields})
+
+    def debug(self, msg, **fields):
+        self._log(logging.DEBUG, msg, fields)
+
+    def info(self, msg, **fields):
+        self._log(logging.INFO, msg, fields)
+
+    def warning(self, msg, **fields):
+        self._log(logging.WARNING, msg, fields)
+
+    def error(self, msg, **fields):
+        self._log(logging.ERROR, msg, fields)
+
+    def exception(self, msg, **fields):
+        """Log at error level with the traceback of the exception being handled."""
+        self._log(logging.ERROR, msg, fields, exc_info=True)
+
+
+def get_logger(name):
+    return Logger(logging.getLogger(f"{ROOT}.{name}"))
+
+
+def _field_text(value):
+    if isinstance(value, str) and value and not any(c.isspace() or c in '"=' for c in value):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return json.dumps(value, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """``HH:MM:SS.mmm LEVEL name: message key=value ...``"""
+
+    def format(self, record):
+        line = (f"{self.formatTime(record, '%H:%M:%S')}.{int(record.msecs):03d} {record.levelname:<7} "
+                f"{record.name[len(ROOT) + 1:]}: {record.getMessage()}")
+        fields = getattr(record, 'fields', None)
+        if fields:
+            line += ' ' + ' '.join(f"{key}={_field_text(value)}" for key, value in fields.items())
+        if record.exc_info:
+            line += '\n' + self.formatException(record.exc_info)
+        return line
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message and the fields."""
+
+    def format(self, record):
+        entry = {
+            'time': round(record.created, 3),
+            'level': record.levelname.lower(),
+            'logger': record.name[len(ROOT) + 1:],
+            'message': record.getMessage()
+        }
+        entry.update(getattr(record, 'fields', None) or {})
+        if record.exc_info:
+            entry['traceback'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # Same process, so the record is queued as is and formatted by the listener
+        return record
+
+
+def setup(level=DEFAULT_LEVEL, fmt=DEFAULT_FORMAT, stream=None):
+    """Write records at level and above to stream (stdout) from a listener thread."""
+    global _listener
+    shutdown()
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(JsonFormatter() if fmt == 'json' else TextFormatter())
+    records = queue.SimpleQueue()
+    root = logging.getLogger(ROOT)
+    root.handlers[:] = [_QueueHandler(records)]
+    root.setLevel(level.upper())
+    root.propagate = False
+    _listener = logging.handlers.QueueListener(records, handler)
+    _listener.start()
+
+
+def shutdown():
+    """Stop the listener once it has written every queued record."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown)
+
+
+@contextlib.contextmanager
+def quiet(name, level='error'):
+    """Drop the records of get_logger(name) below level inside the block.
+
+    For the game rooms a benchmark or self-play drives in-process; debug
+    calls then return before formatting anything.
+    """
+    logger = logging.getLogger(f"{ROOT}.{name}")
+    previous = logger.level
+    logger.setLevel(level.upper())
+    try:
+        yield
+    finally:
+        logger.setLevel(previous)
+
+
+def add_arguments(parser):
+    """Add --log-level and --log-format to an argparse parser."""
+    parser.add_argument('--log-level', choices=LEVELS, default=DEFAULT_LEVEL,
+                        help="lowest level of log records to write")
+    parser.add_argument('--log-format', choices=FORMATS, default=DEFAULT_FORMAT,
+                        help="write log records as text or as JSON lines")
@@ -0,0 +1,227 @@
+"""Process-wide counters and histograms in the Prometheus text format.
+
+The server updates the metrics below from its hot paths; serve() exposes
+them on a local HTTP endpoint (``GET /metrics``) for Prometheus or curl.
+Every update is a short critical section on the metric's own lock, and
+TimedLock only records a wait when the lock was actually contended, so the
+hooks stay on in production. Gauges such as the number of connected clients
+are read by callbacks when the endpoint is scraped, not maintained on every
+change.
+"""
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; spans a dictionary hit to a slow broadcast
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def _label_text(label_names, values):
+    if not label_names:
+        return ''
+    pairs = []
+    for name, value in zip(label_names, values):
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+class Counter:
+    """Monotonic counter, optionally split by one or more labels."""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.lock = threading.Lock()
+        self.values = {}  # {label values: count}
+
+    def inc(self, amount=1, *label_values):
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self.lock:
+            values = dict(self.values)
+        if not values and not self.labels:
+            values[()] = 0
+        return [(f"{self.name}_total", label_values, value) for label_values, value in sorted(values.items())]
+
+
+class Histogram:
+    """Distribution of observed values in cumulative buckets, optionally labeled."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self.lock = threading.Lock()
+        self.values = {}  # {label values: [bucket counts..., +Inf count, sum]}
+
+    def observe(self, value, *label_values):
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            counts = self.values.get(label_values)
+            if counts is None:
+                counts = self.values[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[index] += 1
+            counts[-1] += value
+
+    def samples(self):
+        with self.lock:
+            values = {label_values: list(counts) for label_values, counts in self.values.items()}
+        samples = []
+        for label_values, counts in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", label_values + (bound,), cumulative))
+            samples.append((f"{self.name}_count", label_values, cumulative))
+            samples.append((f"{self.name}_sum", label_values, counts[-1]))
+        return samples
+
+    def sample_labels(self, name):
+        return self.labels + ('le',) if name.endswith('_bucket') else self.labels
+
+
+class Gauge:
+    """Value read from a callback at scrape time.
+
+    The callback returns a number, or a dict of {label value: number} when
+    the gauge has a label.
+    """
+
+    kind = 'gauge'
+
+    def __init__(self, name, help_text, read, labels=()):
+        self.name = name
+        self.help = help_text
+        self.read = read
+        self.labels = tuple(labels)
+
+    def samples(self):
+        value = self.read()
+        if isinstance(value, dict):
+            return [(self.name, (label,), number) for label, number in sorted(value.items())]
+        return [(self.name, (), value)]
+
+
+class Registry:
+    """The metrics rendered by the endpoint, keyed by name."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics = {}
+
+    def register(self, metric):
+        """Add metric, replacing one of the same name (e.g. a gauge of a restarted server)."""
+        with self.lock:
+            self.metrics[metric.name] = metric
+        return metric
+
+    def unregister(self, name):
+        with self.lock:
+            self.metrics.pop(name, None)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        with self.lock:
+            metrics = list(self.metrics.values())
+        lines = []
+        for metric in metrics:
+            try:
+                samples = metric.samples()
+            except Exception:
+                continue  # A gauge whose owner is gone; skip it rather than fail the scrape
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, label_values, value in samples:
+                label_names = metric.sample_labels(name) if isinstance(metric, Histogram) else metric.labels
+                lines.append(f"{name}{_label_text(label_names, label_values)} {value}")
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+COMMAND_SECONDS = REGISTRY.register(Histogram(
+    'scrabble_command_seconds', "Time to handle an in-game command.", ('command',)))
+MOVES = REGISTRY.register(Counter(
+    'scrabble_moves', "Tile placements accepted by the rules."))
+LOCK_WAIT_SECONDS = REGISTRY.register(Histogram(
+    'scrabble_lock_wait_seconds', "Time spent waiting for a contended lock; uncontended acquisitions are not counted.",
+    ('lock',)))
+BROADCAST_SECONDS = REGISTRY.register(Histogram(
+    'scrabble_broadcast_seconds', "Time to queue one message for every client in a room."))
+SENT_BYTES = REGISTRY.register(Counter(
+    'scrabble_sent_bytes', "Encoded bytes queued for sending to clients.", ('type',)))
+DICTIONARY_LOOKUPS = REGISTRY.register(Counter(
+    'scrabble_dictionary_lookups', "Words looked up in the dictionary, for validation or definitions."))
+
+
+class TimedLock:
+    """threading.Lock that records in LOCK_WAIT_SECONDS how long contended acquisitions waited.
+
+    An acquisition that gets the lock straight away is a single non-blocking
+    acquire and records nothing.
+    """
+
+    __slots__ = ('_lock', 'name')
+
+    def __init__(self, name):
+        self._lock = threading.Lock()
+        self.name = name
+
+    def acquire(self, blocking=True, timeout=-1):
+        if self._lock.acquire(False):
+            return True
+        if not blocking:
+            return False
+        start = time.perf_counter()
+        acquired = self._lock.acquire(True, timeout)
+        LOCK_WAIT_SECONDS.observe(time.perf_counter() - start, self.name)
+        return acquired
+
+    def release(self):
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._lock.release()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Scrapes every few seconds would drown the server log
+
+
+def serve(host, port):
+    """Serve REGISTRY on http://host:port/metrics from a daemon thread; returns the HTTP server."""
+    httpd = ThreadingHTTPServer((host, port), _MetricsHandler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, name='metrics', daemon=True).start()
+    return httpd
@@ -0,0 +1,350 @@
+"""Legal move generation over a GADDAG.
+
+MoveGenerator.generate() lists every play the server would accept for a
+board, the positions of the blanks on it and a rack, each with the score
+_process_batch_move awards: tiles in one row or column forming a single
+main word of two or more letters, touching the board (covering the centre on
+the first play), with the main word and every cross word in the dictionary.
+A ``?`` in the rack plays as any letter; blanks score 0, on the board too,
+since clients list every blank position with their move.
+
+Rows are searched from their anchors, the empty squares next to a tile, as
+in Gordon's GADDAG algorithm: letters are placed leftwards from the anchor,
+then past the separator rightwards, and a letter is only tried if the
+square's cross-check allows it and the GADDAG has an edge for it. Columns
+are searched the same way on the transposed board. A play is only found
+from the leftmost anchor it covers, so each is produced once.
+
+Usage: python movegen.py RACK [source.txt]  (suggests plays for RACK on an empty board)
+"""
+import argparse
+import copy
+import os
+from collections import namedtuple
+
+import rules
+from lexicon import SEPARATOR, load_gaddag
+
+ALL_LETTERS = (1 << 26) - 1
+BLANK = 26  # Rack count slot for '?'
+_SEPARATOR_BIT = 1 << (ord(SEPARATOR) - 65)
+_LETTERS = tuple(chr(65 + code) for code in range(26))
+_VALUES = tuple(rules.LETTER_VALUES[letter] for letter in _LETTERS)
+
+# tiles: ((row, col, letter, is_blank), ...) sorted by position; word: the
+# main word, read along the row or column the tiles are in
+Play = namedtuple('Play', 'score word tiles')
+
+
+def play_command(play, board_blanks=()):
+    """The move command a client would send for play.
+
+    Like the client, every blank position on the board is listed after '|'.
+    """
+    command = ';'.join(f"{row},{col},{letter}" for row, col, letter, _ in play.tiles)
+    blanks = sorted(set(board_blanks) | {(row, col) for row, col, _, is_blank in play.tiles if is_blank})
+    if blanks:
+        command += '|' + ','.join(f"{row},{col}" for row, col in blanks)
+    return command
+
+
+def _transpose(grid):
+    return [list(line) for line in zip(*grid)]
+
+
+class MoveGenerator:
+    """Enumerates legal plays with a GADDAG from lexicon.load_gaddag()."""
+
+    def __init__(self, gaddag):
+        self.gaddag = gaddag
+
+    def square_cross_check(self, board, blanks, row, col, across):
+        """Cross-check for the empty square (row, col) in a play along a row (across) or column.
+
+        Returns (mask, cross_sum): bit i of mask is set when chr(65 + i) may go
+        on the square, and cross_sum is the value of the perpendicular tiles
+        it would join, or -1 when there are none and any letter may go there.
+        """
+        dr, dc = (1, 0) if across else (0, 1)
+        before, after, cross_sum = [], [], 0
+        # before is read outwards from the square, i.e. reversed, as the GADDAG wants
+        for step, letters in ((-1, before), (1, after)):
+            r, c = row + step * dr, col + step * dc
+            while 0 <= r < rules.BOARD_SIZE and 0 <= c < rules.BOARD_SIZE and board[r][c]:
+                letters.append(board[r][c])
+                if (r, c) not in blanks:
+                    cross_sum += rules.LETTER_VALUES[board[r][c]]
+                r, c = r + step * dr, c + step * dc
+        if not before and not after:
+            return ALL_LETTERS, -1
+
+        gaddag = self.gaddag
+        mask = 0
+        if before:
+            # rev(before) SEPARATOR letter after
+            end = gaddag.walk(''.join(before))
+            end = end and gaddag.child(end[0], SEPARATOR)
+            if end:
+                after = ''.join(after)
+                for letter, node, is_word in gaddag.children(end[0]):
+                    if after:
+                        tail = gaddag.walk(after, node)
+                        is_word = tail is not None and tail[1]
+                    if is_word:
+                        mask |= 1 << (ord(letter) - 65)
+        else:
+            # rev(letter after), with no separator since nothing follows
+            end = gaddag.walk(''.join(reversed(after)))
+            if end:
+                for letter, _, is_word in gaddag.children(end[0]):
+                    if is_word and letter != SEPARATOR:
+                        mask |= 1 << (ord(letter) - 65)
+        return mask, cross_sum
+
+    def cross_checks(self, board, blanks):
+        """Full cross-check tables for board: (across_masks, across_sums, down_masks, down_sums).
+
+        Each is a BOARD_SIZE x BOARD_SIZE grid indexed [row][col]; occupied
+        squares hold mask 0 and sum -1.
+        """
+        tables = []
+        for across in (True, False):
+            masks = [[0] * rules.BOARD_SIZE for _ in range(rules.BOARD_SIZE)]
+            sums = [[-1] * rules.BOARD_SIZE for _ in range(rules.BOARD_SIZE)]
+            for row in range(rules.BOARD_SIZE):
+                for col in range(rules.BOARD_SIZE):
+                    if not board[row][col]:
+                        masks[row][col], sums[row][col] = self.square_cross_check(board, blanks, row, col, across)
+            tables += [masks, sums]
+        return tuple(tables)
+
+    @staticmethod
+    def anchors(board):
+        """Grid of anchor flags: empty squares next to a tile, or the centre on an empty board."""
+        size = rules.BOARD_SIZE
+        grid = [[False] * size for _ in range(size)]
+        empty = True
+        for row in range(size):
+            for col in range(size):
+                if board[row][col]:
+                    empty = False
+                    for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+                        if 0 <= r < size and 0 <= c < size and not board[r][c]:
+                            grid[r][c] = True
+        if empty:
+            grid[rules.CENTER[0]][rules.CENTER[1]] = True
+        return grid
+
+    def generate(self, board, blanks, rack, cross_checks=None, anchors=None):
+        """Every legal play of tiles from rack on board, best score first.
+
+        board is the grid of letters ('' when empty) and blanks the set of
+        blank positions on it, as kept by GameRoom. cross_checks and anchors
+        may be passed in when the caller keeps them up to date, in the form
+        cross_checks() and anchors() return.
+        """
+        counts = [0] * 27
+        for tile in rack:
+            counts[BLANK if tile == '?' else ord(tile.upper()) - 65] += 1
+        if cross_checks is None:
+            cross_checks = self.cross_checks(board, blanks)
+        if anchors is None:
+            anchors = self.anchors(board)
+        across_masks, across_sums, down_masks, down_sums = cross_checks
+        blank_grid = [[(row, col) in blanks for col in range(rules.BOARD_SIZE)] for row in range(rules.BOARD_SIZE)]
+
+        plays = []
+        self._search(board, blank_grid, across_masks, across_sums, anchors,
+                     rules.LETTER_MULTIPLIERS, rules.WORD_MULTIPLIERS, counts, True, plays)
+        self._search(_transpose(board), _transpose(blank_grid), _transpose(down_masks), _transpose(down_sums),
+                     _transpose(anchors), _transpose(rules.LETTER_MULTIPLIERS),
+                     _transpose(rules.WORD_MULTIPLIERS), counts, False, plays)
+        plays.sort(key=lambda play: -play.score)
+        return plays
+
+    def _search(self, squares, tile_blanks, masks, sums, anchors, letter_mults, word_mults, rack, across, plays):
+        """Find the plays along the lines (rows) of squares and add them to plays.
+
+        For columns every grid is passed transposed and across is False.
+        """
+        graph = self.gaddag.graph
+        root = self.gaddag.root
+        size = len(squares)
+        placed = []  # (position in line, letter, is_blank) for the tiles put down so far
+        letters_held = sum(1 << code for code in range(26) if rack[code])  # Bits of letters left in the rack
+        # The line being searched and its anchor; set in the loop at the bottom
+        line = blank_line = mask_line = sum_line = anchor_line = letter_line = word_line = None
+        line_index = anchor = 0
+
+        def record(word, main, mult, cross):
+            if not across and len(placed) == 1 and sum_line[placed[0][0]] >= 0:
+                return  # A single tile with a row word too was found by the row search
+            score = main * mult + cross
+            if len(placed) == rules.RACK_SIZE:
+                score += rules.BINGO_BONUS
+            if across:
+                tiles = tuple(sorted((line_index, pos, letter, is_blank) for pos, letter, is_blank in placed))
+            else:
+                tiles = tuple(sorted((pos, line_index, letter, is_blank) for pos, letter, is_blank in placed))
+            plays.append(Play(score, word, tiles))
+
+        def advance(pos, edge, leftward, word, main, mult, cross):
+            """Continue after the square pos was covered, following edge."""
+            node = edge >> 1
+            if leftward:
+                left_free = pos == 0 or not line[pos - 1]
+                if edge & 1 and left_free and len(word) > 1 and (anchor + 1 == size or not line[anchor + 1]):
+                    record(word, main, mult, cross)
+                if node:
+                    mask = graph[node]
+                    if pos > 0 and (not left_free or mask & mask_line[pos - 1] and not anchor_line[pos - 1]):
+                        cover(pos - 1, node, True, word, main, mult, cross)
+                    if left_free and anchor + 1 < size and mask & _SEPARATOR_BIT:
+                        # The separator sorts last, so its edge is the node's last cell
+                        cover(anchor + 1, graph[node + mask.bit_count()] >> 1, False, word, main, mult, cross)
+            else:
+                if edge & 1 and len(word) > 1 and (pos + 1 == size or not line[pos + 1]):
+                    record(word, main, mult, cross)
+                if node and pos + 1 < size and (line[pos + 1] or graph[node] & mask_line[pos + 1]):
+                    cover(pos + 1, node, False, word, main, mult, cross)
+
+        def cover(pos, node, leftward, word, main, mult, cross):
+            """Extend the walk at node onto the square pos, placing a tile if it is empty."""
+            nonlocal letters_held
+            mask = graph[node]
+            letter = line[pos]
+            if letter:
+                code = ord(letter) - 65
+                bit = 1 << code
+                if mask & bit:
+                    value = 0 if blank_line[pos] else _VALUES[code]
+                    word = letter + word if leftward else word + letter
+                    edge = graph[node + 1 + (mask & (bit - 1)).bit_count()]
+                    advance(pos, edge, leftward, word, main + value, mult, cross)
+                return
+            if leftward and pos != anchor and anchor_line[pos]:
+                return  # Plays covering that anchor are found from it
+            possible = mask & mask_line[pos] & (ALL_LETTERS if rack[BLANK] else letters_held)
+            if not possible:
+                return
+            letter_mult = letter_line[pos]
+            word_mult = word_line[pos]
+            cross_sum = sum_line[pos]
+            while possible:
+                bit = possible & -possible
+                possible ^= bit
+                code = bit.bit_length() - 1
+                edge = graph[node + 1 + (mask & (bit - 1)).bit_count()]
+                letter = _LETTERS[code]
+                extended = letter + word if leftward else word + letter
+                if rack[code]:
+                    value = _VALUES[code] * letter_mult
+                    rack[code] -= 1
+                    if not rack[code]:
+                        letters_held ^= bit
+                    placed.append((pos, letter, False))
+                    advance(pos, edge, leftward, extended, main + value, mult * word_mult,
+                            cross + (cross_sum + value) * word_mult if cross_sum >= 0 else cross)
+                    placed.pop()
+                    if not rack[code]:
+                        letters_held ^= bit
+                    rack[code] += 1
+                if rack[BLANK]:
+                    rack[BLANK] -= 1
+                    placed.append((pos, letter, True))
+                    advance(pos, edge, leftward, extended, main, mult * word_mult,
+                            cross + cross_sum * word_mult if cross_sum >= 0 else cross)
+                    placed.pop()
+                    rack[BLANK] += 1
+
+        if not root or not any(rack):
+            return
+        for line_index in range(size):
+            line = squares[line_index]
+            anchor_line = anchors[line_index]
+            if not any(anchor_line):
+                continue
+            blank_line = tile_blanks[line_index]
+            mask_line = masks[line_index]
+            sum_line = sums[line_index]
+            letter_line = letter_mults[line_index]
+            word_line = word_mults[line_index]
+            for anchor in range(size):
+                if anchor_line[anchor]:
+                    cover(anchor, root, True, '', 0, 1, 0)
+
+
+class CrossCheckCache:
+    """Cross-check tables and anchors for one board, kept current move by move.
+
+    A play only changes the cross-checks of the squares at the ends of the
+    row and column runs through its tiles, so update() recomputes those
+    rather than the whole board. tables and anchors are in the form
+    MoveGenerator.generate() accepts.
+    """
+
+    def __init__(self, generator, board, blanks):
+        self.generator = generator
+        self.rebuild(board, blanks)
+
+    def rebuild(self, board, blanks):
+        """Recompute everything for board (e.g. after a reset replaced it)."""
+        self.board = board
+        self.blanks = blanks
+        self.tables = self.generator.cross_checks(board, blanks)
+        self.anchors = self.generator.anchors(board)
+
+    def update(self, positions):
+        """Account for tiles just placed on the board at positions."""
+        board = self.board
+        size = rules.BOARD_SIZE
+        across_masks, across_sums, down_masks, down_sums = self.tables
+        stale = set()  # (row, col, across) cross-checks to recompute
+        for row, col in positions:
+            across_masks[row][col] = down_masks[row][col] = 0
+            across_sums[row][col] = down_sums[row][col] = -1
+            self.anchors[row][col] = False
+            for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                r, c = row + dr, col + dc
+                if 0 <= r < size and 0 <= c < size and not board[r][c]:
+                    self.anchors[r][c] = True
+                # The first empty square past the run in this direction
+                while 0 <= r < size and 0 <= c < size and board[r][c]:
+                    r, c = r + dr, c + dc
+                if 0 <= r < size and 0 <= c < size:
+                    stale.add((r, c, dc == 0))
+        for row, col, across in stale:
+            masks, sums = (across_masks, across_sums) if across else (down_masks, down_sums)
+            masks[row][col], sums[row][col] = self.generator.square_cross_check(board, self.blanks, row, col, across)
+
+    def clone(self, board, blanks):
+        """A copy of this cache for board and blanks, copies of the cached ones."""
+        cache = copy.copy(self)
+        cache.board = board
+        cache.blanks = blanks
+        cache.tables = tuple([line[:] for line in table] for table in self.tables)
+        cache.anchors = [line[:] for line in self.anchors]
+        return cache
+
+    def verify(self):
+        """Whether the cache matches a full recompute of the board."""
+        return (self.tables == self.generator.cross_checks(self.board, self.blanks)
+                and self.anchors == self.generator.anchors(self.board))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List the best opening plays for a rack")
+    parser.add_argument("rack", help="rack letters, ? for a blank")
+    parser.add_argument("source", nargs="?", default=os.path.join('assets', 'dictionary', 'words_with_definitions.txt'))
+    parser.add_argument("--top", type=int, default=10, help="plays to show")
+    args = parser.parse_args()
+    generator = MoveGenerator(load_gaddag(args.source))
+    board = [['' for _ in range(rules.BOARD_SIZE)] for _ in range(rules.BOARD_SIZE)]
+    plays = generator.generate(board, set(), args.rack)
+    print(f"[MOVEGEN] {len(plays)} plays")
+    for play in plays[:args.top]:
+        print(f"[MOVEGEN] {play.score:4} {play.word:15} {play_command(play)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+"""Wire helpers shared by the Scrabble server and client.
+
+Server messages are JSON lines by default. A client may ask for the compact
+binary protocol by appending ``;PROTO=binary`` to its ``USERNAME:`` line. If
+the server agrees it replies ``OK:Username accepted;PROTO=binary`` and every
+later server message is a frame::
+
+    tag (1 byte) | payload length (uint32, big endian) | payload
+
+    FRAME_TEXT   a text reply such as ``Error: ...``, UTF-8 without newline
+    FRAME_TIMER  timer_update: player count (B), then per player the name
+                 length (B), the name and time_remaining, overtime_used (ff)
+    FRAME_DELTA  board_delta: version (I), tile count (B), then per tile
+                 row, col, letter, is_blank (BBc?); deltas spanning several
+                 versions (with a ``since`` field) go as FRAME_TLV
+    FRAME_TLV    any other message as a tag-length-value encoded JSON value
+
+Client commands are newline-terminated text in both modes.
+"""
+import json
+import struct
+import threading
+import time
+
+JSON = 'json'
+BINARY = 'binary'
+CODECS = (JSON, BINARY)
+
+FRAME_TEXT = 1
+FRAME_TIMER = 2
+FRAME_DELTA = 3
+FRAME_TLV = 4
+
+_FRAME_HEADER = struct.Struct('!BI')
+_TIMER_COUNT = struct.Struct('!B')
+_TIMER_ENTRY = struct.Struct('!ff')
+_DELTA_HEADER = struct.Struct('!IB')
+_DELTA_TILE = struct.Struct('!BBc?')
+_DOUBLE = struct.Struct('!d')
+
+# TLV value tags
+_T_NONE, _T_FALSE, _T_TRUE, _T_INT, _T_FLOAT, _T_STR, _T_LIST, _T_DICT = b'NFTifsld'
+
+
+class LineTooLongError(ValueError):
+    """Raised when a peer sends a line longer than the reader allows."""
+
+
+class LineReader:
+    """Buffered newline-delimited reader over a socket-like object.
+
+    Reads in large chunks instead of one byte at a time and keeps whatever
+    follows the returned line, so the handshake and the main loop can share
+    one reader without losing bytes the peer sent back-to-back. Binary
+    protocol frames are read with read_frame().
+    """
+    CHUNK_SIZE = 4096
+    MAX_LINE_LENGTH = 64 * 1024
+
+    def __init__(self, sock, max_line_length=None, chunk_size=None):
+        self.sock = sock
+        self.max_line_length = self.MAX_LINE_LENGTH if max_line_length is None else max_line_length
+        self.chunk_size = self.CHUNK_SIZE if chunk_size is None else chunk_size
+        self.buffer = bytearray()
+        self.eof = False
+
+    def _fill(self):
+        """Receive one chunk into the buffer. Returns False on EOF."""
+        chunk = self.sock.recv(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer += chunk
+        return True
+
+    def read_line(self):
+        """Return the next line without its terminator.
+
+        Returns None once the peer has closed the connection and no complete
+        line is left. Socket timeouts propagate with the buffer intact, so the
+        call can simply be retried.
+        """
+        start = 0
+        while True:
+            index = self.buffer.find(b'\n', start)
+            if index >= 0:
+                line = bytes(self.buffer[:index])
+                del self.buffer[:index + 1]
+                return line.decode().rstrip('\r')
+            if len(self.buffer) > self.max_line_length:
+                raise LineTooLongError(f"Line exceeds {self.max_line_length} bytes")
+            if self.eof:
+                return None
+            start = len(self.buffer)
+            if not self._fill():
+                return None
+
+    def read_frame(self):
+        """Return the next binary frame decoded with decode_frame().
+
+        Returns None on EOF. Like read_line(), a timeout leaves the buffer
+        untouched, so a frame is never consumed halfway.
+        """
+        while len(self.buffer) < _FRAME_HEADER.size:
+            if self.eof or not self._fill():
+                return None
+        tag, length = _FRAME_HEADER.unpack_from(self.buffer)
+        if length > self.max_line_length:
+            raise LineTooLongError(f"Frame exceeds {self.max_line_length} bytes")
+        end = _FRAME_HEADER.size + length
+        while len(self.buffer) < end:
+            if self.eof or not self._fill():
+                return None
+        payload = bytes(self.buffer[_FRAME_HEADER.size:end])
+        del self.buffer[:end]
+        return decode_frame(tag, payload)
+
+
+class WireStats:
+    """Thread-safe per-codec counters for encoded messages, bytes and CPU."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {codec: [0, 0, 0.0] for codec in CODECS}
+
+    def record(self, codec, size, seconds):
+        with self.lock:
+            counter = self.counters[codec]
+            counter[0] += 1
+            counter[1] += size
+            counter[2] += seconds
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                codec: {
+                    "messages": messages,
+                    "bytes": size,
+                    "encode_ms": round(seconds * 1000, 3)
+                }
+                for codec, (messages, size, seconds) in self.counters.items()
+            }
+
+
+WIRE_STATS = WireStats()
+
+
+class Message:
+    """A structured server message, encoded at most once per codec.
+
+    Broadcasts hand the same Message to every connection and each one asks
+    for its own codec, so a broadcast costs one encode per codec in use
+    rather than one per client.
+    """
+    __slots__ = ('data', '_encoded')
+
+    def __init__(self, data):
+        self.data = data
+        self._encoded = {}
+
+    def encode(self, codec):
+        encoded = self._encoded.get(codec)
+        if encoded is None:
+            start = time.perf_counter()
+            if codec == BINARY:
+                encoded = encode_binary(self.data)
+            else:
+                encoded = json.dumps(self.data).encode() + b'\n'
+            WIRE_STATS.record(codec, len(encoded), time.perf_counter() - start)
+            self._encoded[codec] = encoded
+        return encoded
+
+
+def encode_for(data, codec):
+    """Return the bytes to send for data, a Message or an encoded text line."""
+    if isinstance(data, Message):
+        return data.encode(codec)
+    if codec == BINARY:
+        line = data.rstrip(b'\n')
+        return _FRAME_HEADER.pack(FRAME_TEXT, len(line)) + line
+    return data
+
+
+def encode_binary(data):
+    """Encode a message dict as one binary frame."""
+    kind = data.get('type')
+    payload = None
+    try:
+        if kind == 'timer_update':
+            tag, payload = FRAME_TIMER, _encode_timer(data)
+        elif kind == 'board_delta' and 'since' not in data:
+            tag, payload = FRAME_DELTA, _encode_delta(data)
+    except (struct.error, UnicodeEncodeError):
+        payload = None  # Doesn't fit the fixed layout (e.g. a 300 byte name)
+    if payload is None:
+        out = bytearray()
+        _encode_value(data, out)
+        tag, payload = FRAME_TLV, out
+    return _FRAME_HEADER.pack(tag, len(payload)) + payload
+
+
+def decode_frame(tag, payload):
+    """Decode a frame payload to a message dict, or a str for FRAME_TEXT."""
+    if tag == FRAME_TEXT:
+        return payload.decode()
+    if tag == FRAME_TIMER:
+        return _decode_timer(payload)
+    if tag == FRAME_DELTA:
+        return _decode_delta(payload)
+    if tag == FRAME_TLV:
+        return _decode_value(payload, 0)[0]
+    raise ValueError(f"Unknown frame tag {tag}")
+
+
+def _encode_timer(data):
+    timers = data['timers']
+    out = bytearray(_TIMER_COUNT.pack(len(timers)))
+    for username, timer in timers.items():
+        name = username.encode()
+        out += _TIMER_COUNT.pack(len(name))
+        out += name
+        out += _TIMER_ENTRY.pack(timer['time_remaining'], timer['overtime_used'])
+    return out
+
+
+def _decode_timer(payload):
+    count, = _TIMER_COUNT.unpack_from(payload)
+    pos = _TIMER_COUNT.size
+    timers = {}
+    for _ in range(count):
+        size = payload[pos]
+        name = payload[pos + 1:pos + 1 + size].decode()
+        pos += 1 + size
+        time_remaining, overtime_used = _TIMER_ENTRY.unpack_from(payload, pos)
+        pos += _TIMER_ENTRY.size
+        timers[name] = {"time_remaining": time_remaining, "overtime_used": overtime_used}
+    return {"type": "timer_update", "timers": timers}
+
+
+def _encode_delta(data):
+    tiles = data['tiles']
+    out = bytearray(_DELTA_HEADER.pack(data['version'], len(tiles)))
+    for row, col, letter, is_blank in tiles:
+        out += _DELTA_TILE.pack(row, col, letter.encode('ascii'), is_blank)
+    return out
+
+
+def _decode_delta(payload):
+    version, count = _DELTA_HEADER.unpack_from(payload)
+    tiles = []
+    for i in range(count):
+        row, col, letter, is_blank = _DELTA_TILE.unpack_from(
+            payload, _DELTA_HEADER.size + i * _DELTA_TILE.size)
+        tiles.append([row, col, letter.decode('ascii'), is_blank])
+    return {"type": "board_delta", "version": version, "tiles": tiles}
+
+
+def _encode_varint(value, out):
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _decode_varint(data, pos):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _encode_value(value, out):
+    """Append one JSON-style value to out as tag, varint length, body."""
+    if value is None:
+        tag, body = _T_NONE, b''
+    elif value is True:
+        tag, body = _T_TRUE, b''
+    elif value is False:
+        tag, body = _T_FALSE, b''
+    elif isinstance(value, int):
+        tag, body = _T_INT, value.to_bytes(value.bit_length() // 8 + 1, 'big', signed=True)
+    elif isinstance(value, float):
+        tag, body = _T_FLOAT, _DOUBLE.pack(value)
+    elif isinstance(value, str):
+        tag, body = _T_STR, value.encode()
+    elif isinstance(value, (list, tuple)):
+        tag, body = _T_LIST, bytearray()
+        for item in value:
+            _encode_value(item, body)
+    elif isinstance(value, dict):
+        tag, body = _T_DICT, bytearray()
+        for key, item in value.items():
+            _encode_value(str(key), body)
+            _encode_value(item, body)
+    else:
+        raise TypeError(f"Cannot encode {type(value).__name__}")
+    out.append(tag)
+    _encode_varint(len(body), out)
+    out += body
+
+
+def _decode_value(data, pos):
+    """Decode the TLV value at pos; returns (value, position after it)."""
+    tag = data[pos]
+    length, pos = _decode_varint(data, pos + 1)
+    end = pos + length
+    if tag == _T_NONE:
+        value = None
+    elif tag == _T_TRUE:
+        value = True
+    elif tag == _T_FALSE:
+        value = False
+    elif tag == _T_INT:
+        value = int.from_bytes(data[pos:end], 'big', signed=True)
+    elif tag == _T_FLOAT:
+        value, = _DOUBLE.unpack_from(data, pos)
+    elif tag == _T_STR:
+        value = bytes(data[pos:end]).decode()
+    elif tag == _T_LIST:
+        value = []
+        while pos < end:
+            item, pos = _decode_value(data, pos)
+            value.append(item)
+    elif tag == _T_DICT:
+        value = {}
+        while pos < end:
+            key, pos = _decode_value(data, pos)
+            value[key], pos = _decode_value(data, pos)
+    else:
+        raise ValueError(f"Unknown TLV tag {tag}")
+    return value, end
+
+
+def _sample_game(players=2, moves=40, ticks=1500):
+    """Yield the messages a typical game broadcasts, for measure_game()."""
+    names = [f"player{i}" for i in range(1, players + 1)]
+    board = [['' for _ in range(15)] for _ in range(15)]
+    yield {'type': 'board_update', 'version': 0, 'board': board, 'blanks': []}
+    for tick in range(ticks):
+        yield {"type": "timer_update", "timers": {
+            name: {"time_remaining": 1500.0 - tick / players, "overtime_used": 0}
+            for name in names
+        }}
+    for move in range(moves):
+        tiles = [[move % 15, col, 'QUIZ'[col % 4], col == 3] for col in range(4)]
+        yield {'type': 'board_delta', 'version': move + 1, 'tiles': tiles}
+        yield {"type": "players", "game_started": True, "players": [
+            {"username": name, "points": move * 12, "current_turn": i == move % players,
+             "ready": True, "timed_out": False}
+            for i, name in enumerate(names)
+        ]}
+        yield {"type": "move_log_append", "seq": move, "moves": [{
+            "username": names[move % players], "total_points": 24,
+            "words": [{"word": "QUIZ", "definition": "to question closely", "score": 24,
+                       "positions": [(row, col, letter, None) for row, col, letter, _ in tiles]}]
+        }]}
+        yield {"type": "tiles_remaining", "count": max(0, 86 - 4 * move)}
+        yield {'type': 'rack_update', 'rack': list('AEIRST?'), 'tiles_remaining': 50,
+               'username': names[move % players]}
+
+
+def measure_game(**kwargs):
+    """Encode one sample game with every codec; returns {codec: (bytes, seconds)}."""
+    messages = list(_sample_game(**kwargs))
+    results = {}
+    for codec in CODECS:
+        start = time.perf_counter()
+        size = sum(len(Message(data).encode(codec)) for data in messages)
+        results[codec] = (size, time.perf_counter() - start)
+    return results
+
+
+if __name__ == '__main__':
+    results = measure_game()
+    json_size, json_time = results[JSON]
+    for codec, (size, seconds) in results.items():
+        print(f"[WIRE] {codec:6}: {size:8} bytes per game ({size / json_size:6.1%} of JSON), "
+              f"{seconds * 1000:7.2f} ms encode CPU ({seconds / json_time:6.1%} of JSON)")
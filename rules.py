@@ -0,0 +1,51 @@
+"""Board layout and letter values shared by the Scrabble server and client.
+
+The premium squares are expanded once, at import, into 15x15 lookup tables,
+so scoring indexes ``LETTER_MULTIPLIERS[row][col]`` instead of searching the
+position lists for every tile.
+"""
+
+BOARD_SIZE = 15
+CENTER = (7, 7)
+RACK_SIZE = 7
+BINGO_BONUS = 50  # For playing a whole rack in one move
+
+SPECIAL_SQUARES = {
+    'DL': [(0,3), (0,11), (2,6), (2,8), (3,0), (3,7), (3,14),
+           (6,2), (6,6), (6,8), (6,12), (7,3), (7,11),
+           (8,2), (8,6), (8,8), (8,12), (11,0), (11,7), (11,14),
+           (12,6), (12,8), (14,3), (14,11)],
+    'TL': [(1,5), (1,9), (5,1), (5,5), (5,9), (5,13),
+           (9,1), (9,5), (9,9), (9,13), (13,5), (13,9)],
+    'DW': [(1,1), (2,2), (3,3), (4,4), (13,13), (12,12), (11,11), (10,10),
+           (1,13), (2,12), (3,11), (4,10), (13,1), (12,2), (11,3), (10,4),
+           (7,7)],
+    'TW': [(0,0), (0,7), (0,14), (7,0), (7,14), (14,0), (14,7), (14,14)]
+}
+
+# Standard Scrabble letter values
+LETTER_VALUES = {
+    'A': 1, 'B': 3, 'C': 3, 'D': 2, 'E': 1, 'F': 4, 'G': 2, 'H': 4,
+    'I': 1, 'J': 8, 'K': 5, 'L': 1, 'M': 3, 'N': 1, 'O': 1, 'P': 3,
+    'Q': 10, 'R': 1, 'S': 1, 'T': 1, 'U': 1, 'V': 4, 'W': 4, 'X': 8,
+    'Y': 4, 'Z': 10, '?': 0
+}
+
+
+def _build_tables():
+    """Expand SPECIAL_SQUARES into square-type and multiplier tables."""
+    square_types = [[None] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+    for square_type, positions in SPECIAL_SQUARES.items():
+        for row, col in positions:
+            square_types[row][col] = square_type
+    letter = {'DL': 2, 'TL': 3}
+    word = {'DW': 2, 'TW': 3}
+    return (
+        tuple(tuple(row) for row in square_types),
+        tuple(tuple(letter.get(t, 1) for t in row) for row in square_types),
+        tuple(tuple(word.get(t, 1) for t in row) for row in square_types),
+    )
+
+
+# SQUARE_TYPES[row][col] is 'DL', 'TL', 'DW', 'TW' or None
+SQUARE_TYPES, LETTER_MULTIPLIERS, WORD_MULTIPLIERS = _build_tables()
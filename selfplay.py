@@ -0,0 +1,214 @@
+"""Headless bot-vs-bot games for measuring the rules engine.
+
+Games run in-process on GameRoom with no sockets, timers or prompts: every
+seat is a bot from bots.py whose commands go through handle_command, and so
+through the same bag, move, exchange, pass and end-of-game code as a
+client's. Each game is seeded, the bag by the room's rng and the bots by
+their own, so a seed always replays the same game; the results digest
+changes when any game does. The timed strength depends on the clock and is
+not reproducible.
+
+Games can be spread over a process pool with --workers. Workers map the
+dictionary index and GADDAG files read-only instead of loading their own
+copies, and send back one small record per game.
+
+Usage: python selfplay.py [--games N] [--seed N] [--players N] [--workers N]
+                          [--strength greedy|equity|timed] [--dictionary PATH]
+"""
+import argparse
+import contextlib
+import hashlib
+import os
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+import bots
+import lexicon
+import logs
+import movegen
+import protocol
+from dictionary_index import load_index
+from protocol import Message
+from server import GameRoom, ScrabbleServer
+
+MAX_TURNS = 500  # Stops a game that no longer makes progress
+TIMED_PHASES = ('validation', 'scoring', 'logging')
+
+
+class TimedRoom(GameRoom):
+    """GameRoom that records how long validation, scoring and move logging take."""
+
+    def __init__(self, *args, **kwargs):
+        self.timings = {phase: [] for phase in TIMED_PHASES}
+        super().__init__(*args, **kwargs)
+
+    def _validate_play(self, moves):
+        start = time.perf_counter()
+        try:
+            return super()._validate_play(moves)
+        finally:
+            self.timings['validation'].append(time.perf_counter() - start)
+
+    def _calculate_words_score(self, moves, blank_positions=None):
+        start = time.perf_counter()
+        try:
+            return super()._calculate_words_score(moves, blank_positions)
+        finally:
+            self.timings['scoring'].append(time.perf_counter() - start)
+
+    def _log_move(self, username, words, points, positions):
+        start = time.perf_counter()
+        try:
+            return super()._log_move(username, words, points, positions)
+        finally:
+            self.timings['logging'].append(time.perf_counter() - start)
+
+
+class Seat:
+    """Connection stand-in for a self-play player; messages are dropped."""
+
+    codec = protocol.JSON
+
+    def __init__(self, fileno):
+        self._fileno = fileno
+        self.last_error = None  # Error text the room sent for the last command
+
+    def fileno(self):
+        return self._fileno
+
+    def sendall(self, data, kind=None):
+        if not isinstance(data, Message):
+            self.last_error = data.decode().strip()
+
+    def close(self):
+        pass
+
+
+def play_game(index, generator, seed, players=2, strength=bots.GREEDY, think_time=0.1):
+    """Play one game; returns (final scores, moves played, room timings).
+
+    Moves are plays and exchanges. The room logs nothing below errors meanwhile.
+    """
+    rng = random.Random(seed)
+    with logs.quiet('server'):
+        room = TimedRoom(f'selfplay-{seed}', index, float('inf'), 0, 0, generator,
+                         rng=random.Random(rng.getrandbits(64)))
+        seats = {}
+        for number in range(players):
+            username = f"bot-{number + 1}"
+            seats[username] = (Seat(number + 1), bots.Bot(generator, strength, think_time,
+                                                          random.Random(rng.getrandbits(64))))
+            room.add_player(seats[username][0], username)
+        for username, (seat, _) in seats.items():
+            room.handle_command(seat, username, "READY")
+
+        moves = 0
+        for _ in range(MAX_TURNS):
+            if room.game_ended or room.current_turn is None:
+                break
+            username = room.current_turn
+            seat, bot = seats[username]
+            rack = room.player_racks[username]
+            unseen = bots.unseen_tiles(room.TILE_DISTRIBUTION, room.board, room.board_blanks, rack)
+            command = bot.choose(room.board, room.board_blanks, rack, room._get_tiles_remaining(),
+                                 unseen, room.cross_checks)
+            seat.last_error = None
+            room.handle_command(seat, username, command)
+            if seat.last_error:
+                raise RuntimeError(f"Seed {seed}: room rejected {command}: {seat.last_error}")
+            if command != "PASS":
+                moves += 1
+        else:
+            room._end_game()
+        scores = dict(room.player_points)
+        room.close()
+    return scores, moves, room.timings
+
+
+# Set in each worker process by _init_worker()
+_worker = None
+
+
+def _init_worker(index, gaddag, options):
+    """Keep what every game in this process shares.
+
+    index and gaddag arrive pickled as the paths of their files and are
+    mapped again here, so all workers read one page-cache copy.
+    """
+    global _worker
+    _worker = (index, movegen.MoveGenerator(gaddag), options)
+
+
+def _play_seed(seed):
+    """Play the game for seed; returns (seed, scores, moves, {phase: array of seconds})."""
+    index, generator, (players, strength, think_time) = _worker
+    scores, moves, timings = play_game(index, generator, seed, players, strength, think_time)
+    timings = {phase: array('d', seconds) for phase, seconds in timings.items()}
+    return seed, tuple(sorted(scores.items())), moves, timings
+
+
+def run(source_path, games, seed=1, players=2, strength=bots.GREEDY, think_time=0.1, workers=1):
+    """Play games seeded seed, seed + 1, ...; returns the totals and timings.
+
+    With more than one worker the seeds are shared out over a process pool;
+    records come back in seed order, so the digest does not depend on it.
+    """
+    index = load_index(source_path)
+    gaddag = lexicon.load_gaddag(source_path, index)
+    options = (players, strength, think_time)
+    seeds = range(seed, seed + games)
+    timings = {phase: [] for phase in TIMED_PHASES}
+    digest = hashlib.sha256()
+    moves = 0
+    start = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        if workers > 1:
+            pool = stack.enter_context(ProcessPoolExecutor(workers, initializer=_init_worker,
+                                                           initargs=(index, gaddag, options)))
+            # Small chunks keep the workers evenly loaded as game lengths vary
+            records = pool.map(_play_seed, seeds, chunksize=max(1, games // (workers * 8)))
+        else:
+            _init_worker(index, gaddag, options)
+            records = map(_play_seed, seeds)
+        for game_seed, scores, game_moves, game_timings in records:
+            moves += game_moves
+            for phase, seconds in game_timings.items():
+                timings[phase].extend(seconds)
+            digest.update(repr((game_seed, list(scores), game_moves)).encode())
+    elapsed = time.perf_counter() - start
+    return {'games': games, 'moves': moves, 'seconds': elapsed, 'digest': digest.hexdigest()[:16]}, timings
+
+
+def _percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless bot-vs-bot games for throughput benchmarking")
+    parser.add_argument("--games", type=int, default=100, help="games to play")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the first game, then +1 per game")
+    parser.add_argument("--players", type=int, default=2, help="bots per game")
+    parser.add_argument("--strength", choices=bots.STRENGTHS, default=bots.GREEDY)
+    parser.add_argument("--think-time", type=float, default=0.1, help="seconds per turn for timed bots")
+    parser.add_argument("--workers", type=int, default=1, help="processes to play on, 0 for one per core")
+    parser.add_argument("--dictionary", default=ScrabbleServer.DICTIONARY_PATH, help="word/definition TSV")
+    args = parser.parse_args()
+
+    workers = args.workers or os.cpu_count() or 1
+    totals, timings = run(args.dictionary, args.games, args.seed, args.players, args.strength, args.think_time,
+                          workers)
+    seconds = totals['seconds']
+    print(f"[SELFPLAY] {totals['games']} games on {workers} worker(s), {totals['moves']} moves in {seconds:.2f} s: "
+          f"{totals['games'] / seconds:.2f} games/s, {totals['moves'] / seconds:.1f} moves/s")
+    for phase in TIMED_PHASES:
+        values = sorted(timings[phase])
+        if values:
+            print(f"[SELFPLAY] {phase:10} {len(values):7} calls, p50 {_percentile(values, 0.5) * 1e6:8.1f} us, "
+                  f"p99 {_percentile(values, 0.99) * 1e6:8.1f} us")
+    print(f"[SELFPLAY] results digest {totals['digest']}")
+
+
+if __name__ == "__main__":
+    main()
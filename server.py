@@ -1,25 +1,410 @@
+import asyncio
 import socket
 import threading
-import json
 import time
 import sys
 import random
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, deque
 import os
-import msvcrt
-import traceback
+try:
+    import msvcrt  # ESC stops the server; Windows consoles only
+except ImportError:
+    msvcrt = None
+import argparse
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+import bots
+import journal
+import lockprof
+import logs
+import metrics
+import protocol
+import rules
+from dictionary_index import load_index
+from lexicon import load_gaddag
+from movegen import CrossCheckCache, MoveGenerator
+from protocol import LineReader, LineTooLongError, Message
 
+log = logs.get_logger('server')
 
-class ScrabbleServer:
-    """A multi-client Scrabble game server."""
+
+def _message_type(data, kind):
+    """Message type to count sent bytes under; text replies count as 'text'."""
+    if kind:
+        return kind
+    return data.data.get('type', 'other') if isinstance(data, Message) else 'text'
+
+
+class OutboundQueue:
+    """Bounded queue of encoded messages waiting to be written to one client.
+
+    When the queue is full the overflow policy decides what happens:
+    ``drop_stale`` discards queued messages that a newer one supersedes
+    (timer updates) and only disconnects if nothing can be dropped;
+    ``disconnect`` drops the client straight away.
+    """
+
+    POLICY_DROP_STALE = 'drop_stale'
+    POLICY_DISCONNECT = 'disconnect'
+    POLICIES = (POLICY_DROP_STALE, POLICY_DISCONNECT)
+
+    # Message types that only carry the latest state, so older copies are worthless
+    STALE_KINDS = frozenset({'timer_update'})
+
+    def __init__(self, max_depth, policy=POLICY_DROP_STALE):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.max_depth = max_depth
+        self.policy = policy
+        self.items = deque()  # [(kind, data)]
+        self.cond = threading.Condition()
+        self.closed = False
+        
+        # Metrics
+        self.peak_depth = 0
+        self.enqueued = 0
+        self.dropped = 0
+        self.bytes_sent = 0
+
+    def put(self, data, kind=None):
+        """Queue data for sending. Returns False if the client must be disconnected."""
+        with self.cond:
+            if self.closed:
+                return False
+            if self.policy == self.POLICY_DROP_STALE and kind in self.STALE_KINDS:
+                self._drop(lambda k: k == kind)
+            if len(self.items) >= self.max_depth:
+                if self.policy == self.POLICY_DISCONNECT:
+                    return False
+                if kind in self.STALE_KINDS:
+                    self.dropped += 1
+                    return True
+                if not self._drop(lambda k: k in self.STALE_KINDS, limit=1):
+                    return False
+            self.items.append((kind, data))
+            self.enqueued += 1
+            self.peak_depth = max(self.peak_depth, len(self.items))
+            self.cond.notify()
+            return True
+
+    def _drop(self, match, limit=None):
+        """Remove queued messages whose kind matches (caller holds cond). Returns the count."""
+        kept = deque()
+        dropped = 0
+        for kind, data in self.items:
+            if match(kind) and (limit is None or dropped < limit):
+                dropped += 1
+            else:
+                kept.append((kind, data))
+        self.items = kept
+        self.dropped += dropped
+        return dropped
+
+    def get(self, block=True):
+        """Pop everything queued as one bytes batch.
+
+        Returns None once the queue is closed and drained, or when nothing is
+        queued and block is False.
+        """
+        with self.cond:
+            while block and not self.items and not self.closed:
+                self.cond.wait()
+            if not self.items:
+                return None
+            batch = b''.join(data for _, data in self.items)
+            self.items.clear()
+            self.bytes_sent += len(batch)
+            return batch
+
+    def close(self):
+        """Stop accepting messages; already queued ones are still flushed."""
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+    def metrics(self):
+        with self.cond:
+            return {
+                "depth": len(self.items),
+                "peak_depth": self.peak_depth,
+                "capacity": self.max_depth,
+                "enqueued": self.enqueued,
+                "dropped": self.dropped,
+                "bytes_sent": self.bytes_sent,
+                "policy": self.policy
+            }
+
+
+class ClientConnection:
+    """Client socket for the threaded server with its own writer thread.
+
+    sendall() only queues the message; the writer thread drains the queue,
+    so a client on a congested link never stalls a broadcast, the lock it is
+    sent under or the timer thread.
+    """
+
+    FLUSH_TIMEOUT = 2.0  # seconds to flush queued messages after close()
+
+    def __init__(self, sock, max_queue, policy):
+        self.sock = sock
+        self.queue = OutboundQueue(max_queue, policy)
+        self.codec = protocol.JSON  # Switched by the handshake
+        self._fileno = sock.fileno()
+        self.closed = False
+        self.writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self.writer_thread.start()
+
+    def fileno(self):
+        return -1 if self.closed else self._fileno
+
+    def settimeout(self, timeout):
+        self.sock.settimeout(timeout)
+
+    def recv(self, bufsize):
+        if self.closed:
+            raise ConnectionResetError("Connection closed")
+        return self.sock.recv(bufsize)
+
+    def sendall(self, data, kind=None):
+        if self.closed:
+            raise ConnectionResetError("Connection closed")
+        encoded = protocol.encode_for(data, self.codec)
+        metrics.SENT_BYTES.inc(len(encoded), _message_type(data, kind))
+        if not self.queue.put(encoded, kind):
+            raise ConnectionResetError("Send queue overflow")
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.close()
+
+    def _writer_loop(self):
+        """Drain the outbound queue until the connection is closed."""
+        deadline = None
+        try:
+            while True:
+                batch = self.queue.get()
+                if batch is None:
+                    break
+                view = memoryview(batch)
+                while view:
+                    if self.closed:
+                        deadline = deadline or time.monotonic() + self.FLUSH_TIMEOUT
+                        if time.monotonic() > deadline:
+                            return
+                    try:
+                        sent = self.sock.send(view)
+                    except socket.timeout:
+                        continue  # Nothing could be sent yet; the socket timeout just lets us re-check
+                    view = view[sent:]
+        except OSError:
+            pass
+        finally:
+            self.closed = True
+            self.queue.close()
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+
+
+class AsyncClientConnection:
+    """Socket-like wrapper around an asyncio stream pair.
+
+    The game logic only ever calls ``sendall``, ``fileno`` and ``close`` on a
+    client connection (sendall takes an encoded text line or a Message), so
+    this adapter lets the same synchronous handlers serve both the threaded
+    and the asyncio server. sendall() only queues the message; a writer task
+    drains the queue, and calls from other threads (e.g. the timer thread)
+    are handed over to the event loop.
+    """
+
+    FLUSH_TIMEOUT = 2.0  # seconds to flush queued messages after close()
+
+    def __init__(self, reader, writer, max_queue, policy):
+        self.reader = reader
+        self.writer = writer
+        self.queue = OutboundQueue(max_queue, policy)
+        self.codec = protocol.JSON  # Switched by the handshake
+        self.loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        sock = writer.get_extra_info('socket')
+        self._fileno = sock.fileno() if sock is not None else -1
+        self.closed = False
+        self._wakeup = asyncio.Event()
+        self.writer_task = self.loop.create_task(self._writer_loop())
+
+    def _call(self, func, *args):
+        """Run func on the event loop thread."""
+        if threading.get_ident() == self._loop_thread:
+            func(*args)
+        else:
+            self.loop.call_soon_threadsafe(func, *args)
+
+    def fileno(self):
+        return -1 if self.closed else self._fileno
+
+    def sendall(self, data, kind=None):
+        if self.closed or self.writer.is_closing():
+            raise ConnectionResetError("Connection closed")
+        encoded = protocol.encode_for(data, self.codec)
+        metrics.SENT_BYTES.inc(len(encoded), _message_type(data, kind))
+        if not self.queue.put(encoded, kind):
+            raise ConnectionResetError("Send queue overflow")
+        self._call(self._wakeup.set)
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.close()
+        self._call(self._close_soon)
+
+    def _close_soon(self):
+        self._wakeup.set()
+        # Don't wait forever on a client that stopped reading
+        self.loop.call_later(self.FLUSH_TIMEOUT, self.writer.transport.abort)
+
+    async def _writer_loop(self):
+        """Drain the outbound queue until the connection is closed."""
+        try:
+            while True:
+                batch = self.queue.get(block=False)
+                if batch is None:
+                    if self.queue.closed:
+                        break
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                self.writer.write(batch)
+                await self.writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.closed = True
+            self.queue.close()
+            self.writer.close()
+
+
+class BotConnection:
+    """Seat of a server-side bot: a player with no socket.
+
+    sendall() gets every message the room sends to the seat, like a client,
+    and uses them only to notice that it is the bot's turn. The turn is then
+    thought out on the server's bot pool and played with handle_command, so
+    it goes through the same move, exchange and pass paths as a client's
+    command and never runs on a client's, the turn or the timer thread.
+    sendall() is called under the room's client_lock, so it must not call
+    back into the room itself.
+    """
+
+    _filenos = itertools.count(-2, -1)  # Never a real descriptor; -1 means closed
+
+    def __init__(self, username, room, bot, pool):
+        self.username = username
+        self.room = room
+        self.bot = bot
+        self.pool = pool
+        self.codec = protocol.JSON
+        self._fileno = next(self._filenos)
+        self.closed = False
+        self.busy = False  # A turn is queued or being thought out
+        self.busy_lock = threading.Lock()
+        self.last_error = None  # Error text the room sent for the last command
+
+    def fileno(self):
+        return -1 if self.closed else self._fileno
+
+    def sendall(self, data, kind=None):
+        if self.closed:
+            raise ConnectionResetError("Connection closed")
+        if isinstance(data, Message):
+            self._schedule()
+        else:
+            self.last_error = data.decode().strip()
+
+    def close(self):
+        self.closed = True
+
+    def _schedule(self):
+        """Queue the bot's turn on the pool if it is its turn and none is queued."""
+        room = self.room
+        if (self.closed or not room.game_started or room.game_ended
+                or room.current_turn != self.username or not room.player_racks.get(self.username)):
+            return
+        with self.busy_lock:
+            if self.busy:
+                return
+            self.busy = True
+        try:
+            self.pool.submit(self._take_turn)
+        except RuntimeError:
+            # The pool is shut down with the server
+            self.busy = False
+
+    def _take_turn(self):
+        """Choose and play the bot's move; passes if the room rejects it."""
+        room = self.room
+        try:
+            position = room.bot_position(self.username)
+            if position is None:
+                return
+            board, blanks, rack, bag_size, cross_checks = position
+            unseen = bots.unseen_tiles(room.TILE_DISTRIBUTION, board, blanks, rack)
+            command = self.bot.choose(board, blanks, rack, bag_size, unseen, cross_checks)
+            self.last_error = None
+            try:
+                room.handle_command(self, self.username, command)
+            except ValueError as e:
+                self.last_error = str(e)
+            if self.last_error and command != "PASS" and room.current_turn == self.username:
+                log.info("bot could not play, passing", bot=self.username, command=command, error=self.last_error)
+                room.handle_command(self, self.username, "PASS")
+        except Exception:
+            log.exception("bot turn failed", bot=self.username)
+        finally:
+            with self.busy_lock:
+                self.busy = False
+            # The turn may have come back round while this one was played
+            self._schedule()
+
+
+class ReplayConnection:
+    """Seat of a player while their room replays its journal.
+
+    Journal records are replayed through the room's command handlers, which
+    look players up by connection; this stands in for the player's socket
+    and sends nothing.
+    """
+
+    _filenos = BotConnection._filenos  # Shared so replay seats never clash with bots
+
+    def __init__(self, username):
+        self.username = username
+        self.codec = protocol.JSON
+        self._fileno = next(self._filenos)
+
+    def fileno(self):
+        return self._fileno
+
+    def sendall(self, data, kind=None):
+        pass
+
+    def close(self):
+        pass
+
+
+class GameRoom:
+    """A single Scrabble game: board, bag, racks, turns, timers and its players.
+
+    The server hosts any number of rooms; they share the dictionary loaded once
+    by ScrabbleServer.
+    """
     
     # Class constants
-    HOST = '0.0.0.0'  # Listen on all network interfaces
-    PORT = 12345
-    BOARD_SIZE = 15
-    SOCKET_TIMEOUT = 1.0
-    BUFFER_SIZE = 1024
-    RACK_SIZE = 7
+    BOARD_SIZE = rules.BOARD_SIZE
+    RACK_SIZE = rules.RACK_SIZE
     
     # Timer settings
     DEFAULT_TIME_PER_PLAYER = 25  # minutes
@@ -42,39 +427,38 @@ class ScrabbleServer:
     #     'Y': 0, 'Z': 0, '?': 20  # * represents blank tiles
     # }
 
-    # Add these class constants after the existing ones
-    SPECIAL_SQUARES = {
-        'DL': [(0,3), (0,11), (2,6), (2,8), (3,0), (3,7), (3,14),
-               (6,2), (6,6), (6,8), (6,12), (7,3), (7,11),
-               (8,2), (8,6), (8,8), (8,12), (11,0), (11,7), (11,14),
-               (12,6), (12,8), (14,3), (14,11)],
-        'TL': [(1,5), (1,9), (5,1), (5,5), (5,9), (5,13),
-               (9,1), (9,5), (9,9), (9,13), (13,5), (13,9)],
-        'DW': [(1,1), (2,2), (3,3), (4,4), (13,13), (12,12), (11,11), (10,10),
-               (1,13), (2,12), (3,11), (4,10), (13,1), (12,2), (11,3), (10,4),
-               (7,7)],
-        'TW': [(0,0), (0,7), (0,14), (7,0), (7,14), (14,0), (14,7), (14,14)]
+    # Premium squares; scoring uses the precomputed tables in rules
+    SPECIAL_SQUARES = rules.SPECIAL_SQUARES
+
+    # Command label for the latency metric, by the text before ':'; tile placements are 'move'
+    COMMAND_KINDS = {
+        'READY': 'ready', 'UNREADY': 'unready', 'PASS': 'pass', 'DRAW': 'draw', 'EXCHANGE': 'exchange',
+        'GET_RACK': 'get_rack', 'GET_MOVE_LOG': 'get_move_log', 'GET_BOARD': 'get_board'
     }
 
-    def __init__(self, host=None, port=None):
-        """Initialize the Scrabble server."""
-        self.host = host or self.HOST
-        self.port = port or self.PORT
+    def __init__(self, name, dictionary, time_per_player=None, overtime=None, overtime_penalty=None,
+                 move_generator=None, rng=None, journal_dir=None):
+        """Initialize an empty game room.
+
+        rng shuffles the tile bag; pass a seeded random.Random to replay a game.
+        With journal_dir, a game in progress is journaled there for recovery.
+        """
+        self.name = name
+        self.rng = rng or random.Random()
         
         # Game state
         self.board = [['' for _ in range(self.BOARD_SIZE)] for _ in range(self.BOARD_SIZE)]
         self.clients = []
-        self.client_lock = threading.Lock()
+        self.client_lock = lockprof.lock('room.client_lock')
         
         # Player management
         self.client_usernames = {}  # {socket: username}
         self.player_racks = {}      # {username: [tiles]}
-        self.player_counter = 1     # For auto-generating usernames
         
         # Timer management
-        self.time_per_player = self.DEFAULT_TIME_PER_PLAYER  # minutes
-        self.overtime = self.DEFAULT_OVERTIME  # minutes
-        self.overtime_penalty = self.DEFAULT_OVERTIME_PENALTY
+        self.time_per_player = self.DEFAULT_TIME_PER_PLAYER if time_per_player is None else time_per_player  # minutes
+        self.overtime = self.DEFAULT_OVERTIME if overtime is None else overtime  # minutes
+        self.overtime_penalty = self.DEFAULT_OVERTIME_PENALTY if overtime_penalty is None else overtime_penalty
         self.player_timers = {}  # {username: remaining_time_in_seconds}
         self.player_overtime = {}  # {username: overtime_used_in_seconds}
         self.timer_thread = None
@@ -82,30 +466,98 @@ class ScrabbleServer:
         
         # Tile bag
         self.tile_bag = self._initialize_tile_bag()
-        self.bag_lock = threading.Lock()
-        
-        # Server socket
-        self.server_socket = None
-        self.running = False
+        self.bag_lock = lockprof.lock('room.bag_lock')
 
         self.player_points = defaultdict(int)  # {username: points}
         self.current_turn = None
         self.turn_order = []
         self.turn_order_in_game = []
-        self.turn_lock = threading.Lock()
+        self.turn_lock = lockprof.lock('room.turn_lock')
         self.player_ready = {}  # {username: ready_status}
-        self.handler_threads = []  # Track client handler threads
         self.game_started = False  # Track if game has started
         self.game_ended = False    # Track if game has ended
         self.consecutive_passes = 0  # Track consecutive passes
         self.last_move_was_pass = False  # Track if last move was a pass
         
         # Dictionary and move tracking
-        self.dictionary = {}  # {word: definition}
+        self.dictionary = dictionary  # {word: definition}, shared by all rooms
         self.move_log = []    # List of moves for logging
+        self.move_log_sent = 0  # Entries of move_log already broadcast as deltas
+        self.move_log_lock = threading.Lock()
         self.board_blanks = set()  # Track positions of blank tiles on the board
-        self._load_dictionary()
+        self.board_version = 0  # Bumped on every board change; deltas carry it
+        self._clear_occupancy()
+        self.move_generator = move_generator  # MoveGenerator shared by all rooms, if loaded
+        self.cross_checks = None  # CrossCheckCache for self.board
+        self._reset_cross_checks()
+        self.journal_dir = journal_dir
+        self.journal = None  # journal.Journal of the game in progress, if journaling
+        self.detached = {}  # {username: time.monotonic() the seat lost its connection}
+        # Tiles placed by each board version after board_base_version, for resuming clients
+        self.board_base_version = self.board_version
+        self.board_deltas = []
+        # Called with a connection a broadcast could not reach; the server sets it so the
+        # connection also leaves the lobby. Without it the room drops the connection itself.
+        self.connection_lost = None
     
+    def _clear_occupancy(self):
+        """Reset the occupied-square count and the row/column bitmasks."""
+        self.tiles_on_board = 0
+        self.row_masks = [0] * self.BOARD_SIZE  # bit c set: (row, c) occupied
+        self.col_masks = [0] * self.BOARD_SIZE  # bit r set: (r, col) occupied
+
+    def _place_tile(self, row, col, char):
+        """Put a tile on the board and record it in the occupancy masks."""
+        self.board[row][col] = char
+        self.tiles_on_board += 1
+        self.row_masks[row] |= 1 << col
+        self.col_masks[col] |= 1 << row
+
+    def _clear_board(self):
+        """Empty the board under turn_lock, so a bot copying it never sees half a reset."""
+        with self.turn_lock:
+            self.board = [['' for _ in range(self.BOARD_SIZE)] for _ in range(self.BOARD_SIZE)]
+            self._clear_occupancy()
+            self.board_blanks.clear()
+            self._reset_cross_checks()
+            self.board_version += 1
+        self._clear_board_deltas()
+
+    def bot_position(self, username):
+        """Copies of what a bot needs to choose its move, or None if it is not username's turn.
+
+        Returns (board, blanks, rack, tiles in the bag, cross-checks or None).
+        Copied under turn_lock, which placing tiles and clearing the board
+        hold, so a bot thinking on the pool never reads a play half applied.
+        """
+        with self.turn_lock:
+            if self.current_turn != username or self.game_ended:
+                return None
+            board = [line[:] for line in self.board]
+            blanks = set(self.board_blanks)
+            rack = list(self.player_racks.get(username, []))
+            cross_checks = None if self.cross_checks is None else self.cross_checks.clone(board, blanks)
+        return board, blanks, rack, self._get_tiles_remaining(), cross_checks
+
+    def _reset_cross_checks(self):
+        """Rebuild the cross-check cache after self.board was replaced."""
+        if self.move_generator is not None:
+            self.cross_checks = CrossCheckCache(self.move_generator, self.board, self.board_blanks)
+
+    def legal_plays(self, rack):
+        """Every legal play for rack on the current board, best score first."""
+        return self.move_generator.generate(self.board, self.board_blanks, rack,
+                                            self.cross_checks.tables, self.cross_checks.anchors)
+
+    def _touches_tiles(self, row, col):
+        """Whether an orthogonal neighbour of (row, col) holds a tile."""
+        # Masks never have bits past the board edge, so no bounds checks
+        bit = 1 << col
+        if self.row_masks[row] & (bit << 1 | bit >> 1):
+            return True
+        bit = 1 << row
+        return bool(self.col_masks[col] & (bit << 1 | bit >> 1))
+
     def _advance_turn(self):
         with self.turn_lock:
             current_idx = self.turn_order_in_game.index(self.current_turn)
@@ -123,8 +575,8 @@ class ScrabbleServer:
         if not bag:
             raise RuntimeError("Tile bag initialization failed - no tiles created")
             
-        random.shuffle(bag)
-        print(f"[TILE BAG] Initialized with {len(bag)} tiles: {bag[:10]}...")  # Log sample
+        self.rng.shuffle(bag)
+        log.debug("tile bag initialized", room=self.name, tiles=len(bag))
         return bag
 
     def _draw_tiles(self, count):
@@ -140,7 +592,7 @@ class ScrabbleServer:
         """Return tiles to the bag and shuffle (thread-safe)."""
         with self.bag_lock:
             self.tile_bag.extend(tiles)
-            random.shuffle(self.tile_bag)
+            self.rng.shuffle(self.tile_bag)
 
     def _get_tiles_remaining(self):
         """Get remaining tile count (thread-safe)."""
@@ -154,7 +606,7 @@ class ScrabbleServer:
             return []
             
         if not self.game_started:
-            print(f"[RACK] {username} attempted to fill rack before game start")
+            log.warning("rack fill before game start", room=self.name, user=username)
             return []
             
         current_rack = self.player_racks.get(username, [])
@@ -163,43 +615,49 @@ class ScrabbleServer:
             new_tiles = self._draw_tiles(needed)
             current_rack.extend(new_tiles)
             self.player_racks[username] = current_rack
-            print(f"[RACK] {username} received {len(new_tiles)} tiles: {new_tiles}")
+            log.debug("rack filled", room=self.name, user=username, drawn=len(new_tiles))
             self._broadcast_tiles_remaining()  # Broadcast tiles remaining after drawing
             return new_tiles
         return []
 
-    def _setup_server_socket(self):
-        """Create and configure the server socket."""
-        try:
-            self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self.server_socket.bind((self.host, self.port))
-            self.server_socket.listen()
-            self.server_socket.settimeout(self.SOCKET_TIMEOUT)
-            print(f"[SERVER STARTED] Listening on {self.host}:{self.port}")
-            return True
-        except Exception as e:
-            print(f"[ERROR] Failed to setup server socket: {e}")
-            return False
-
-    def _broadcast_board(self):
-        """Send current board state and blank positions to all clients."""
+    def _board_snapshot(self):
+        """Build the full board, blank positions and version as one message."""
         board_data = {
             'type': 'board_update',
+            'version': self.board_version,
             'board': self.board,
             'blanks': list(self.board_blanks)
         }
-        message = json.dumps(board_data).encode() + b'\n'
-        with self.client_lock:
-            clients_to_remove = []
-            for client in self.clients[:]:
-                try:
-                    client.sendall(message)
-                except Exception as e:
-                    print(f"[ERROR] Failed to send to {self._get_username(client)}: {e}")
-                    clients_to_remove.append(client)
-            for client in clients_to_remove:
-                self._remove_client(client)
+        return Message(board_data)
+
+    def _broadcast_board(self):
+        """Send current board state and blank positions to all clients."""
+        self._send_to_all(self._board_snapshot(), 'board_update')
+
+    def _send_board(self, conn):
+        """Send the full board snapshot to a single client."""
+        conn.sendall(self._board_snapshot(), 'board_update')
+
+    def _broadcast_board_delta(self, placed):
+        """Send only the tiles placed by the last move to all clients.
+
+        Clients apply the delta if its version directly follows theirs and
+        request a full snapshot with GET_BOARD otherwise.
+        """
+        self.board_version += 1
+        tiles = [[row, col, char, (row, col) in self.board_blanks] for row, col, char in placed]
+        self.board_deltas.append(tiles)
+        delta = {
+            'type': 'board_delta',
+            'version': self.board_version,
+            'tiles': tiles
+        }
+        self._send_to_all(Message(delta), 'board_delta')
+
+    def _clear_board_deltas(self):
+        """Forget the delta history after the board was replaced wholesale."""
+        self.board_base_version = self.board_version
+        self.board_deltas = []
 
     def _broadcast_player_list(self):
         """Send updated player list to all clients."""
@@ -212,7 +670,8 @@ class ScrabbleServer:
                     "points": self.player_points[username],
                     "current_turn": (username == self.current_turn),
                     "ready": self.player_ready.get(username, False),
-                    "timed_out": username not in self.turn_order_in_game
+                    "timed_out": username not in self.turn_order_in_game,
+                    "away": username in self.detached
                 }
                 for username in self.turn_order
             ]
@@ -220,14 +679,32 @@ class ScrabbleServer:
         self._broadcast_message(player_data)
 
     def _broadcast_message(self, data):
-        """Broadcast JSON message to all clients."""
-        message = json.dumps(data).encode() + b'\n'
+        """Broadcast a message to all clients, encoded once per wire protocol."""
+        self._send_to_all(Message(data), data.get('type'))
+
+    def _send_to_all(self, message, kind=None):
+        """Queue a message on every client's outbound queue.
+
+        Clients whose queue rejects the message are dropped after client_lock
+        is released, since removing them takes the lock. A player dropped
+        mid-game keeps their seat and can resume it.
+        """
+        clients_to_remove = []
         with self.client_lock:
-            for conn in self.clients[:]:
+            start = time.perf_counter()
+            for client in self.clients:
                 try:
-                    conn.sendall(message)
-                except:
-                    self._remove_client(conn)
+                    client.sendall(message, kind)
+                except Exception as e:
+                    log.warning("send failed", room=self.name, user=self._get_username(client), error=str(e))
+                    clients_to_remove.append(client)
+            elapsed = time.perf_counter() - start
+        metrics.BROADCAST_SECONDS.observe(elapsed)
+        for client in clients_to_remove:
+            if self.connection_lost is not None:
+                self.connection_lost(client)
+            else:
+                self._remove_client(client, keep_seat=True)
 
     def _send_rack_update(self, conn):
         """Send a player their current rack."""
@@ -242,114 +719,104 @@ class ScrabbleServer:
                 'tiles_remaining': self._get_tiles_remaining(),
                 'username': username
             }
-            message = json.dumps(rack_data).encode() + b'\n'
-            conn.sendall(message)
-        except Exception as e:
-            print(f"[ERROR] Failed to send rack update: {e}")
-
-    def _add_client(self, conn):
-        """Non-blocking client registration."""
-        try:
-            # Block new joins only if game is in progress (has players and is started)
-            if self.game_started and self.turn_order:
-                conn.sendall("ERROR:Game already in progress, cannot join\n".encode())
-                conn.close()
-                return
-            conn.settimeout(5.0)
-            username_msg = self._receive_line(conn)
-            if not username_msg.startswith("USERNAME:"):
-                conn.sendall("ERROR:Invalid username format\n".encode())
-                conn.close()
-                return
-            username = username_msg[9:].strip()
-            
-            # Check if username is currently in use by an active connection
-            with self.client_lock:
-                if username in self.client_usernames.values():
-                    conn.sendall("ERROR:Username already in use\n".encode())
-                    conn.close()
-                    return
-                    
-                self.clients.append(conn)
-                self.client_usernames[conn.fileno()] = username
-                if username not in self.player_racks:
-                    self.player_racks[username] = []
-                if username not in self.player_points:
-                    self.player_points[username] = 0
-                # --- Turn system initialization ---
-                if username not in self.turn_order:
-                    self.turn_order.append(username)
-                    self.turn_order_in_game.append(username)
-                if self.current_turn is None:
-                    self.current_turn = self.turn_order_in_game[0]
-                # --- End turn system initialization ---
-                conn.sendall("OK:Username accepted\n".encode())
-            self._broadcast_player_list()
-        except socket.timeout:
-            print(f"Client connection timed out during registration")
-            conn.close()
+            conn.sendall(Message(rack_data))
         except Exception as e:
-            print(f"Client registration failed: {str(e)}")
-            conn.close()
+            log.error("rack update failed", room=self.name, user=username, error=str(e))
 
-    def _receive_line(self, conn):
-        """Helper to read a complete line."""
-        buffer = []
-        while True:
-            chunk = conn.recv(1).decode()
-            if chunk == '\n' or not chunk:
-                break
-            buffer.append(chunk)
-        return ''.join(buffer)
+    def _remove_client(self, conn, close=True, keep_seat=False):
+        """Remove a client's connection and, unless its seat is kept, the seat.
 
-    def _remove_client(self, conn):
-        """Remove client and update all relevant state."""
+        With close=False the connection stays open, e.g. when the player
+        moves to another room. With keep_seat, a player dropped from a game
+        in progress keeps rack, score and turn slot until they reconnect or
+        the server expires the seat with remove_seat.
+        """
         username = self._get_username(conn)
         try:
             with self.client_lock:
                 if conn in self.clients:
                     self.clients.remove(conn)
-                fileno = conn.fileno()
-                if fileno in self.client_usernames:
-                    del self.client_usernames[fileno]
-                # Remove from all game state
-                if username:
-                    if username in self.player_racks:
-                        del self.player_racks[username]
-                    if username in self.player_points:
-                        del self.player_points[username]
-                    if username in self.player_ready:
-                        del self.player_ready[username]
-                    if username in self.turn_order:
-                        idx = self.turn_order.index(username)
-                        self.turn_order.remove(username)
-                    if username in self.turn_order_in_game:
-                        idx = self.turn_order_in_game.index(username)
-                        self.turn_order_in_game.remove(username)
-                        # If it was their turn, advance turn
-                        if self.current_turn == username:
-                            if self.turn_order_in_game:
-                                self.current_turn = self.turn_order_in_game[idx % len(self.turn_order_in_game)]
-                            else:
-                                self.current_turn = None
-            try:
-                conn.close()
-            except:
-                pass
-            print(f"[DISCONNECTED] {username if username else conn} (fully removed)")
-            # If all players left, reset game state
-            if not self.turn_order:
-                self._reset_game_state()
-                print("[SERVER] All players left. Game state reset.")
-            else:
-                # If game hasn't started, check if all remaining are ready
-                if not self.game_started and all(self.player_ready.get(u, False) for u in self.turn_order):
-                    self.game_started = True
-                    self._broadcast_message({"type": "game_start"})
-            self._broadcast_player_list()
-            self._broadcast_board()
-        except Exception as e:
-            print(f"[ERROR] Error removing client: {e}")
+                self.client_usernames.pop(conn, None)
+            if close:
+                try:
+                    conn.close()
+                except:
+                    pass
+            if username and keep_seat and self.game_started and not self.game_ended and username in self.turn_order:
+                self.detached[username] = time.monotonic()
+                log.info("player disconnected, seat kept", room=self.name, user=username)
+                self._broadcast_player_list()
+                return
+            self.remove_seat(username)
+            log.info("player removed", room=self.name, user=username or str(conn))
+        except Exception:
+            log.exception("error removing client", room=self.name)
+
+    def remove_seat(self, username):
+        """Drop a player's rack, score and turn slot, and reset the room if nobody is left."""
+        with self.client_lock:
+            self.detached.pop(username, None)
+            # Remove from all game state
+            if username:
+                if username in self.player_racks:
+                    del self.player_racks[username]
+                if username in self.player_points:
+                    del self.player_points[username]
+                if username in self.player_ready:
+                    del self.player_ready[username]
+                if username in self.turn_order:
+                    idx = self.turn_order.index(username)
+                    self.turn_order.remove(username)
+                if username in self.turn_order_in_game:
+                    idx = self.turn_order_in_game.index(username)
+                    self.turn_order_in_game.remove(username)
+                    # If it was their turn, advance turn
+                    if self.current_turn == username:
+                        if self.turn_order_in_game:
+                            self.current_turn = self.turn_order_in_game[idx % len(self.turn_order_in_game)]
+                        else:
+                            self.current_turn = None
+        if username and self.game_started:
+            self._journal_record({'type': 'leave', 'username': username})
+        # If all players left, reset game state
+        if not self.turn_order:
+            self._reset_game_state()
+            log.info("all players left, game reset", room=self.name)
+        else:
+            # If game hasn't started, check if all remaining are ready
+            if not self.game_started and all(self.player_ready.get(u, False) for u in self.turn_order):
+                self.game_started = True
+                self._broadcast_message({"type": "game_start"})
+        self._broadcast_player_list()
+
+    def expired_seats(self, deadline):
+        """Usernames whose seats have been vacant since before deadline (a time.monotonic() value)."""
+        with self.client_lock:
+            return [username for username, since in self.detached.items() if since < deadline]
+
+    def can_join(self):
+        """Whether new players may still take a seat in this room."""
+        # Block new joins only if game is in progress (has players and is started)
+        return not (self.game_started and self.turn_order)
+
+    def add_player(self, conn, username):
+        """Seat a registered connection in this room, or give a vacant seat back to its player."""
+        with self.client_lock:
+            self.clients.append(conn)
+            self.client_usernames[conn] = username
+            self.detached.pop(username, None)
+            if username not in self.player_racks:
+                self.player_racks[username] = []
+            if username not in self.player_points:
+                self.player_points[username] = 0
+            # --- Turn system initialization ---
+            if username not in self.turn_order:
+                self.turn_order.append(username)
+                self.turn_order_in_game.append(username)
+            if self.current_turn is None:
+                self.current_turn = self.turn_order_in_game[0]
+            # --- End turn system initialization ---
+        self._broadcast_player_list()
 
     def _send_initial_data(self, conn):
         """Send board and rack to new/reconnected player."""
@@ -357,11 +824,97 @@ class ScrabbleServer:
         if not username:
             return
         try:
-            initial_data = json.dumps(self.board).encode() + b'\n'
-            conn.sendall(initial_data)
+            self._send_board(conn)
+            self._send_rack_update(conn)
+            self._send_move_log(conn)
+        except Exception as e:
+            log.error("initial data send failed", room=self.name, user=username, error=str(e))
+
+    def _send_resume_data(self, conn, board_version, log_seq):
+        """Send a reconnected player only what changed since the versions they last applied.
+
+        Falls back to the full board or move log when the player's version is
+        not one this room can bring up to date.
+        """
+        username = self._get_username(conn)
+        if not username:
+            return
+        try:
+            if self.board_base_version <= board_version <= self.board_version:
+                if board_version < self.board_version:
+                    delta = {
+                        'type': 'board_delta',
+                        'version': self.board_version,
+                        'since': board_version,
+                        'tiles': [tile for tiles in self.board_deltas[board_version - self.board_base_version:]
+                                  for tile in tiles]
+                    }
+                    conn.sendall(Message(delta), 'board_delta')
+            else:
+                self._send_board(conn)
             self._send_rack_update(conn)
+            with self.move_log_lock:
+                if 0 <= log_seq <= self.move_log_sent:
+                    message = None
+                    if log_seq < self.move_log_sent:
+                        message = Message({
+                            "type": "move_log_append",
+                            "seq": log_seq,
+                            "moves": self.move_log[log_seq:self.move_log_sent]
+                        })
+                else:
+                    message = Message({
+                        "type": "move_log",
+                        "seq": 0,
+                        "moves": self.move_log[:self.move_log_sent]
+                    })
+            if message is not None:
+                conn.sendall(message, message.data['type'])
+            log.info("player resumed", room=self.name, user=username, board_version=board_version, log_seq=log_seq)
         except Exception as e:
-            print(f"[ERROR] Failed to send initial data to {username}: {e}")
+            log.error("resume data send failed", room=self.name, user=username, error=str(e))
+
+    def handle_command(self, conn, username, data):
+        """Handle an in-game command from a player seated in this room.
+
+        Raises ValueError for rejected commands; the caller reports it.
+        """
+        start = time.perf_counter()
+        try:
+            self._dispatch_command(conn, username, data)
+        finally:
+            metrics.COMMAND_SECONDS.observe(time.perf_counter() - start,
+                                            self.COMMAND_KINDS.get(data.partition(':')[0], 'move'))
+
+    def _dispatch_command(self, conn, username, data):
+        if data == "READY":
+            self.player_ready[username] = True
+            self._broadcast_player_list()
+            # Check if all players are ready
+            if all(self.player_ready.get(u, False) for u in self.turn_order):
+                self._start_game()
+        elif data == "UNREADY":
+            self.player_ready[username] = False
+            self._broadcast_player_list()
+        elif data == "PASS":
+            self._handle_pass(conn)
+        elif data.startswith('DRAW:'):
+            self._handle_draw_request(conn, data[5:])
+        elif data.startswith('EXCHANGE:'):
+            self._handle_exchange_request(conn, data[9:])
+        elif data == 'GET_RACK':
+            self._send_rack_update(conn)
+        elif data == 'GET_MOVE_LOG':
+            self._send_move_log(conn)
+        elif data == 'GET_BOARD':
+            self._send_board(conn)
+        elif ';' in data:
+            self._process_batch_move(conn, data)
+            self._send_rack_update(conn)
+        else:
+            # For single moves, just pass the data directly to _process_batch_move
+            self._process_batch_move(conn, data)
+            self._send_rack_update(conn)
 
     def _parse_move(self, data):
         """Validate and parse move data."""
@@ -421,14 +974,11 @@ class ScrabbleServer:
         for tile in tiles_used:
             if tile in rack:
                 rack.remove(tile)
-        print(f"[RACK] {username} used tiles: {tiles_used}")
+        log.debug("tiles used", room=self.name, user=username, tiles=tiles_used)
 
     def _get_square_type(self, row, col):
         """Get the type of special square at the given position."""
-        for square_type, positions in self.SPECIAL_SQUARES.items():
-            if (row, col) in positions:
-                return square_type
-        return None
+        return rules.SQUARE_TYPES[row][col]
 
     def _calculate_word_score(self, word_positions, new_positions, temp_board=None, temp_blanks=None):
         """Calculate score for a word given its exact positions."""
@@ -444,23 +994,15 @@ class ScrabbleServer:
             # Check if this is a blank tile
             is_blank = (row, col) in temp_blanks
             # Always score 0 for blank tiles
-            letter_score = self._get_letter_value('?') if is_blank else self._get_letter_value(letter)
-            square_type = self._get_square_type(row, col)
+            letter_score = 0 if is_blank else rules.LETTER_VALUES.get(letter.upper(), 0)
             
             # Check if this is a new tile (part of the current move)
             is_new_tile = (row, col) in new_positions
             
             if is_new_tile:
-                # Apply letter multipliers only to new tiles
-                if square_type == 'DL':
-                    letter_score *= 2
-                elif square_type == 'TL':
-                    letter_score *= 3
-                # Apply word multipliers to all tiles
-                if square_type == 'DW' or square_type == '*':  # Center star is also double word
-                    word_mult *= 2
-                elif square_type == 'TW':
-                    word_mult *= 3
+                # Premiums only count for new tiles; the centre square is a DW
+                letter_score *= rules.LETTER_MULTIPLIERS[row][col]
+                word_mult *= rules.WORD_MULTIPLIERS[row][col]
             
             word_score += letter_score
         
@@ -468,8 +1010,8 @@ class ScrabbleServer:
         word_score *= word_mult
         
         # Add bingo bonus (50 points) only for primary words that use all 7 tiles
-        if is_primary_word and len(new_positions) == 7:
-            word_score += 50
+        if is_primary_word and len(new_positions) == rules.RACK_SIZE:
+            word_score += rules.BINGO_BONUS
             
         return word_score
 
@@ -495,7 +1037,7 @@ class ScrabbleServer:
                 word_score = self._calculate_word_score(word_positions, new_positions, temp_board, temp_blanks)
                 if word_score is not None:
                     total_score += word_score
-                    print(f"[DEBUG] Word score for '{word}': {word_score}, Total: {total_score}")  # Debug log
+                    log.debug("word scored", word=word, score=word_score, total=total_score)
         
         return total_score
 
@@ -538,7 +1080,7 @@ class ScrabbleServer:
                 if i + 1 < len(pos_pairs):
                     r, c = int(pos_pairs[i]), int(pos_pairs[i + 1])
                     blank_positions.add((r, c))
-                    print(f"[DEBUG] Added blank position: ({r}, {c})")  # Debug log
+                    log.debug("blank position", row=r, col=c)
         else:
             moves_str = batch_data
             blank_positions = set()
@@ -581,13 +1123,16 @@ class ScrabbleServer:
             else:
                 rack.remove(char)  # Remove the regular tile
         
-        # Apply all valid moves and update blank positions
-        for row, col, char in processed_moves:
-            self.board[row][col] = char
-            # Only mark as blank if the position was in the blank_positions set
-            if (row, col) in blank_positions:
-                self.board_blanks.add((row, col))
-                print(f"[DEBUG] Marking position ({row}, {col}) as blank")
+        # Apply all valid moves and update blank positions; bots copy the board under turn_lock
+        with self.turn_lock:
+            for row, col, char in processed_moves:
+                self._place_tile(row, col, char)
+                # Only mark as blank if the position was in the blank_positions set
+                if (row, col) in blank_positions:
+                    self.board_blanks.add((row, col))
+                    log.debug("blank placed", row=row, col=col)
+            if self.cross_checks is not None:
+                self.cross_checks.update([(row, col) for row, col, _ in processed_moves])
         
         # Get all words created by this play
         words = self._get_all_words(processed_moves)
@@ -605,13 +1150,16 @@ class ScrabbleServer:
         self.consecutive_passes = 0
         self.last_move_was_pass = False
         
-        print(f"[BATCH] {username} placed {len(processed_moves)} tiles for {word_score} points")
+        log.info("move played", room=self.name, user=username, tiles=len(processed_moves), points=word_score)
+        
+        metrics.MOVES.inc()
         
         # Switch turns after a valid batch move
         self._advance_turn()
+        self._journal_record({'type': 'move', 'username': username, 'data': batch_data})
         
         # Broadcast updates
-        self._broadcast_board()
+        self._broadcast_board_delta(processed_moves)
         self._broadcast_player_list()
         self._broadcast_move_log()  # Ensure move log is broadcast
         
@@ -647,6 +1195,7 @@ class ScrabbleServer:
         self.move_log.append(pass_info)
         
         self._advance_turn()
+        self._journal_record({'type': 'pass', 'username': username})
             
         # Broadcast updates
         self._broadcast_player_list()
@@ -655,29 +1204,25 @@ class ScrabbleServer:
     def _end_game(self):
         """Handle end of game procedures."""
         if self.game_ended:
-            print("[DEBUG] Game already ended, skipping end game procedure")
+            log.debug("game already ended", room=self.name)
             return
             
-        print("[DEBUG] Starting end game procedure")
         self.game_ended = True
-        print("[GAME] Game has ended")
+        self._discard_journal()  # Nothing left to recover
+        log.info("game ended", room=self.name)
         
         try:
             # Calculate final scores
             final_scores = {}
-            print("[DEBUG] Calculating final scores")
             for username in self.turn_order:
-                print(f"[DEBUG] Processing player: {username}")
                 # Get remaining tiles
                 remaining_tiles = self.player_racks[username]
-                print(f"[DEBUG] Remaining tiles for {username}: {remaining_tiles}")
                 # Calculate penalty
                 penalty = sum(self._get_letter_value(tile) for tile in remaining_tiles)
-                print(f"[DEBUG] Penalty for {username}: {penalty}")
+                log.debug("final tiles penalty", room=self.name, user=username, tiles=remaining_tiles, penalty=penalty)
                 # Subtract penalty from score
                 final_score = self.player_points[username] - penalty
                 final_scores[username] = final_score
-                print(f"[DEBUG] Final score for {username}: {final_score}")
                 
                 # Update player's score
                 self.player_points[username] = final_score
@@ -686,7 +1231,7 @@ class ScrabbleServer:
                 self._return_tiles_to_bag(remaining_tiles)
                 self.player_racks[username] = []
             
-            print(f"[DEBUG] Final scores calculated: {final_scores}")
+            log.debug("final scores", room=self.name, scores=final_scores)
             
             # Log final scores
             final_score_info = {
@@ -694,10 +1239,8 @@ class ScrabbleServer:
                 "scores": final_scores
             }
             self.move_log.append(final_score_info)
-            print("[DEBUG] Added final scores to move log")
             
             # Broadcast final state
-            print("[DEBUG] Broadcasting final state")
             self._broadcast_player_list()
             self._broadcast_move_log()
             self._broadcast_tiles_remaining()  # Broadcast tiles remaining after returning tiles
@@ -707,13 +1250,10 @@ class ScrabbleServer:
                 "type": "game_end",
                 "scores": final_scores
             }
-            print(f"[DEBUG] Sending game end message: {end_message}")
             self._broadcast_message(end_message)
-            print("[DEBUG] Game end message broadcast complete")
             
-        except Exception as e:
-            print(f"[ERROR] Error in end game procedure: {e}")
-            traceback.print_exc()
+        except Exception:
+            log.exception("end game failed", room=self.name)
 
     def _handle_draw_request(self, conn, count_str):
         """Handle tile drawing request."""
@@ -735,8 +1275,9 @@ class ScrabbleServer:
             
             new_tiles = self._draw_tiles(count)
             current_rack.extend(new_tiles)
+            self._journal_record({'type': 'draw', 'username': username, 'count': count})
             self._send_rack_update(conn)
-            print(f"[DRAW] {username} drew {len(new_tiles)} tiles")
+            log.info("tiles drawn", room=self.name, user=username, count=len(new_tiles))
             
         except ValueError as e:
             error_msg = f"Draw Error: {e}\n"
@@ -796,6 +1337,7 @@ class ScrabbleServer:
             self.last_move_was_pass = False
             
             self._advance_turn()
+            self._journal_record({'type': 'exchange', 'username': username, 'tiles': tiles_str})
             
             # Send updated rack and broadcast player list
             self._send_rack_update(conn)
@@ -803,191 +1345,28 @@ class ScrabbleServer:
             self._broadcast_move_log()
             self._broadcast_tiles_remaining()  # Broadcast tiles remaining after exchange
             
-            print(f"[EXCHANGE] {username} exchanged {len(tiles_to_exchange)} tiles")
+            log.info("tiles exchanged", room=self.name, user=username, count=len(tiles_to_exchange))
             
         except ValueError as e:
             error_msg = f"Exchange Error: {e}\n"
             conn.sendall(error_msg.encode())
 
-    def _handle_client(self, conn, addr):
-        """Main client handler loop."""
-        print(f"[CONNECTION] From {addr}")
-        username = None
-        try:
-            self._add_client(conn)
-            fileno = conn.fileno()
-            username = self.client_usernames.get(fileno)
-            self._send_initial_data(conn)
-            
-            # Set timeout only if socket is still valid
-            try:
-                conn.settimeout(1.0)
-            except OSError:
-                print(f"[ERROR] Socket invalid for {addr}")
-                return
-                
-            while self.running:
-                try:
-                    data = conn.recv(1024).decode().strip()
-                    if not data:
-                        print(f"[DISCONNECT] Client {username or addr} disconnected (no data)")
-                        break
-                    try:
-                        if data == "DISCONNECT":
-                            print(f"[DISCONNECT] Client {username or addr} requested disconnect")
-                            # Handle disconnection
-                            if username:
-                                # Find and remove the player with matching username
-                                player = next((p for p in self.clients if self._get_username(p) == username), None)
-                                if player:
-                                    self.clients.remove(player)
-                                    self.client_usernames.pop(player)
-                                    try:
-                                        player.close()
-                                    except:
-                                        pass
-                                    self._broadcast_player_list()
-                            else:
-                                # Handle disconnection without username
-                                player = next((p for p in self.clients if p == conn), None)
-                                if player:
-                                    self.clients.remove(player)
-                                    self.client_usernames.pop(player)
-                                    try:
-                                        player.close()
-                                    except:
-                                        pass
-                                    self._broadcast_player_list()
-                            
-                            # If no players left, reset game state
-                            if not self.clients:
-                                self._reset_game_state()
-                            break
-                        elif data == "READY":
-                            self.player_ready[username] = True
-                            self._broadcast_player_list()
-                            # Check if all players are ready
-                            if all(self.player_ready.get(u, False) for u in self.turn_order):
-                                self._start_game()
-                        elif data == "UNREADY":
-                            self.player_ready[username] = False
-                            self._broadcast_player_list()
-                        elif data == "PASS":
-                            self._handle_pass(conn)
-                        elif data.startswith('DRAW:'):
-                            self._handle_draw_request(conn, data[5:])
-                        elif data.startswith('EXCHANGE:'):
-                            self._handle_exchange_request(conn, data[9:])
-                        elif data == 'GET_RACK':
-                            self._send_rack_update(conn)
-                        elif ';' in data:
-                            self._process_batch_move(conn, data)
-                            self._broadcast_board()
-                            self._send_rack_update(conn)
-                        else:
-                            # For single moves, just pass the data directly to _process_batch_move
-                            self._process_batch_move(conn, data)
-                            self._broadcast_board()
-                            self._send_rack_update(conn)
-                    except ValueError as e:
-                        error_msg = f"Error: {e}\n"
-                        try:
-                            conn.sendall(error_msg.encode())
-                        except OSError:
-                            break
-                except socket.timeout:
-                    continue
-                except ConnectionResetError:
-                    print(f"[DISCONNECT] Client {username or addr} disconnected (connection reset)")
-                    break
-                except OSError as e:
-                    print(f"[ERROR] Socket error for {username or addr}: {e}")
-                    break
-                except Exception as e:
-                    print(f"[ERROR] Client handler error for {username or addr}: {e}")
-                    break
-        except Exception as e:
-            print(f"[ERROR] Client {addr} error: {e}")
-            traceback.print_exc()
-        finally:
-            print(f"[DISCONNECT] Removing client {username or addr}")
-            self._remove_client(conn)
+    def close(self):
+        """Disconnect every player and stop the room's timer.
 
-    def _accept_clients(self):
-        """Accept incoming client connections with proper interrupt handling and ESC key support."""
-        while self.running:
-            try:
-                if msvcrt.kbhit():
-                    key = msvcrt.getch()
-                    if key == b'\x1b':
-                        print("\n[SERVER] ESC key pressed, shutting down...")
-                        self.running = False
-                        break
-                try:
-                    conn, addr = self.server_socket.accept()
-                    client_thread = threading.Thread(
-                        target=self._handle_client, 
-                        args=(conn, addr),
-                        daemon=True
-                    )
-                    client_thread.start()
-                    self.handler_threads.append(client_thread)
-                except socket.timeout:
-                    continue
-                except OSError:
-                    if not self.running:
-                        break
-                    raise
-            except KeyboardInterrupt:
-                print("\n[SERVER] Keyboard interrupt received in accept loop")
-                self.running = False
-                break
-            except Exception as e:
-                if self.running:
-                    print(f"[ERROR] Accept error: {e}")
-                break
-
-    def start(self):
-        """Start the server with proper interrupt handling."""
-        # Setup timer settings before starting
-        self._setup_timer_settings()
-        
-        if not self._setup_server_socket():
-            return False
-        
-        self.running = True
-        print("[SERVER] Ready for connections")
-        
-        try:
-            self._accept_clients()
-        except KeyboardInterrupt:
-            pass  # Let the finally block handle shutdown
-        except Exception as e:
-            print(f"[SERVER] Error: {e}")
-        finally:
-            if self.running:  # Only stop if not already stopped
-                self.stop()
-        
-        return True
-
-    def stop(self):
-        """Proper shutdown procedure."""
-        if not self.running:
-            return
-        print("[SERVER] Shutting down...")
-        self.running = False
-        with self.client_lock:
-            for client in self.clients[:]:
+        A journaled game keeps its journal, so the next start recovers it.
+        """
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        # Before taking client_lock: a timer tick in progress needs it to broadcast
+        self._stop_timer()
+        with self.client_lock:
+            for client in self.clients[:]:
                 try:
                     client.sendall("ERROR:Server shutting down\n".encode())
                 except:
                     pass
-        if self.server_socket:
-            try:
-                self.server_socket.close()
-            except:
-                pass
-        with self.client_lock:
             for client in self.clients[:]:
                 try:
                     client.close()
@@ -1000,20 +1379,153 @@ class ScrabbleServer:
             self.player_ready.clear()
             self.turn_order.clear()
             self.turn_order_in_game.clear()
+            self.detached.clear()
             self.current_turn = None
             # Reset the tile bag
             self.tile_bag = self._initialize_tile_bag()
-            # Reset the board
-            self.board = [['' for _ in range(self.BOARD_SIZE)] for _ in range(self.BOARD_SIZE)]
             # Clear the move log
             self.move_log.clear()
-            self.board_blanks.clear()
-            # Stop timer
-            self._stop_timer()
-        # Wait for all handler threads to finish
-        for t in self.handler_threads:
-            t.join(timeout=2)
-        print("[SERVER] Stopped")
+            self.move_log_sent = 0
+        self._clear_board()
+
+    def _open_journal(self):
+        """Start journaling the game that just began, if the room has a journal directory."""
+        if self.journal_dir is None:
+            return
+        try:
+            self.journal = journal.Journal(journal.journal_path(self.journal_dir, self.name),
+                                           self._journal_snapshot())
+        except OSError as e:
+            log.error("journal open failed", room=self.name, error=str(e))
+
+    def _discard_journal(self):
+        """Stop journaling and delete the journal of a finished or abandoned game."""
+        if self.journal is not None:
+            self.journal.discard()
+            self.journal = None
+
+    def _journal_record(self, record):
+        """Append an accepted command or timer event to the journal.
+
+        Called once the event has changed the game state. The players' clocks
+        go with every record, since the timer ticks are not journaled.
+        """
+        if self.journal is None:
+            return
+        record['timers'] = dict(self.player_timers)
+        record['overtime_used'] = dict(self.player_overtime)
+        try:
+            self.journal.append(record)
+            if self.journal.records_since_snapshot >= journal.SNAPSHOT_INTERVAL:
+                self.journal.snapshot(self._journal_snapshot())
+        except OSError as e:
+            log.error("journal write failed", room=self.name, error=str(e))
+
+    def _journal_snapshot(self):
+        """The whole game state as a journal snapshot record."""
+        with self.bag_lock:
+            tile_bag = list(self.tile_bag)
+            rng_state = self.rng.getstate()
+        with self.move_log_lock:
+            move_log = list(self.move_log)
+        with self.client_lock:
+            bot_seats = {client.username: client.bot.strength
+                         for client in self.clients if isinstance(client, BotConnection)}
+        return {
+            'type': 'snapshot',
+            'time_per_player': self.time_per_player,
+            'overtime': self.overtime,
+            'overtime_penalty': self.overtime_penalty,
+            'rng': rng_state,
+            'board': [row[:] for row in self.board],
+            'blanks': list(self.board_blanks),
+            'tile_bag': tile_bag,
+            'racks': {username: list(rack) for username, rack in self.player_racks.items()},
+            'points': dict(self.player_points),
+            'ready': dict(self.player_ready),
+            'turn_order': list(self.turn_order),
+            'turn_order_in_game': list(self.turn_order_in_game),
+            'current_turn': self.current_turn,
+            'timers': dict(self.player_timers),
+            'overtime_used': dict(self.player_overtime),
+            'move_log': move_log,
+            'game_started': self.game_started,
+            'game_ended': self.game_ended,
+            'consecutive_passes': self.consecutive_passes,
+            'last_move_was_pass': self.last_move_was_pass,
+            'bots': bot_seats
+        }
+
+    def restore(self, snapshot, records):
+        """Rebuild a journaled game from its snapshot and the records after it.
+
+        Records are replayed through the same handlers that accepted them, on
+        seats with no connection; players take their seats back by logging in
+        with their username. Raises ValueError if a record no longer applies.
+        """
+        version, internal, gauss_next = snapshot['rng']
+        self.rng.setstate((version, tuple(internal), gauss_next))
+        self.board = [['' for _ in range(self.BOARD_SIZE)] for _ in range(self.BOARD_SIZE)]
+        self._clear_occupancy()
+        for row, line in enumerate(snapshot['board']):
+            for col, char in enumerate(line):
+                if char:
+                    self._place_tile(row, col, char)
+        self.board_blanks = {tuple(pos) for pos in snapshot['blanks']}
+        self._reset_cross_checks()
+        self.board_version += 1
+        self._clear_board_deltas()
+        self.tile_bag = list(snapshot['tile_bag'])
+        self.player_racks = {username: list(rack) for username, rack in snapshot['racks'].items()}
+        self.player_points = defaultdict(int, snapshot['points'])
+        self.player_ready = dict(snapshot['ready'])
+        self.turn_order = list(snapshot['turn_order'])
+        self.turn_order_in_game = list(snapshot['turn_order_in_game'])
+        self.current_turn = snapshot['current_turn']
+        self.player_timers = dict(snapshot['timers'])
+        self.player_overtime = dict(snapshot['overtime_used'])
+        self.move_log = list(snapshot['move_log'])
+        self.game_started = snapshot['game_started']
+        self.game_ended = snapshot['game_ended']
+        self.consecutive_passes = snapshot['consecutive_passes']
+        self.last_move_was_pass = snapshot['last_move_was_pass']
+
+        seats = {username: ReplayConnection(username) for username in self.turn_order}
+        for username, seat in seats.items():
+            self.client_usernames[seat] = username
+        try:
+            for record in records:
+                seat = seats.get(record.get('username'))
+                if seat is None:
+                    raise ValueError(f"Journal record for unknown player: {record}")
+                kind = record['type']
+                if kind == 'move':
+                    self._process_batch_move(seat, record['data'])
+                elif kind == 'pass':
+                    self._handle_pass(seat)
+                elif kind == 'draw':
+                    self._handle_draw_request(seat, str(record['count']))
+                elif kind == 'exchange':
+                    self._handle_exchange_request(seat, record['tiles'])
+                elif kind == 'penalty':
+                    self._apply_overtime_penalty(seat.username)
+                elif kind == 'timeout':
+                    self._handle_player_timeout(seat.username)
+                elif kind == 'leave':
+                    self.remove_seat(seat.username)
+                else:
+                    raise ValueError(f"Unknown journal record type {kind}")
+                self.player_timers = dict(record['timers'])
+                self.player_overtime = dict(record['overtime_used'])
+        finally:
+            for seat in seats.values():
+                self.client_usernames.pop(seat, None)
+        self.move_log_sent = len(self.move_log)
+        # Every seat waits for its player to reconnect
+        now = time.monotonic()
+        self.detached = {username: now for username in self.turn_order}
+        if self.game_started and not self.game_ended:
+            self._start_timer()
 
     # Additional utility methods
     def print_board(self):
@@ -1026,45 +1538,23 @@ class ScrabbleServer:
         print()
 
     def print_status(self):
-        """Print server status."""
-        print(f"\n[STATUS] Connected players: {len(self.player_racks)}")
+        """Print room status."""
+        print(f"\n[STATUS] Room {self.name}")
+        print(f"[STATUS] Connected players: {len(self.player_racks)}")
         print(f"[STATUS] Tiles remaining: {self._get_tiles_remaining()}")
         print(f"[STATUS] Active racks: { {k: len(v) for k, v in self.player_racks.items()} }")
 
     def _get_username(self, conn):
-        fileno = conn.fileno()
-        return self.client_usernames.get(fileno)
+        # Keyed by the connection itself: fileno() turns -1 once the connection closes
+        return self.client_usernames.get(conn)
 
     def _get_letter_value(self, char):
         """Return the standard Scrabble letter value for a given character."""
-        values = {
-            'A': 1, 'B': 3, 'C': 3, 'D': 2, 'E': 1, 'F': 4, 'G': 2, 'H': 4,
-            'I': 1, 'J': 8, 'K': 5, 'L': 1, 'M': 3, 'N': 1, 'O': 1, 'P': 3,
-            'Q': 10, 'R': 1, 'S': 1, 'T': 1, 'U': 1, 'V': 4, 'W': 4, 'X': 8,
-            'Y': 4, 'Z': 10, '?': 0
-        }
-        return values.get(char.upper(), 0)
-
-    def _load_dictionary(self):
-        """Load the Scrabble dictionary with definitions."""
-        try:
-            with open('assets/dictionary/words_with_definitions.txt', 'r', encoding='utf-8') as f:
-                # Skip the header line
-                next(f)
-                for line in f:
-                    # Split on tab and take both word and definition
-                    parts = line.strip().split('\t')
-                    if len(parts) >= 2:
-                        word = parts[0].strip().upper()
-                        definition = parts[1].strip()
-                        self.dictionary[word] = definition
-            print(f"[DICTIONARY] Loaded {len(self.dictionary)} words with definitions")
-        except Exception as e:
-            print(f"[ERROR] Failed to load dictionary: {e}")
-            sys.exit(1)
+        return rules.LETTER_VALUES.get(char.upper(), 0)
 
     def _get_word_definition(self, word):
         """Get the definition of a word from the dictionary."""
+        metrics.DICTIONARY_LOOKUPS.inc()
         return self.dictionary.get(word, "Definition not found")
 
     def _log_move(self, username, words, points, positions):
@@ -1100,10 +1590,9 @@ class ScrabbleServer:
                 
                 # Add all positions with their square types
                 for r, c in word_positions:
-                    square_type = self._get_square_type(r, c)
                     # Only include square type if this is a newly placed letter
                     if (r, c) in new_positions:
-                        word_info["positions"].append((r, c, temp_board[r][c], square_type))
+                        word_info["positions"].append((r, c, temp_board[r][c], rules.SQUARE_TYPES[r][c]))
                     else:
                         word_info["positions"].append((r, c, temp_board[r][c], None))
                 
@@ -1117,18 +1606,37 @@ class ScrabbleServer:
         self._broadcast_move_log()
 
     def _broadcast_move_log(self):
-        """Broadcast the move log to all clients."""
-        move_log_data = {
-            "type": "move_log",
-            "moves": self.move_log
-        }
-        message = json.dumps(move_log_data).encode() + b'\n'
-        with self.client_lock:
-            for conn in self.clients[:]:
-                try:
-                    conn.sendall(message)
-                except:
-                    self._remove_client(conn)
+        """Broadcast the move log entries added since the last broadcast.
+
+        seq is the index of the first entry in the message, so a client can
+        tell whether it missed any and ask for the full log with GET_MOVE_LOG.
+        The message is sent after move_log_lock is released: dropping a client
+        it cannot reach may journal the seat leaving, and journal snapshots
+        take the lock.
+        """
+        with self.move_log_lock:
+            seq = self.move_log_sent
+            new_moves = self.move_log[seq:]
+            if not new_moves:
+                return
+            self.move_log_sent = seq + len(new_moves)
+            message = Message({
+                "type": "move_log_append",
+                "seq": seq,
+                "moves": new_moves
+            })
+        self._send_to_all(message, 'move_log_append')
+
+    def _send_move_log(self, conn):
+        """Send one client the full move log, for joins and resyncs."""
+        with self.move_log_lock:
+            move_log_data = {
+                "type": "move_log",
+                "seq": 0,
+                "moves": self.move_log[:self.move_log_sent]
+            }
+            message = Message(move_log_data)
+        conn.sendall(message, 'move_log')
 
     def _get_word_at_position(self, row, col, horizontal=True):
         """Get the word at a given position, including any extensions."""
@@ -1226,8 +1734,7 @@ class ScrabbleServer:
                         word_positions[word_str] = []
                     word_positions[word_str].append(positions_tuple)
         
-        print(f"[DEBUG] Found words: {words}")  # Debug log
-        print(f"[DEBUG] Word positions: {word_positions}")  # Debug log
+        log.debug("words found", words=words, positions=word_positions)
         
         # Store the positions in the class for _log_move to use
         self._current_word_positions = word_positions
@@ -1241,12 +1748,7 @@ class ScrabbleServer:
             return False, "No moves provided"
         
         # Check if this is the first play
-        is_first_play = all(self.board[r][c] == '' for r in range(self.BOARD_SIZE) for c in range(self.BOARD_SIZE))
-        
-        # Create a temporary board with the moves
-        temp_board = [row[:] for row in self.board]
-        for row, col, char in moves:
-            temp_board[row][col] = char
+        is_first_play = self.tiles_on_board == 0
         
         # Validate that all new tiles are in a straight line
         if not self._are_tiles_in_line(moves):
@@ -1260,23 +1762,15 @@ class ScrabbleServer:
             return False, "Play must create at least one word"
         
         # Validate all words
+        metrics.DICTIONARY_LOOKUPS.inc(len(words))
         invalid_words = [word for word in words if word not in self.dictionary]
         if invalid_words:
             return False, f"Invalid words: {', '.join(invalid_words)}"
         
         # Check if play connects to existing words (unless it's the first play)
         if not is_first_play:
-            connected = False
-            for row, col, _ in moves:
-                # Check if this move connects to any existing tiles
-                for dr, dc in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                    nr, nc = row + dr, col + dc
-                    if (0 <= nr < self.BOARD_SIZE and 0 <= nc < self.BOARD_SIZE and 
-                        self.board[nr][nc] != ''):
-                        connected = True
-                        break
-                if connected:
-                    break
+            # Check if any move touches an existing tile
+            connected = any(self._touches_tiles(row, col) for row, col, _ in moves)
             if not connected:
                 return False, "Play must connect to at least one existing tile"
         else:
@@ -1316,12 +1810,11 @@ class ScrabbleServer:
 
     def _start_game(self):
         """Initialize the game state when all players are ready."""
-        print("[DEBUG] Starting game initialization")
         # First broadcast game start message
         self._broadcast_message({"type": "game_start"})
         # Then set game started flag
         self.game_started = True
-        print("[DEBUG] Game started flag set")
+        log.debug("game started", room=self.name)
         # Fill racks for all players when game starts
         with self.client_lock:
             clients_copy = self.clients[:]  # Create a copy of clients list
@@ -1330,9 +1823,9 @@ class ScrabbleServer:
             self._fill_rack(client)
             # Send rack update to each client after filling
             self._send_rack_update(client)
+        self._open_journal()
         # Start the timer
         self._start_timer()
-        print("[DEBUG] Game initialization complete")
 
     def _reset_game_state(self):
         """Reset all game state variables."""
@@ -1346,54 +1839,15 @@ class ScrabbleServer:
         self.player_overtime.clear()
         # Reset the tile bag
         self.tile_bag = self._initialize_tile_bag()
-        # Reset the board
-        self.board = [['' for _ in range(self.BOARD_SIZE)] for _ in range(self.BOARD_SIZE)]
+        self._clear_board()
         # Clear the move log
         self.move_log.clear()
-        self.board_blanks.clear()
+        self.move_log_sent = 0
         self.consecutive_passes = 0
+        self._discard_journal()
         # Stop timer
         self._stop_timer()
 
-    def _setup_timer_settings(self):
-        """Prompt for timer settings before starting the server."""
-        while True:
-            try:
-                time_input = input(f"Enter time per player in minutes (default: {self.DEFAULT_TIME_PER_PLAYER}, 'u' for unlimited): ").strip()
-                if time_input.lower() == 'u':
-                    self.time_per_player = float('inf')
-                    self.overtime = 0
-                    print("Timer disabled - unlimited time")
-                    return
-                
-                if time_input:
-                    time_value = float(time_input)
-                    if time_value <= 0:
-                        print("Time must be greater than 0")
-                        continue
-                    self.time_per_player = time_value
-                
-                overtime_input = input(f"Enter overtime in minutes (default: {self.DEFAULT_OVERTIME}): ").strip()
-                if overtime_input:
-                    overtime_value = float(overtime_input)
-                    if overtime_value < 0:
-                        print("Overtime cannot be negative")
-                        continue
-                    self.overtime = overtime_value
-
-                penalty_input = input(f"Enter overtime penalty (default: {self.DEFAULT_OVERTIME_PENALTY}): ").strip()
-                if penalty_input:
-                    penalty_value = int(penalty_input)
-                    if penalty_value < 0:
-                        print("Penalty cannot be negative")
-                        continue
-                    self.overtime_penalty = penalty_value
-                
-                print(f"Timer settings: {self.time_per_player} minutes + {self.overtime} minutes overtime ({self.overtime_penalty} pt penalty)")
-                return
-            except ValueError:
-                print("Please enter a valid number")
-
     def _start_timer(self):
         """Start the timer thread."""
         if self.time_per_player == float('inf'):
@@ -1417,90 +1871,99 @@ class ScrabbleServer:
     def _stop_timer(self):
         """Stop the timer thread."""
         self.timer_running = False
-        if self.timer_thread:
+        if self.timer_thread and self.timer_thread is not threading.current_thread():
             self.timer_thread.join()
 
     def _timer_loop(self):
-        """Main timer loop that checks and updates player times."""
+        """Main timer loop that checks and updates player times.
+
+        Only the clock update holds turn_lock; penalties and timeouts are
+        applied after it is released, since they broadcast and journal.
+        """
         while self.timer_running:
             try:
-                points_changed = False
+                current_player = None
+                penalty = timed_out = False
                 with self.turn_lock:
-                    if not self.game_started or self.game_ended:
-                        time.sleep(self.TIMER_CHECK_INTERVAL)
-                        continue
+                    if self.game_started and not self.game_ended:
+                        current_player = self.current_turn
+                    if current_player:
+                        # Initialize timer if not exists
+                        if current_player not in self.player_timers:
+                            self.player_timers[current_player] = self.time_per_player * 60
+                            self.player_overtime[current_player] = 0
                         
-                    current_player = self.current_turn
-                    if not current_player:
-                        time.sleep(self.TIMER_CHECK_INTERVAL)
-                        continue
-                    
-                    # Initialize timer if not exists
-                    if current_player not in self.player_timers:
-                        self.player_timers[current_player] = self.time_per_player * 60
-                        self.player_overtime[current_player] = 0
-                    
-                    # Store previous time for minute boundary check
-                    prev_time = self.player_timers[current_player]
-                    
-                    # Decrease time
-                    self.player_timers[current_player] -= self.TIMER_CHECK_INTERVAL
-                    
-                    # Check if time is up
-                    if self.player_timers[current_player] <= 0:
-                        # Start overtime if available
-                        if self.overtime > 0:
-                            overtime_used = abs(self.player_timers[current_player])
-                            self.player_overtime[current_player] = overtime_used
-                            
-                            # Check if we crossed a minute boundary
-                            prev_minute = int(prev_time / 60)
-                            current_minute = int(self.player_timers[current_player] / 60)
-                            
-                            # Apply penalty if we crossed 0:00 or any other minute boundary
-                            if (prev_time > 0 and self.player_timers[current_player] <= 0) or (prev_minute != current_minute and self.player_timers[current_player] < 0):
-                                penalty = self.overtime_penalty
-                                self.player_points[current_player] = self.player_points[current_player] - penalty
+                        # Store previous time for minute boundary check
+                        prev_time = self.player_timers[current_player]
+                        
+                        # Decrease time
+                        self.player_timers[current_player] -= self.TIMER_CHECK_INTERVAL
+                        
+                        # Check if time is up
+                        if self.player_timers[current_player] <= 0:
+                            # Start overtime if available
+                            if self.overtime > 0:
+                                overtime_used = abs(self.player_timers[current_player])
+                                self.player_overtime[current_player] = overtime_used
                                 
-                                # Log overtime penalty
-                                penalty_info = {
-                                    "type": "message",
-                                    "message": f"{current_player}: -{penalty} points (overtime).",
-                                    "color": (255, 0, 0)
-                                }
-                                self.move_log.append(penalty_info)
-                                self._broadcast_move_log()
-                                points_changed = True
-                            
-                            # Check if overtime exceeded
-                            if overtime_used >= self.overtime * 60:
-                                self._handle_player_timeout(current_player)
-                        else:
-                            self._handle_player_timeout(current_player)
+                                # Check if we crossed a minute boundary
+                                prev_minute = int(prev_time / 60)
+                                current_minute = int(self.player_timers[current_player] / 60)
+                                
+                                # Apply penalty if we crossed 0:00 or any other minute boundary
+                                penalty = ((prev_time > 0 and self.player_timers[current_player] <= 0) or
+                                           (prev_minute != current_minute and self.player_timers[current_player] < 0))
+                                
+                                # Check if overtime exceeded
+                                timed_out = overtime_used >= self.overtime * 60
+                            else:
+                                timed_out = True
                 
-                # Broadcast updated times
-                self._broadcast_timer_update()
-                if points_changed:
-                    self._broadcast_player_list()
+                if current_player:
+                    if penalty:
+                        self._apply_overtime_penalty(current_player)
+                    if timed_out:
+                        self._handle_player_timeout(current_player)
+                    # Broadcast updated times
+                    self._broadcast_timer_update()
+                    if penalty:
+                        self._broadcast_player_list()
                 
-            except Exception as e:
-                print(f"[ERROR] Timer error: {e}")
+            except Exception:
+                log.exception("timer error", room=self.name)
             
             time.sleep(self.TIMER_CHECK_INTERVAL)
 
+    def _apply_overtime_penalty(self, username):
+        """Deduct the overtime penalty from a player and log it."""
+        penalty = self.overtime_penalty
+        self.player_points[username] = self.player_points[username] - penalty
+        
+        # Log overtime penalty
+        penalty_info = {
+            "type": "message",
+            "message": f"{username}: -{penalty} points (overtime).",
+            "color": (255, 0, 0)
+        }
+        self.move_log.append(penalty_info)
+        self._journal_record({'type': 'penalty', 'username': username})
+        self._broadcast_move_log()
+
     def _handle_player_timeout(self, username):
         """Handle a player timing out."""
-        print(f"[TIMEOUT] Player {username} has timed out")
-        
-        # Update current turn if needed
-        if self.current_turn == username:
-            current_idx = self.turn_order_in_game.index(self.current_turn)
-            next_idx = (current_idx + 1) % len(self.turn_order_in_game)
-            self.current_turn = self.turn_order_in_game[next_idx]
-        
-        # Remove player from turn order
-        if username in self.turn_order_in_game:
+        with self.turn_lock:
+            if username not in self.turn_order_in_game:
+                return  # Already gone, e.g. left since the timer checked their clock
+            
+            # Update current turn if needed
+            if self.current_turn == username:
+                current_idx = self.turn_order_in_game.index(self.current_turn)
+                next_idx = (current_idx + 1) % len(self.turn_order_in_game)
+                self.current_turn = self.turn_order_in_game[next_idx]
+            
+            # Remove player from turn order
             self.turn_order_in_game.remove(username)
+        log.info("player timed out", room=self.name, user=username)
         
         # Remove player's rack and apply penalty
         if username in self.player_racks:
@@ -1525,6 +1988,7 @@ class ScrabbleServer:
                 if self._get_username(client) == username:
                     self._send_rack_update(client)
                     break
+        self._journal_record({'type': 'timeout', 'username': username})
         
         # Check if only one player remains
         if len(self.turn_order_in_game) <= 1:
@@ -1533,7 +1997,6 @@ class ScrabbleServer:
         
         # Broadcast updates
         self._broadcast_player_list()
-        self._broadcast_board()
         self._broadcast_timer_update()
         self._broadcast_tiles_remaining()
         self._broadcast_move_log()
@@ -1557,19 +2020,906 @@ class ScrabbleServer:
         self._broadcast_message(timer_data)
 
 
+class ScrabbleServer:
+    """A multi-client Scrabble game server hosting any number of game rooms."""
+    
+    # Class constants
+    HOST = '0.0.0.0'  # Listen on all network interfaces
+    PORT = 12345
+    SOCKET_TIMEOUT = 1.0
+    BUFFER_SIZE = 1024
+    MAX_ROOMS = 1000
+    DICTIONARY_PATH = os.path.join('assets', 'dictionary', 'words_with_definitions.txt')
+    SEND_QUEUE_SIZE = 256  # messages queued per client before the overflow policy applies
+    SEND_QUEUE_POLICY = OutboundQueue.POLICY_DROP_STALE
+    BOT_WORKERS = 2  # threads thinking for bots, shared by all rooms
+    BOT_THINK_TIME = 2.0  # seconds a timed bot searches per turn
+    JOURNAL_DIR = 'journal'  # where games in progress are journaled
+    JOURNAL_SYNC_INTERVAL = 0.25  # seconds between journal fsyncs
+    SESSION_GRACE = 120  # seconds a dropped player's seat is kept for them
+    SESSION_CHECK_INTERVAL = 1.0  # seconds between checks for expired seats
+    METRICS_HOST = '127.0.0.1'  # metrics endpoint is local only by default
+    METRICS_PORT = 9125
+
+    def __init__(self, host=None, port=None, send_queue_size=None, send_queue_policy=None,
+                 bot_workers=None, bot_think_time=None, journal_dir=None, session_grace=None,
+                 metrics_host=None, metrics_port=None):
+        """Initialize the Scrabble server.
+
+        journal_dir defaults to JOURNAL_DIR; pass '' to run without journals.
+        metrics_port defaults to METRICS_PORT; pass 0 to run without the
+        metrics endpoint.
+        """
+        self.host = host or self.HOST
+        self.port = port or self.PORT
+        self.send_queue_size = send_queue_size or self.SEND_QUEUE_SIZE
+        self.send_queue_policy = send_queue_policy or self.SEND_QUEUE_POLICY
+        
+        # Connected clients, across all rooms
+        self.clients = []
+        self.client_lock = lockprof.lock('server.client_lock')
+        self.client_usernames = {}  # {socket: username}, bots included
+        self.client_rooms = {}      # {socket: GameRoom}, bots included
+        
+        # Bot seats think on their own pool, off the client and timer threads
+        self.bot_pool = ThreadPoolExecutor(max_workers=bot_workers or self.BOT_WORKERS, thread_name_prefix='bot')
+        self.bot_think_time = self.BOT_THINK_TIME if bot_think_time is None else bot_think_time
+        self.bot_counter = 1  # For naming bots
+        
+        # Games in progress are journaled here and recovered on start
+        self.journal_dir = self.JOURNAL_DIR if journal_dir is None else journal_dir
+        self.journal_thread = None
+        
+        # Seats of players dropped mid-game wait this long for them to reconnect
+        self.session_grace = self.SESSION_GRACE if session_grace is None else session_grace
+        self.session_thread = None
+        
+        # Prometheus text endpoint
+        self.metrics_host = metrics_host or self.METRICS_HOST
+        self.metrics_port = self.METRICS_PORT if metrics_port is None else metrics_port
+        self.metrics_server = None
+        
+        # Game rooms
+        self.rooms = {}  # {room_name: GameRoom}
+        self.room_counter = 1  # For auto-generating room names
+        
+        # Timer settings applied to every new room
+        self.time_per_player = GameRoom.DEFAULT_TIME_PER_PLAYER  # minutes
+        self.overtime = GameRoom.DEFAULT_OVERTIME  # minutes
+        self.overtime_penalty = GameRoom.DEFAULT_OVERTIME_PENALTY
+        
+        # Server socket
+        self.server_socket = None
+        self.running = False
+        self.handler_threads = []  # Track client handler threads
+        
+        # Dictionary, loaded once and shared by every room
+        self.dictionary = None  # DictionaryIndex, {word: definition} lookups
+        self.move_generator = None  # MoveGenerator over the dictionary's GADDAG
+        self._load_dictionary()
+    
+    def _setup_server_socket(self):
+        """Create and configure the server socket."""
+        try:
+            self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.server_socket.bind((self.host, self.port))
+            self.server_socket.listen()
+            self.server_socket.settimeout(self.SOCKET_TIMEOUT)
+            log.info("server listening", host=self.host, port=self.port)
+            return True
+        except Exception as e:
+            log.error("server socket setup failed", error=str(e))
+            return False
+
+    def _add_client(self, conn, reader):
+        """Non-blocking client registration."""
+        try:
+            if not self._check_join_allowed(conn):
+                return
+            conn.settimeout(5.0)
+            username_msg = reader.read_line()
+            self._register_client(conn, username_msg or "")
+        except socket.timeout:
+            log.info("registration timed out")
+            conn.close()
+        except LineTooLongError:
+            log.info("registration failed, handshake line too long")
+            conn.close()
+        except Exception as e:
+            log.info("registration failed", error=str(e))
+            conn.close()
+
+    def _check_join_allowed(self, conn):
+        """Turn the connection away if the server cannot host another game."""
+        with self.client_lock:
+            if self._find_open_room() is None and len(self.rooms) >= self.MAX_ROOMS:
+                conn.sendall("ERROR:Server is full, cannot join\n".encode())
+                conn.close()
+                return False
+        return True
+
+    def _register_client(self, conn, username_msg):
+        """Validate the USERNAME: handshake line, seat the player and send the game.
+
+        The line may carry ``;PROTO=<codec>`` to request a wire protocol other
+        than JSON; the OK reply echoes the codec when it is granted. A client
+        reconnecting to a game adds ``;RESUME=<board version>,<move log length>``;
+        if its seat was kept, the OK reply ends in ``;RESUMED`` and only what
+        changed since those versions is sent instead of the whole game.
+        """
+        if not username_msg.startswith("USERNAME:"):
+            conn.sendall("ERROR:Invalid username format\n".encode())
+            conn.close()
+            return False
+        username, *option_list = username_msg[9:].split(';')
+        username = username.strip()
+        options = dict(option.strip().partition('=')[::2] for option in option_list)
+        codec = options.get('PROTO', protocol.JSON)
+        if codec not in protocol.CODECS:
+            codec = protocol.JSON  # Unknown codec, fall back to JSON
+        try:
+            resume = tuple(int(part) for part in options['RESUME'].split(','))
+            if len(resume) != 2:
+                resume = None
+        except (KeyError, ValueError):
+            resume = None
+        
+        if resume is not None:
+            # After a network blip the old connection may not have noticed the drop yet
+            with self.client_lock:
+                stale = next((client for client, name in self.client_usernames.items()
+                              if name == username and not isinstance(client, BotConnection)), None)
+            if stale is not None:
+                log.info("player reconnected, dropping old connection", user=username)
+                self._remove_client(stale, keep_seat=True)
+        
+        # Check if username is currently in use by an active connection
+        with self.client_lock:
+            if username in self.client_usernames.values():
+                conn.sendall("ERROR:Username already in use\n".encode())
+                conn.close()
+                return False
+            room = self._find_seat(username)
+            resumed = room is not None and resume is not None
+            room = room or self._find_open_room() or self._create_room()
+            if room is None:
+                conn.sendall("ERROR:Server is full, cannot join\n".encode())
+                conn.close()
+                return False
+                
+            self.clients.append(conn)
+            self.client_usernames[conn] = username
+            self.client_rooms[conn] = room
+            reply = "OK:Username accepted"
+            if codec != protocol.JSON:
+                reply += f";PROTO={codec}"
+            if resumed:
+                reply += ";RESUMED"
+            conn.sendall(f"{reply}\n".encode())
+            conn.codec = codec
+        room.add_player(conn, username)
+        if resumed:
+            room._send_resume_data(conn, *resume)
+            log.info("player resumed seat", room=room.name, user=username)
+        else:
+            room._send_initial_data(conn)
+            log.info("player joined", room=room.name, user=username)
+        return True
+
+    def _find_seat(self, username):
+        """Return the room keeping a vacant seat for username (caller holds client_lock).
+
+        Seats are kept for players dropped mid-game and for the players of
+        games recovered from their journals.
+        """
+        for room in self.rooms.values():
+            if username in room.detached:
+                return room
+        return None
+
+    def _find_open_room(self):
+        """Return the first room that has not started its game (caller holds client_lock)."""
+        for room in self.rooms.values():
+            if room.can_join():
+                return room
+        return None
+
+    def _create_room(self, name=None):
+        """Create and register a new room (caller holds client_lock).
+
+        Returns None if the server hosts MAX_ROOMS rooms or name is taken.
+        """
+        if len(self.rooms) >= self.MAX_ROOMS or name in self.rooms:
+            return None
+        if not name:
+            while f"room-{self.room_counter}" in self.rooms:
+                self.room_counter += 1
+            name = f"room-{self.room_counter}"
+            self.room_counter += 1
+        room = GameRoom(name, self.dictionary, self.time_per_player, self.overtime, self.overtime_penalty,
+                        self.move_generator, journal_dir=self.journal_dir or None)
+        room.connection_lost = self._connection_lost
+        self.rooms[name] = room
+        log.info("room created", room=name)
+        return room
+
+    def _discard_room_if_empty(self, room):
+        """Drop a room from the registry once its last player has left (caller holds client_lock)."""
+        if room is not None and not room.turn_order and not room.clients and self.rooms.get(room.name) is room:
+            del self.rooms[room.name]
+            log.info("empty room closed", room=room.name)
+
+    def _send_room_list(self, conn):
+        """Send the lobby's list of rooms to one client."""
+        with self.client_lock:
+            rooms = [
+                {
+                    "name": room.name,
+                    "players": list(room.turn_order),
+                    "game_started": room.game_started,
+                    "game_ended": room.game_ended
+                }
+                for room in self.rooms.values()
+            ]
+        conn.sendall(Message({"type": "rooms", "rooms": rooms}))
+
+    def _move_to_room(self, conn, room_name, create=False):
+        """Move a client from its current room into another one."""
+        username = self._get_username(conn)
+        if not username:
+            raise ValueError("Not logged in")
+        room_name = room_name.strip()
+        with self.client_lock:
+            current = self.client_rooms.get(conn)
+            if create:
+                if room_name in self.rooms:
+                    raise ValueError(f"Room {room_name} already exists")
+                if len(self.rooms) >= self.MAX_ROOMS:
+                    raise ValueError("Server cannot host more rooms")
+                target = None
+            else:
+                target = self.rooms.get(room_name)
+                if target is None:
+                    raise ValueError(f"No room named {room_name}")
+                if target is current:
+                    raise ValueError(f"Already in room {room_name}")
+                if not target.can_join():
+                    raise ValueError("Game already in progress, cannot join")
+        # Leave the old room outside the registry lock; it broadcasts to its players
+        if current is not None:
+            current._remove_client(conn, close=False)
+            self._dismiss_bots(current)
+        error = None
+        with self.client_lock:
+            self._discard_room_if_empty(current)
+            if target is None:
+                # Another client may have created the room since the check above; join it then
+                target = self._create_room(room_name) or self.rooms.get(room_name)
+            # The lock was released, so the room may have started its game or closed meanwhile
+            if target is None or self.rooms.get(target.name) is not target or not target.can_join():
+                error = f"Room {room_name} is no longer open"
+                target = self._find_open_room() or self._create_room()
+                if target is None:
+                    self.client_rooms.pop(conn, None)
+                    raise ValueError(f"{error} and the server cannot host more rooms")
+            self.client_rooms[conn] = target
+        target.add_player(conn, username)
+        target._send_initial_data(conn)
+        log.info("player moved", room=target.name, user=username)
+        if error:
+            raise ValueError(f"{error}, joined {target.name} instead")
+
+    def _remove_client(self, conn, keep_seat=False):
+        """Remove client from the server and from its room.
+
+        With keep_seat, a player dropped from a game in progress keeps their
+        seat for session_grace seconds.
+        """
+        with self.client_lock:
+            if conn in self.clients:
+                self.clients.remove(conn)
+            username = self.client_usernames.pop(conn, None)
+            room = self.client_rooms.pop(conn, None)
+        if room is not None:
+            room._remove_client(conn, keep_seat=keep_seat)
+            if not isinstance(conn, BotConnection):
+                self._dismiss_bots(room)
+        else:
+            try:
+                conn.close()
+            except:
+                pass
+        with self.client_lock:
+            self._discard_room_if_empty(room)
+        if username:
+            log.info("player left the server", user=username)
+
+    def _connection_lost(self, conn):
+        """Drop a connection a room could not send to, keeping its seat for a resume."""
+        self._remove_client(conn, keep_seat=True)
+
+    def _add_bot(self, conn, strength):
+        """Seat a bot of the given strength in the client's room and ready it."""
+        strength = strength.strip().lower() or bots.GREEDY
+        if strength not in bots.STRENGTHS:
+            raise ValueError(f"Unknown bot strength {strength}, use one of {', '.join(bots.STRENGTHS)}")
+        if self.move_generator is None:
+            raise ValueError("Bots are unavailable, the move generator failed to load")
+        with self.client_lock:
+            room = self.client_rooms.get(conn)
+            if room is None:
+                raise ValueError("Not in a room")
+            if not room.can_join():
+                raise ValueError("Game already in progress, cannot add a bot")
+            taken = set(self.client_usernames.values())
+            while f"bot-{self.bot_counter}" in taken:
+                self.bot_counter += 1
+            username = f"bot-{self.bot_counter}"
+            self.bot_counter += 1
+            bot = self._register_bot(room, username, strength)
+        room.add_player(bot, username)
+        log.info("bot joined", room=room.name, user=username, strength=strength)
+        room.handle_command(bot, username, "READY")
+
+    def _register_bot(self, room, username, strength):
+        """Create and register a bot connection for room (caller holds client_lock)."""
+        bot = BotConnection(username, room, bots.Bot(self.move_generator, strength, self.bot_think_time),
+                            self.bot_pool)
+        self.client_usernames[bot] = username
+        self.client_rooms[bot] = room
+        return bot
+
+    def _dismiss_bots(self, room):
+        """Remove a room's bots once no human is left in it, connected or expected back."""
+        with self.client_lock:
+            seated = [conn for conn, conn_room in self.client_rooms.items() if conn_room is room]
+            if room.detached:
+                return
+        if all(isinstance(conn, BotConnection) for conn in seated):
+            for bot in seated:
+                self._remove_client(bot)
+
+    def _start_metrics(self):
+        """Serve the metrics endpoint, with gauges read from this server at scrape time."""
+        if not self.metrics_port:
+            return
+        metrics.REGISTRY.register(metrics.Gauge(
+            'scrabble_clients_connected', "Client connections, bots excluded.", lambda: len(self.clients)))
+        metrics.REGISTRY.register(metrics.Gauge(
+            'scrabble_rooms', "Game rooms open.", lambda: len(self.rooms)))
+        metrics.REGISTRY.register(metrics.Gauge(
+            'scrabble_games_active', "Rooms with a game started and not ended.",
+            lambda: sum(1 for room in list(self.rooms.values()) if room.game_started and not room.game_ended)))
+        try:
+            self.metrics_server = metrics.serve(self.metrics_host, self.metrics_port)
+            log.info("metrics endpoint listening", url=f"http://{self.metrics_host}:{self.metrics_port}/metrics")
+        except OSError as e:
+            log.error("metrics endpoint setup failed", port=self.metrics_port, error=str(e))
+
+    def _start_session_expiry(self):
+        """Start releasing the seats of players who do not come back."""
+        self.session_thread = threading.Thread(target=self._expire_sessions, daemon=True)
+        self.session_thread.start()
+
+    def _start_journaling(self):
+        """Recover the games journaled by the last run and start syncing journals."""
+        if not self.journal_dir:
+            return
+        try:
+            os.makedirs(self.journal_dir, exist_ok=True)
+        except OSError as e:
+            log.error("journal directory unusable", path=self.journal_dir, error=str(e))
+            self.journal_dir = ''
+            return
+        for path in journal.find_journals(self.journal_dir):
+            self._recover_room(path)
+        self.journal_thread = threading.Thread(target=self._sync_journals, daemon=True)
+        self.journal_thread.start()
+
+    def _recover_room(self, path):
+        """Rebuild the room journaled at path; its players rejoin by username."""
+        name = journal.room_name(path)
+        start = time.perf_counter()
+        try:
+            snapshot, records = journal.read(path)
+            if not snapshot['game_started'] or snapshot['game_ended']:
+                raise ValueError("no game in progress")
+            room = GameRoom(name, self.dictionary, snapshot['time_per_player'], snapshot['overtime'],
+                            snapshot['overtime_penalty'], self.move_generator, journal_dir=self.journal_dir)
+            room.connection_lost = self._connection_lost
+            room.restore(snapshot, records)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            log.warning("journal discarded", room=name, error=str(e))
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return
+        with self.client_lock:
+            self.rooms[name] = room
+            seated = [self._register_bot(room, username, strength)
+                      for username, strength in snapshot['bots'].items()
+                      if self.move_generator is not None and username in room.turn_order]
+        for bot in seated:
+            room.add_player(bot, bot.username)
+        # Compact the replayed records into a fresh snapshot
+        room._open_journal()
+        elapsed = (time.perf_counter() - start) * 1000
+        log.info("room recovered", room=name, records=len(records), ms=round(elapsed, 1),
+                 waiting=list(room.turn_order))
+
+    def _expire_sessions(self):
+        """Give up the seats of players who have not reconnected within session_grace."""
+        while self.running:
+            time.sleep(self.SESSION_CHECK_INTERVAL)
+            deadline = time.monotonic() - self.session_grace
+            with self.client_lock:
+                rooms = list(self.rooms.values())
+            for room in rooms:
+                expired = room.expired_seats(deadline)
+                for username in expired:
+                    log.info("seat released, player did not reconnect", room=room.name, user=username)
+                    room.remove_seat(username)
+                if expired:
+                    self._dismiss_bots(room)
+                    with self.client_lock:
+                        self._discard_room_if_empty(room)
+
+    def _sync_journals(self):
+        """Fsync every room's journal a few times a second while the server runs."""
+        while self.running:
+            time.sleep(self.JOURNAL_SYNC_INTERVAL)
+            with self.client_lock:
+                rooms = list(self.rooms.values())
+            for room in rooms:
+                room_journal = room.journal
+                if room_journal is None:
+                    continue
+                try:
+                    room_journal.sync()
+                except OSError as e:
+                    log.error("journal sync failed", room=room.name, error=str(e))
+
+    def _handle_client(self, conn, addr):
+        """Main client handler loop."""
+        log.info("connection", addr=str(addr))
+        username = None
+        reader = LineReader(conn, chunk_size=self.BUFFER_SIZE)
+        try:
+            self._add_client(conn, reader)
+            username = self._get_username(conn)
+            if self.client_rooms.get(conn) is None:
+                return
+            
+            # Set timeout only if socket is still valid
+            try:
+                conn.settimeout(1.0)
+            except OSError:
+                log.error("socket invalid", addr=str(addr))
+                return
+                
+            while self.running:
+                try:
+                    # One command per line; pipelined commands are buffered
+                    line = reader.read_line()
+                    if line is None:
+                        log.info("client disconnected", user=username or str(addr))
+                        break
+                    data = line.strip()
+                    if not data:
+                        continue
+                    if not self._handle_command(conn, username, addr, data):
+                        break
+                except socket.timeout:
+                    continue
+                except LineTooLongError:
+                    log.warning("oversized command, disconnecting", user=username or str(addr))
+                    break
+                except ConnectionResetError:
+                    log.info("connection reset", user=username or str(addr))
+                    break
+                except OSError as e:
+                    log.error("socket error", user=username or str(addr), error=str(e))
+                    break
+                except Exception as e:
+                    log.error("client handler error", user=username or str(addr), error=str(e))
+                    break
+        except Exception:
+            log.exception("client error", addr=str(addr))
+        finally:
+            log.debug("removing client", user=username or str(addr))
+            self._remove_client(conn, keep_seat=True)
+
+    def _handle_command(self, conn, username, addr, data):
+        """Dispatch a single client command.
+
+        Lobby commands are handled here, everything else goes to the client's
+        room. Shared by the threaded and the asyncio client loops. Returns
+        False when the client loop should stop.
+        """
+        try:
+            if data == "DISCONNECT":
+                log.info("client requested disconnect", user=username or str(addr))
+                self._remove_client(conn)  # Leaving on purpose gives up the seat
+                return False
+            elif data == "ROOMS":
+                self._send_room_list(conn)
+            elif data.startswith("CREATE_ROOM:"):
+                self._move_to_room(conn, data[12:], create=True)
+            elif data.startswith("JOIN_ROOM:"):
+                self._move_to_room(conn, data[10:])
+            elif data == "ADD_BOT" or data.startswith("ADD_BOT:"):
+                self._add_bot(conn, data[8:])
+            else:
+                room = self.client_rooms.get(conn)
+                if room is None:
+                    raise ValueError("Not in a room")
+                room.handle_command(conn, username, data)
+        except ValueError as e:
+            error_msg = f"Error: {e}\n"
+            try:
+                conn.sendall(error_msg.encode())
+            except OSError:
+                return False
+        return True
+
+    async def _handle_client_async(self, reader, writer):
+        """Asyncio client handler; one coroutine per connection instead of a thread."""
+        conn = AsyncClientConnection(reader, writer, self.send_queue_size, self.send_queue_policy)
+        addr = writer.get_extra_info('peername')
+        log.info("connection", addr=str(addr))
+        username = None
+        try:
+            if not self._check_join_allowed(conn):
+                return
+            try:
+                username_msg = await asyncio.wait_for(reader.readline(), timeout=5.0)
+            except asyncio.TimeoutError:
+                log.info("registration timed out")
+                conn.close()
+                return
+            except ValueError:
+                # StreamReader enforces the same limit as LineReader
+                log.info("registration failed, handshake line too long")
+                conn.close()
+                return
+            try:
+                username_msg = username_msg.decode()
+            except UnicodeDecodeError:
+                log.info("registration failed, handshake line is not UTF-8")
+                conn.close()
+                return
+            if not self._register_client(conn, username_msg.rstrip('\r\n')):
+                return
+            username = self._get_username(conn)
+
+            while self.running:
+                try:
+                    try:
+                        line = await reader.readline()
+                    except (ValueError, asyncio.LimitOverrunError):
+                        # StreamReader enforces the same limit as LineReader
+                        log.warning("oversized command, disconnecting", user=username or str(addr))
+                        break
+                    if not line.endswith(b'\n'):
+                        # EOF, possibly after a partial command
+                        log.info("client disconnected", user=username or str(addr))
+                        break
+                    try:
+                        data = line.decode().strip()
+                    except UnicodeDecodeError:
+                        log.warning("command is not UTF-8, disconnecting", user=username or str(addr))
+                        break
+                    if not data:
+                        continue
+                    if not self._handle_command(conn, username, addr, data):
+                        break
+                except ConnectionResetError:
+                    log.info("connection reset", user=username or str(addr))
+                    break
+                except OSError as e:
+                    log.error("socket error", user=username or str(addr), error=str(e))
+                    break
+                except Exception as e:
+                    log.error("client handler error", user=username or str(addr), error=str(e))
+                    break
+        except Exception:
+            log.exception("client error", addr=str(addr))
+        finally:
+            log.debug("removing client", user=username or str(addr))
+            self._remove_client(conn, keep_seat=True)
+
+    def _accept_clients(self):
+        """Accept incoming client connections with proper interrupt handling and ESC key support."""
+        while self.running:
+            try:
+                if msvcrt and msvcrt.kbhit():
+                    key = msvcrt.getch()
+                    if key == b'\x1b':
+                        log.info("ESC pressed, shutting down")
+                        self.running = False
+                        break
+                try:
+                    sock, addr = self.server_socket.accept()
+                    conn = ClientConnection(sock, self.send_queue_size, self.send_queue_policy)
+                    client_thread = threading.Thread(
+                        target=self._handle_client, 
+                        args=(conn, addr),
+                        daemon=True
+                    )
+                    client_thread.start()
+                    self.handler_threads.append(client_thread)
+                except socket.timeout:
+                    continue
+                except OSError:
+                    if not self.running:
+                        break
+                    raise
+            except KeyboardInterrupt:
+                log.info("keyboard interrupt in accept loop")
+                self.running = False
+                break
+            except Exception as e:
+                if self.running:
+                    log.error("accept error", error=str(e))
+                break
+
+    def start(self):
+        """Start the server with proper interrupt handling."""
+        # Setup timer settings before starting
+        self._setup_timer_settings()
+        
+        if not self._setup_server_socket():
+            return False
+        
+        self.running = True
+        self._start_journaling()
+        self._start_session_expiry()
+        self._start_metrics()
+        log.info("ready for connections")
+        
+        try:
+            self._accept_clients()
+        except KeyboardInterrupt:
+            pass  # Let the finally block handle shutdown
+        except Exception as e:
+            log.error("server error", error=str(e))
+        finally:
+            if self.running:  # Only stop if not already stopped
+                self.stop()
+        
+        return True
+
+    def start_async(self):
+        """Start the server on an asyncio event loop.
+
+        All connections are served by coroutines on a single thread instead of
+        one handler thread per client, so idle connections cost no OS thread
+        and no periodic wakeups.
+        """
+        # Setup timer settings before starting
+        self._setup_timer_settings()
+        
+        self.running = True
+        self._start_journaling()
+        self._start_session_expiry()
+        self._start_metrics()
+        try:
+            asyncio.run(self._serve_async())
+        except KeyboardInterrupt:
+            pass  # Let the finally block handle shutdown
+        except Exception as e:
+            log.error("server error", error=str(e))
+        finally:
+            if self.running:  # Only stop if not already stopped
+                self.stop()
+        
+        return True
+
+    async def _serve_async(self):
+        """Run the asyncio listener until the server is stopped or ESC is pressed."""
+        try:
+            async_server = await asyncio.start_server(
+                self._handle_client_async, self.host, self.port, reuse_address=True,
+                limit=LineReader.MAX_LINE_LENGTH
+            )
+        except Exception as e:
+            log.error("server socket setup failed", error=str(e))
+            return
+        log.info("server listening", host=self.host, port=self.port, mode="asyncio")
+        log.info("ready for connections")
+        
+        async with async_server:
+            try:
+                while self.running:
+                    if msvcrt and msvcrt.kbhit():
+                        key = msvcrt.getch()
+                        if key == b'\x1b':
+                            log.info("ESC pressed, shutting down")
+                            break
+                    await asyncio.sleep(self.SOCKET_TIMEOUT)
+            finally:
+                # Stop while the loop is still running so client transports can be closed
+                if self.running:
+                    self.stop()
+
+    def stop(self):
+        """Proper shutdown procedure."""
+        if not self.running:
+            return
+        log.info("shutting down")
+        self.running = False
+        if self.server_socket:
+            try:
+                self.server_socket.close()
+            except:
+                pass
+        with self.client_lock:
+            rooms = list(self.rooms.values())
+            self.rooms.clear()
+            self.clients.clear()
+            self.client_usernames.clear()
+            self.client_rooms.clear()
+        for room in rooms:
+            room.close()
+        if self.metrics_server:
+            self.metrics_server.shutdown()
+            self.metrics_server.server_close()
+        for t in (self.journal_thread, self.session_thread):
+            if t:
+                t.join(timeout=2)
+        self.bot_pool.shutdown(wait=False, cancel_futures=True)
+        # Wait for all handler threads to finish
+        for t in self.handler_threads:
+            t.join(timeout=2)
+        if lockprof.enabled():
+            print(lockprof.report())
+        log.info("stopped")
+
+    # Additional utility methods
+    def print_status(self):
+        """Print server status."""
+        print(f"\n[STATUS] Connected clients: {len(self.clients)}")
+        print(f"[STATUS] Active rooms: {len(self.rooms)}")
+        for room in list(self.rooms.values()):
+            room.print_status()
+        for username, metrics in self.get_queue_metrics().items():
+            print(f"[STATUS] Send queue {username}: {metrics}")
+        for codec, stats in self.get_wire_metrics().items():
+            print(f"[STATUS] Wire {codec}: {stats}")
+        if lockprof.enabled():
+            print(lockprof.report())
+
+    def get_queue_metrics(self):
+        """Per-client outbound queue depth and drop counters, keyed by username."""
+        with self.client_lock:
+            return {
+                self.client_usernames.get(conn, str(conn.fileno())): conn.queue.metrics()
+                for conn in self.clients
+            }
+
+    def get_wire_metrics(self):
+        """Encode counters and bytes sent per wire protocol.
+
+        Encodes are counted once per message and codec, so broadcasts count
+        once; bytes_sent is what actually went to the clients using the codec.
+        """
+        metrics = protocol.WIRE_STATS.snapshot()
+        for stats in metrics.values():
+            stats["clients"] = 0
+            stats["bytes_sent"] = 0
+        with self.client_lock:
+            for conn in self.clients:
+                stats = metrics[conn.codec]
+                stats["clients"] += 1
+                stats["bytes_sent"] += conn.queue.bytes_sent
+        return metrics
+
+    def _get_username(self, conn):
+        return self.client_usernames.get(conn)
+
+    def _load_dictionary(self):
+        """Load the Scrabble dictionary with definitions from its binary index."""
+        try:
+            self.dictionary = load_index(self.DICTIONARY_PATH)
+            log.info("dictionary loaded", words=len(self.dictionary))
+        except Exception as e:
+            log.error("dictionary load failed", error=str(e))
+            sys.exit(1)
+        try:
+            self.move_generator = MoveGenerator(load_gaddag(self.DICTIONARY_PATH, self.dictionary))
+        except Exception as e:
+            # Games work without it; only move generation is unavailable
+            log.error("move generator load failed", error=str(e))
+
+    def _setup_timer_settings(self):
+        """Prompt for timer settings before starting the server."""
+        while True:
+            try:
+                time_input = input(f"Enter time per player in minutes (default: {GameRoom.DEFAULT_TIME_PER_PLAYER}, 'u' for unlimited): ").strip()
+                if time_input.lower() == 'u':
+                    self.time_per_player = float('inf')
+                    self.overtime = 0
+                    print("Timer disabled - unlimited time")
+                    return
+                
+                if time_input:
+                    time_value = float(time_input)
+                    if time_value <= 0:
+                        print("Time must be greater than 0")
+                        continue
+                    self.time_per_player = time_value
+                
+                overtime_input = input(f"Enter overtime in minutes (default: {GameRoom.DEFAULT_OVERTIME}): ").strip()
+                if overtime_input:
+                    overtime_value = float(overtime_input)
+                    if overtime_value < 0:
+                        print("Overtime cannot be negative")
+                        continue
+                    self.overtime = overtime_value
+
+                penalty_input = input(f"Enter overtime penalty (default: {GameRoom.DEFAULT_OVERTIME_PENALTY}): ").strip()
+                if penalty_input:
+                    penalty_value = int(penalty_input)
+                    if penalty_value < 0:
+                        print("Penalty cannot be negative")
+                        continue
+                    self.overtime_penalty = penalty_value
+                
+                print(f"Timer settings: {self.time_per_player} minutes + {self.overtime} minutes overtime ({self.overtime_penalty} pt penalty)")
+                return
+            except ValueError:
+                print("Please enter a valid number")
+
+
 def main():
     """Entry point for the server."""
-    server = ScrabbleServer()
+    parser = argparse.ArgumentParser(description="Scrabble game server")
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help="serve all clients from one asyncio event loop instead of a thread per client")
+    parser.add_argument('--send-queue-size', type=int, default=ScrabbleServer.SEND_QUEUE_SIZE,
+                        help="outbound messages queued per client before the overflow policy applies")
+    parser.add_argument('--send-queue-policy', choices=OutboundQueue.POLICIES, default=ScrabbleServer.SEND_QUEUE_POLICY,
+                        help="what to do when a client's send queue is full")
+    parser.add_argument('--bot-workers', type=int, default=ScrabbleServer.BOT_WORKERS,
+                        help="threads thinking for bot players")
+    parser.add_argument('--bot-think-time', type=float, default=ScrabbleServer.BOT_THINK_TIME,
+                        help="seconds a timed bot searches per turn")
+    parser.add_argument('--journal-dir', default=ScrabbleServer.JOURNAL_DIR,
+                        help="directory for the crash-recovery journals of games in progress ('' disables them)")
+    parser.add_argument('--session-grace', type=float, default=ScrabbleServer.SESSION_GRACE,
+                        help="seconds a disconnected player's seat is kept for them to reconnect")
+    parser.add_argument('--metrics-host', default=ScrabbleServer.METRICS_HOST,
+                        help="address of the Prometheus metrics endpoint")
+    parser.add_argument('--metrics-port', type=int, default=ScrabbleServer.METRICS_PORT,
+                        help="port of the Prometheus metrics endpoint (0 disables it)")
+    parser.add_argument('--lock-profile', choices=lockprof.MODES, default=lockprof.OFF,
+                        help="profile the room and lobby locks per call site; 'deadlock' also checks lock order "
+                             "and raises instead of deadlocking")
+    logs.add_arguments(parser)
+    args = parser.parse_args()
+    logs.setup(args.log_level, args.log_format)
+    lockprof.configure(args.lock_profile)
+    
+    server = ScrabbleServer(send_queue_size=args.send_queue_size, send_queue_policy=args.send_queue_policy,
+                            bot_workers=args.bot_workers, bot_think_time=args.bot_think_time,
+                            journal_dir=args.journal_dir, session_grace=args.session_grace,
+                            metrics_host=args.metrics_host, metrics_port=args.metrics_port)
     try:
-        server.start()
+        if args.use_async:
+            server.start_async()
+        else:
+            server.start()
     except KeyboardInterrupt:
         print("\nKeyboard interrupt received, initiating shutdown...")
-    except Exception as e:
-        print(f"Fatal error: {e}")
+    except Exception:
+        log.exception("fatal error")
     finally:
         if server.running:
             server.stop()
         print("Server shutdown complete")
+        logs.shutdown()  # os._exit skips atexit, so flush the log queue first
         os._exit(0)
 
 
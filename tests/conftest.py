@@ -0,0 +1,18 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+WORDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'words.txt')
+
+
+@pytest.fixture(scope='session')
+def dictionary_path(tmp_path_factory):
+    """A copy of the test word list; its index and GADDAG are built beside it."""
+    path = tmp_path_factory.mktemp('dictionary') / 'words.txt'
+    shutil.copyfile(WORDS, path)
+    return str(path)
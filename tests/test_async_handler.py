@@ -0,0 +1,58 @@
+"""The asyncio handler tells an oversized command from a bad or failing one."""
+import asyncio
+import logging
+
+import pytest
+
+from protocol import LineReader
+from server import ScrabbleServer
+
+
+@pytest.fixture
+def server(dictionary_path, monkeypatch):
+    monkeypatch.setattr(ScrabbleServer, 'DICTIONARY_PATH', dictionary_path)
+    server = ScrabbleServer(journal_dir='', metrics_port=0)
+    server.running = True
+    yield server
+    for room in list(server.rooms.values()):
+        room.close()
+    server.bot_pool.shutdown(wait=False)
+
+
+async def _send(server, line):
+    """Register alice, send line, and wait for the server to hang up."""
+    async_server = await asyncio.start_server(server._handle_client_async, '127.0.0.1', 0,
+                                              limit=LineReader.MAX_LINE_LENGTH)
+    port = async_server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(b"USERNAME:alice\n")
+    assert await asyncio.wait_for(reader.readline(), 5) == b"OK:Username accepted\n"
+    writer.write(line)
+    await writer.drain()
+    await asyncio.wait_for(reader.read(), 5)  # EOF once the server hangs up
+    writer.close()
+    async_server.close()
+    await async_server.wait_closed()
+
+
+@pytest.mark.parametrize('line, message', [
+    (b"CHAT:" + b"x" * LineReader.MAX_LINE_LENGTH + b"\n", "oversized command, disconnecting"),
+    (b"CHAT:\xff\xfe\n", "command is not UTF-8, disconnecting"),
+])
+def test_rejected_command_is_reported(server, caplog, line, message):
+    with caplog.at_level(logging.INFO, logger='scrabble.server'):
+        asyncio.run(_send(server, line))
+    messages = [record.getMessage() for record in caplog.records]
+    assert message in messages
+
+
+def test_handler_value_error_is_not_oversized(server, caplog, monkeypatch):
+    def failing(*args):
+        raise ValueError("bad command")
+
+    monkeypatch.setattr(server, '_handle_command', failing)
+    with caplog.at_level(logging.INFO, logger='scrabble.server'):
+        asyncio.run(_send(server, b"PASS\n"))
+    messages = [record.getMessage() for record in caplog.records]
+    assert "client handler error" in messages
+    assert "oversized command, disconnecting" not in messages
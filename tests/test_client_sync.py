@@ -0,0 +1,49 @@
+"""The client asks for a full resync when it notices a missed update."""
+import pytest
+
+pytest.importorskip('pygame')
+
+from client import ScrabbleClient  # noqa: E402
+
+
+class Recorder:
+    """Socket stand-in that keeps the commands the client sends."""
+
+    def __init__(self):
+        self.sent = []
+
+    def sendall(self, data):
+        self.sent.append(data)
+
+
+@pytest.fixture
+def client():
+    # Skip __init__, which opens a window; the sync paths only need this state
+    client = ScrabbleClient.__new__(ScrabbleClient)
+    client.sock = Recorder()
+    client.move_log = [{"player": "alice", "word": "CAT", "points": 10}]
+    client.board_version = 3
+    return client
+
+
+def test_move_log_gap_requests_the_full_log(client):
+    client._process_server_message({"type": "move_log_append", "seq": 2,
+                                    "moves": [{"player": "alice", "word": "DOG", "points": 5}]})
+    assert client.sock.sent == [b"GET_MOVE_LOG\n"]
+    assert len(client.move_log) == 1
+
+
+def test_board_delta_gap_requests_the_full_board(client):
+    client._process_server_message({"type": "board_delta", "version": 5, "tiles": [[7, 7, "A", False]]})
+    assert client.sock.sent == [b"GET_BOARD\n"]
+    assert client.board_version == 3
+
+
+def test_board_delta_spanning_the_wrong_versions_requests_the_full_board(client):
+    client._process_server_message({"type": "board_delta", "version": 6, "since": 2, "tiles": []})
+    assert client.sock.sent == [b"GET_BOARD\n"]
+
+
+def test_stale_board_delta_is_ignored(client):
+    client._process_server_message({"type": "board_delta", "version": 3, "tiles": [[7, 7, "A", False]]})
+    assert client.sock.sent == [] and client.board_version == 3
@@ -0,0 +1,94 @@
+"""The room's incremental cross-check cache against a full recompute."""
+import random
+
+import pytest
+
+import bots
+import logs
+import rules
+import selfplay
+from dictionary_index import load_index
+from lexicon import load_gaddag
+from movegen import CrossCheckCache, MoveGenerator
+from server import GameRoom
+
+
+@pytest.fixture(scope='module')
+def lexicon(dictionary_path):
+    index = load_index(dictionary_path)
+    return index, MoveGenerator(load_gaddag(dictionary_path, index))
+
+
+def _place(board, word, row, col, across=True):
+    positions = []
+    for offset, letter in enumerate(word):
+        r, c = (row, col + offset) if across else (row + offset, col)
+        board[r][c] = letter
+        positions.append((r, c))
+    return positions
+
+
+def _assert_lines_match(cache, rows, cols):
+    """The cached tables and anchors on rows and cols equal a full recompute."""
+    expected = cache.generator.cross_checks(cache.board, cache.blanks)
+    anchors = cache.generator.anchors(cache.board)
+    for row in range(rules.BOARD_SIZE):
+        for col in range(rules.BOARD_SIZE):
+            if row in rows or col in cols:
+                for table, full in zip(cache.tables, expected):
+                    assert table[row][col] == full[row][col], f"stale cross-check at {(row, col)}"
+                assert cache.anchors[row][col] == anchors[row][col], f"stale anchor at {(row, col)}"
+
+
+def test_update_after_a_known_word(lexicon):
+    index, generator = lexicon
+    board = [['' for _ in range(rules.BOARD_SIZE)] for _ in range(rules.BOARD_SIZE)]
+    cache = CrossCheckCache(generator, board, set())
+
+    cache.update(_place(board, "CAT", 7, 6))
+    _assert_lines_match(cache, rows={6, 7, 8}, cols={5, 6, 7, 8, 9})
+    # Above the A, an across play may only put a letter that makes a word ending in A
+    across_masks = cache.tables[0]
+    hooks = {chr(65 + i) for i in range(26) if across_masks[6][7] >> i & 1}
+    assert hooks == {chr(65 + i) for i in range(26) if chr(65 + i) + "A" in index}
+    assert cache.anchors[7][5] and cache.anchors[7][9] and not cache.anchors[7][7]
+
+    # A tile hooked below the A extends the column run, so the square past it changes
+    cache.update(_place(board, "T", 8, 7))
+    _assert_lines_match(cache, rows={7, 8, 9}, cols={6, 7, 8})
+
+
+@pytest.mark.parametrize('seed', range(1, 6))
+def test_cache_matches_recompute_after_every_move(lexicon, seed):
+    index, generator = lexicon
+    rng = random.Random(seed)
+    with logs.quiet('server'):
+        room = GameRoom(f'cross-checks-{seed}', index, float('inf'), 0, 0, generator,
+                        rng=random.Random(rng.getrandbits(64)))
+        seats = {}
+        for number in range(2):
+            username = f"bot-{number + 1}"
+            seats[username] = (selfplay.Seat(number + 1),
+                               bots.Bot(generator, bots.GREEDY, 0, random.Random(rng.getrandbits(64))))
+            room.add_player(seats[username][0], username)
+        for username, (seat, _) in seats.items():
+            room.handle_command(seat, username, "READY")
+
+        plays = 0
+        for _ in range(selfplay.MAX_TURNS):
+            if room.game_ended or room.current_turn is None:
+                break
+            username = room.current_turn
+            seat, bot = seats[username]
+            rack = room.player_racks[username]
+            unseen = bots.unseen_tiles(room.TILE_DISTRIBUTION, room.board, room.board_blanks, rack)
+            command = bot.choose(room.board, room.board_blanks, rack, room._get_tiles_remaining(),
+                                 unseen, room.cross_checks)
+            seat.last_error = None
+            room.handle_command(seat, username, command)
+            assert seat.last_error is None, f"room rejected {command}: {seat.last_error}"
+            assert room.cross_checks.verify(), f"cross-check cache is stale after {command}"
+            if command != "PASS" and not command.startswith("EXCHANGE:"):
+                plays += 1
+        assert plays, "no tiles were played"
+        room.close()
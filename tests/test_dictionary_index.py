@@ -0,0 +1,13 @@
+"""The binary dictionary index against its TSV source."""
+from dictionary_index import DictionaryIndex, compile_source
+
+
+def test_rows_without_definition_are_not_words(tmp_path):
+    # The server's old TSV loader skipped these rows; the index keeps its word set
+    source = tmp_path / 'words.txt'
+    source.write_text("word\tdefinition\nCAT\ta small feline\ndog\ta canine\nBARE\nEMPTY\t\n", encoding='utf-8')
+    index = DictionaryIndex(compile_source(str(source)))
+    assert 'CAT' in index and 'DOG' in index
+    assert 'BARE' not in index and 'EMPTY' not in index
+    assert index.get('DOG') == 'a canine'
+    assert len(index) == 2
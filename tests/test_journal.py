@@ -0,0 +1,43 @@
+"""Journaling never runs under a room lock it needs itself."""
+import threading
+
+import journal
+import selfplay
+from server import ScrabbleServer
+
+
+class FailingSeat(selfplay.Seat):
+    """Rejects move log broadcasts, as a client that just dropped."""
+
+    def sendall(self, data, kind=None):
+        if kind == 'move_log_append':
+            raise ConnectionResetError("Connection closed")
+        super().sendall(data, kind)
+
+
+def test_seat_left_during_move_log_broadcast_is_journaled(dictionary_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(ScrabbleServer, 'DICTIONARY_PATH', dictionary_path)
+    monkeypatch.setattr(journal, 'SNAPSHOT_INTERVAL', 1)  # Every record takes a snapshot
+    server = ScrabbleServer(journal_dir=str(tmp_path), metrics_port=0)
+    server.time_per_player = float('inf')
+    seats = {'alice': selfplay.Seat(-10), 'bob': selfplay.Seat(-11), 'carol': FailingSeat(-12)}
+    for username, conn in seats.items():
+        assert server._register_client(conn, f"USERNAME:{username}")
+    room = server.client_rooms[seats['alice']]
+    # Give the seat up when the broadcast fails, so the drop journals a leave record
+    room.connection_lost = lambda conn: room._remove_client(conn)
+    for username, conn in seats.items():
+        room.handle_command(conn, username, "READY")
+    player = room.current_turn
+    assert player != 'carol'
+
+    passing = threading.Thread(target=room.handle_command, args=(seats[player], player, "PASS"), daemon=True)
+    passing.start()
+    passing.join(timeout=5)
+    assert not passing.is_alive(), "room deadlocked journaling a seat dropped by a move log broadcast"
+
+    snapshot, records = journal.read(journal.journal_path(str(tmp_path), room.name))
+    assert 'carol' not in room.turn_order
+    assert snapshot['turn_order'] == room.turn_order and not records  # Compacted into the snapshot
+    room.close()
+    server.bot_pool.shutdown(wait=False)
@@ -0,0 +1,99 @@
+"""Per-client send queues: bounded depth and the two overflow policies."""
+import socket
+
+import pytest
+
+from server import ClientConnection, OutboundQueue, ScrabbleServer
+
+
+def _drain(queue):
+    batch = queue.get(block=False)
+    return batch.split(b'\n')[:-1] if batch else []
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        OutboundQueue(4, 'block')
+
+
+@pytest.mark.parametrize('policy', OutboundQueue.POLICIES)
+def test_depth_is_bounded(policy):
+    queue = OutboundQueue(3, policy)
+    assert all(queue.put(b"chat %d\n" % n, 'chat') for n in range(3))
+    assert not queue.put(b"chat 3\n", 'chat')
+    assert queue.metrics()['depth'] == 3 and queue.metrics()['peak_depth'] == 3
+    assert _drain(queue) == [b"chat 0", b"chat 1", b"chat 2"]
+
+
+def test_drop_stale_keeps_only_the_latest_timer_update():
+    queue = OutboundQueue(8, OutboundQueue.POLICY_DROP_STALE)
+    queue.put(b"timer 1\n", 'timer_update')
+    queue.put(b"chat\n", 'chat')
+    queue.put(b"timer 2\n", 'timer_update')
+    assert _drain(queue) == [b"chat", b"timer 2"]
+    assert queue.metrics()['dropped'] == 1
+
+
+def test_drop_stale_makes_room_when_full():
+    queue = OutboundQueue(2, OutboundQueue.POLICY_DROP_STALE)
+    queue.put(b"timer\n", 'timer_update')
+    queue.put(b"chat 1\n", 'chat')
+    assert queue.put(b"chat 2\n", 'chat')  # Replaces the timer update
+    assert queue.put(b"timer\n", 'timer_update')  # Nothing older to replace, so it is dropped
+    assert _drain(queue) == [b"chat 1", b"chat 2"]
+    assert queue.metrics()['dropped'] == 2
+
+
+def test_disconnect_does_not_drop_stale_messages():
+    queue = OutboundQueue(2, OutboundQueue.POLICY_DISCONNECT)
+    queue.put(b"timer 1\n", 'timer_update')
+    queue.put(b"timer 2\n", 'timer_update')
+    assert not queue.put(b"timer 3\n", 'timer_update')
+    assert _drain(queue) == [b"timer 1", b"timer 2"]
+
+
+def test_closed_queue_is_flushed_then_ends():
+    queue = OutboundQueue(2)
+    queue.put(b"bye\n", 'chat')
+    queue.close()
+    assert not queue.put(b"late\n", 'chat')
+    assert queue.get() == b"bye\n"
+    assert queue.get() is None
+
+
+def test_overflow_drops_the_client_and_keeps_the_seat(dictionary_path, monkeypatch):
+    monkeypatch.setattr(ScrabbleServer, 'DICTIONARY_PATH', dictionary_path)
+    server = ScrabbleServer(journal_dir='', metrics_port=0)
+    server.time_per_player = float('inf')  # No timer thread
+    seats = {}
+    for username in ('alice', 'bob'):
+        server_end, client_end = socket.socketpair()
+        server_end.settimeout(ScrabbleServer.SOCKET_TIMEOUT)
+        conn = ClientConnection(server_end, 4, OutboundQueue.POLICY_DISCONNECT)
+        assert server._register_client(conn, f"USERNAME:{username}")
+        seats[username] = (conn, client_end)
+    room = server.client_rooms[seats['alice'][0]]
+    for username, (conn, _) in seats.items():
+        room.handle_command(conn, username, "READY")
+    assert room.game_started
+
+    # Alice stops reading: her writer blocks on a full socket and her queue fills up
+    conn = seats['alice'][0]
+    for _ in range(1000):
+        if not conn.queue.put(b"x" * 65536 + b"\n", 'chat'):
+            break
+    else:
+        pytest.fail("send queue never filled")
+    with pytest.raises(ConnectionResetError):
+        conn.sendall(b"OK\n")
+
+    room._broadcast_player_list()
+    assert 'alice' in room.detached and 'alice' in room.turn_order
+    assert conn not in room.client_usernames and conn not in server.client_usernames
+    assert seats['bob'][0] in room.client_usernames
+
+    for _, client in seats.values():
+        client.close()
+    for room in list(server.rooms.values()):
+        room.close()
+    server.bot_pool.shutdown(wait=False)
@@ -0,0 +1,125 @@
+"""Wire helpers: buffered line reading, binary frames and their negotiation."""
+import json
+import socket
+
+import pytest
+
+import protocol
+from protocol import LineReader, LineTooLongError, Message
+from server import ClientConnection, ScrabbleServer
+
+
+class Chunks:
+    """Socket stand-in whose recv() returns the given chunks, then EOF.
+
+    A None chunk raises socket.timeout, as a read that found nothing yet.
+    """
+
+    def __init__(self, *chunks):
+        self.chunks = list(chunks)
+
+    def recv(self, bufsize):
+        if not self.chunks:
+            return b''
+        chunk = self.chunks.pop(0)
+        if chunk is None:
+            raise socket.timeout("timed out")
+        return chunk
+
+
+def test_pipelined_commands_in_one_recv():
+    reader = LineReader(Chunks(b"READY\nPASS\r\nCHAT:hi\n"))
+    assert [reader.read_line() for _ in range(4)] == ["READY", "PASS", "CHAT:hi", None]
+
+
+def test_partial_line_is_buffered_across_recvs():
+    reader = LineReader(Chunks(b"MO", b"VE:H8", None, b":CAT\nPA", b"SS\n"))
+    with pytest.raises(socket.timeout):
+        reader.read_line()
+    assert reader.read_line() == "MOVE:H8:CAT"
+    assert reader.read_line() == "PASS"
+    assert reader.read_line() is None
+
+
+def test_partial_line_at_eof_is_dropped():
+    reader = LineReader(Chunks(b"READY\nPAS"))
+    assert reader.read_line() == "READY"
+    assert reader.read_line() is None
+
+
+def test_line_over_the_limit_is_rejected():
+    reader = LineReader(Chunks(b"CHAT:" + b"x" * 16, b"x" * 16 + b"\n"), max_line_length=20, chunk_size=16)
+    with pytest.raises(LineTooLongError):
+        reader.read_line()
+
+
+def test_line_at_the_limit_is_accepted():
+    line = b"x" * 20
+    reader = LineReader(Chunks(line[:10], line[10:] + b"\n"), max_line_length=20)
+    assert reader.read_line() == line.decode()
+
+
+def _frames(data):
+    reader = LineReader(Chunks(data))
+    frames = []
+    while (frame := reader.read_frame()) is not None:
+        frames.append(frame)
+    return frames
+
+
+@pytest.mark.parametrize('message, tag', [
+    ({"type": "timer_update", "timers": {"alice": {"time_remaining": 61.5, "overtime_used": 0.0},
+                                         "bob": {"time_remaining": 0.0, "overtime_used": 12.25}}},
+     protocol.FRAME_TIMER),
+    ({"type": "board_delta", "version": 7, "tiles": [[7, 7, "C", False], [7, 8, "A", True]]},
+     protocol.FRAME_DELTA),
+    ({"type": "board_delta", "version": 9, "since": 7, "tiles": [[0, 14, "Q", False]]},
+     protocol.FRAME_TLV),
+    ({"type": "game_state", "scores": {"alice": -3, "bob": 2 ** 40}, "ratio": 0.5, "started": True,
+      "winner": None, "racks": [["A", "?"], []], "name": "caf\u00e9"},
+     protocol.FRAME_TLV),
+    ({"type": "timer_update", "timers": {"x" * 300: {"time_remaining": 1.0, "overtime_used": 0.0}}},
+     protocol.FRAME_TLV),  # Name too long for the fixed layout
+])
+def test_frame_round_trip(message, tag):
+    encoded = protocol.encode_binary(message)
+    assert encoded[0] == tag
+    assert _frames(encoded) == [message]
+
+
+def test_text_frame_round_trip():
+    encoded = protocol.encode_for("Error: Not your turn\n".encode(), protocol.BINARY)
+    assert encoded[0] == protocol.FRAME_TEXT
+    assert _frames(encoded) == ["Error: Not your turn"]
+
+
+def test_message_encodes_once_per_codec():
+    message = Message({"type": "chat", "text": "hi"})
+    assert message.encode(protocol.JSON) == b'{"type": "chat", "text": "hi"}\n'
+    assert message.encode(protocol.BINARY) is message.encode(protocol.BINARY)
+    assert _frames(message.encode(protocol.BINARY)) == [message.data]
+
+
+@pytest.mark.parametrize('requested, codec', [('binary', protocol.BINARY), ('morse', protocol.JSON)])
+def test_login_negotiates_the_codec(dictionary_path, monkeypatch, requested, codec):
+    monkeypatch.setattr(ScrabbleServer, 'DICTIONARY_PATH', dictionary_path)
+    server = ScrabbleServer(journal_dir='', metrics_port=0)
+    server_end, client_end = socket.socketpair()
+    client_end.settimeout(5)
+    conn = ClientConnection(server_end, server.send_queue_size, server.send_queue_policy)
+    assert server._register_client(conn, f"USERNAME:alice;PROTO={requested}")
+    assert conn.codec == codec
+
+    reader = LineReader(client_end)
+    if codec == protocol.BINARY:
+        assert reader.read_line() == "OK:Username accepted;PROTO=binary"
+        first = reader.read_frame()
+    else:
+        assert reader.read_line() == "OK:Username accepted"
+        first = json.loads(reader.read_line())
+    assert isinstance(first, dict) and 'type' in first
+
+    client_end.close()
+    for room in list(server.rooms.values()):
+        room.close()
+    server.bot_pool.shutdown(wait=False)
@@ -0,0 +1,88 @@
+"""A player dropped mid-game keeps their seat and resumes it by username."""
+import socket
+import time
+
+import pytest
+
+from server import ClientConnection, ScrabbleServer
+
+
+def _connect(server):
+    """A ClientConnection on one end of a socket pair; returns it and the client's end."""
+    server_end, client_end = socket.socketpair()
+    server_end.settimeout(ScrabbleServer.SOCKET_TIMEOUT)
+    client_end.settimeout(5)
+    return ClientConnection(server_end, server.send_queue_size, server.send_queue_policy), client_end
+
+
+def _read_line(sock):
+    data = b''
+    while not data.endswith(b'\n'):
+        chunk = sock.recv(1)
+        if not chunk:
+            break
+        data += chunk
+    return data.decode().strip()
+
+
+@pytest.fixture
+def server(dictionary_path, monkeypatch):
+    monkeypatch.setattr(ScrabbleServer, 'DICTIONARY_PATH', dictionary_path)
+    server = ScrabbleServer(journal_dir='', metrics_port=0)
+    server.time_per_player = float('inf')  # No timer thread
+    yield server
+    for room in list(server.rooms.values()):
+        room.close()
+    server.bot_pool.shutdown(wait=False)
+
+
+def _start_game(server):
+    seats = {}
+    for username in ('alice', 'bob'):
+        conn, client = _connect(server)
+        assert server._register_client(conn, f"USERNAME:{username}")
+        assert _read_line(client) == "OK:Username accepted"
+        seats[username] = (conn, client)
+    room = server.client_rooms[seats['alice'][0]]
+    for username, (conn, _) in seats.items():
+        room.handle_command(conn, username, "READY")
+    assert room.game_started
+    return room, seats
+
+
+def _fail_writer(room, conn, client):
+    """Close the client's end and broadcast until the connection's writer gives up."""
+    client.close()
+    deadline = time.monotonic() + 5
+    while not conn.closed:
+        assert time.monotonic() < deadline, "writer never noticed the closed peer"
+        room._broadcast_player_list()
+        time.sleep(0.01)
+
+
+@pytest.mark.parametrize('noticed_by', ['broadcast', 'handler'])
+def test_resume_after_writer_failure(server, noticed_by):
+    room, seats = _start_game(server)
+    conn, client = seats['alice']
+    seat = room.turn_order.index('alice')
+    rack = list(room.player_racks['alice'])
+
+    _fail_writer(room, conn, client)
+    assert conn.fileno() == -1
+    if noticed_by == 'broadcast':
+        room._broadcast_player_list()  # The next send fails and drops the connection
+    else:
+        server._remove_client(conn, keep_seat=True)  # The handler's recv failed first
+    assert 'alice' in room.detached
+    assert conn not in room.client_usernames and conn not in server.client_usernames
+
+    new_conn, new_client = _connect(server)
+    assert server._register_client(new_conn, "USERNAME:alice;RESUME=0,0")
+    assert _read_line(new_client) == "OK:Username accepted;RESUMED"
+    assert server.client_rooms[new_conn] is room
+    assert list(server.rooms.values()) == [room]
+    assert room.turn_order.index('alice') == seat
+    assert room.player_racks['alice'] == rack
+    assert 'alice' not in room.detached
+    new_client.close()
+    seats['bob'][1].close()
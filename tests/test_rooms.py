@@ -0,0 +1,67 @@
+"""Room lifecycle: moving between rooms while others create them, and closing."""
+import socket
+import threading
+import time
+
+from dictionary_index import load_index
+from selfplay import Seat
+from server import ClientConnection, GameRoom, ScrabbleServer
+
+
+def test_concurrent_create_room_joins_instead_of_replacing(dictionary_path, monkeypatch):
+    monkeypatch.setattr(ScrabbleServer, 'DICTIONARY_PATH', dictionary_path)
+    server = ScrabbleServer(journal_dir='', metrics_port=0)
+    alice, bob = Seat(-10), Seat(-11)
+    assert server._register_client(alice, "USERNAME:alice")
+    assert server._register_client(bob, "USERNAME:bob")
+    lobby = server.client_rooms[bob]
+
+    # Alice creates the room while bob, who checked the name was free, is still leaving the lobby
+    leave = lobby._remove_client
+
+    def leave_racing(conn, **kwargs):
+        if conn is bob:
+            server._move_to_room(alice, 'lounge', create=True)
+        leave(conn, **kwargs)
+
+    monkeypatch.setattr(lobby, '_remove_client', leave_racing)
+    server._move_to_room(bob, 'lounge', create=True)
+
+    lounge = server.rooms['lounge']
+    assert server.client_rooms[alice] is lounge and server.client_rooms[bob] is lounge
+    assert lounge.turn_order == ['alice', 'bob']
+    for room in list(server.rooms.values()):
+        room.close()
+    server.bot_pool.shutdown(wait=False)
+
+
+def test_close_with_a_timer_tick_in_progress(dictionary_path):
+    index = load_index(dictionary_path)
+    room = GameRoom('timed', index, time_per_player=1, overtime=0, overtime_penalty=0)
+    room.TIMER_CHECK_INTERVAL = 0.01
+    server_end, client_end = socket.socketpair()
+    conn = ClientConnection(server_end, ScrabbleServer.SEND_QUEUE_SIZE, ScrabbleServer.SEND_QUEUE_POLICY)
+
+    # Hold the next tick between its clock update and its broadcast
+    ticking, proceed = threading.Event(), threading.Event()
+    broadcast = room._broadcast_timer_update
+
+    def held_broadcast():
+        if not ticking.is_set():
+            ticking.set()
+            proceed.wait(5)
+        broadcast()
+
+    room._broadcast_timer_update = held_broadcast
+    room.add_player(conn, 'alice')
+    room.handle_command(conn, 'alice', "READY")
+    assert room.timer_running and ticking.wait(5)
+
+    closing = threading.Thread(target=room.close, daemon=True)
+    closing.start()
+    time.sleep(0.1)  # close() is now stopping the timer
+    proceed.set()
+    closing.join(timeout=5)
+    assert not closing.is_alive(), "close() deadlocked with the timer thread"
+    assert not room.timer_running and not room.clients
+    client_end.close()